@@ -0,0 +1,512 @@
+"""asyncio WebDriver client for driving many sessions from one event loop"""
+
+import asyncio
+import json
+import logging as logger
+import timeit
+from typing import List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+from automation.element_resolver import (
+    FIND_SNIPPET,
+    POLL_FREQUENCY,
+    READ_SNIPPET,
+    RESOLVE_SCRIPT,
+)
+from automation.error import (
+    ElementNotFoundException,
+    ElementNotVisibleException,
+)
+from automation.locator import Locator, parse_locator
+from automation.text_search import TEXT_SEARCH_SCRIPT
+from automation.wait_times import DEFAULT, SHORT
+
+# W3C key of an element reference in command payloads and results
+ELEMENT_KEY = "element-6066-11e4-a52f-4a5f1a1b7f4f"
+MAX_CONNECTIONS = 4
+
+# Reads one property of the first visible match.
+READ_SCRIPT = FIND_SNIPPET + READ_SNIPPET + """
+var found = __pyselFind(arguments[0], arguments[1]).filter(__pyselVisible);
+return found.length ? {value: __pyselRead(found[0], arguments[2])} : null;
+"""
+
+
+class HttpPool:
+    """Keep-alive HTTP/1.1 connections to one WebDriver endpoint.
+
+    Only plain ``http`` endpoints are supported. A request that fails on a
+    reused connection is sent again only when it is a ``GET``, since the
+    driver may already have run any other command.
+    """
+
+    def __init__(self, url: str, size: int = MAX_CONNECTIONS):
+        parsed = urlparse(url)
+        if parsed.scheme != "http":
+            raise ValueError(
+                f"Only http WebDriver endpoints are supported, got '{url}'."
+            )
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.prefix = parsed.path.rstrip("/")
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def request(
+        self, method: str, path: str, body=None
+    ) -> Tuple[int, str]:
+        payload = b"" if body is None else json.dumps(body).encode()
+        async with self._slots:
+            while self._idle:
+                connection = self._idle.pop()
+                reader, writer = connection
+                if reader.at_eof() or writer.is_closing():
+                    # the driver closed the idle keep-alive connection
+                    writer.close()
+                    continue
+                try:
+                    return await self._send(connection, method, path, payload)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if method != "GET":
+                        raise
+                    continue
+            connection = await asyncio.open_connection(self.host, self.port)
+            return await self._send(connection, method, path, payload)
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+
+    async def _send(self, connection, method, path, payload):
+        reader, writer = connection
+        try:
+            writer.write(
+                (
+                    f"{method} {self.prefix}{path} HTTP/1.1\r\n"
+                    f"Host: {self.host}:{self.port}\r\n"
+                    "Accept: application/json\r\n"
+                    "Content-Type: application/json;charset=UTF-8\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    "Connection: keep-alive\r\n\r\n"
+                ).encode()
+                + payload
+            )
+            await writer.drain()
+            status, headers, body = await self._read_response(reader)
+        except BaseException:
+            writer.close()
+            raise
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+        else:
+            self._idle.append(connection)
+        return status, body.decode("utf-8")
+
+    async def _read_response(self, reader: asyncio.StreamReader):
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while size := int(
+                (await reader.readuntil(b"\r\n")).split(b";")[0], 16
+            ):
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+            await reader.readuntil(b"\r\n")
+        else:
+            body = await reader.read()
+            headers["connection"] = "close"
+        return status, headers, body
+
+
+class AsyncWebElement:
+    def __init__(self, driver: "AsyncWebDriver", id_: str):
+        self.driver = driver
+        self.id = id_
+
+    async def click(self):
+        await self._execute("POST", "/click", {})
+
+    async def clear(self):
+        await self._execute("POST", "/clear", {})
+
+    async def send_keys(self, text: str):
+        await self._execute("POST", "/value", {"text": text})
+
+    async def text(self) -> str:
+        return await self._execute("GET", "/text")
+
+    async def get_property(self, name: str):
+        return await self._execute("GET", f"/property/{name}")
+
+    async def get_attribute(self, name: str) -> Optional[str]:
+        return await self._execute("GET", f"/attribute/{name}")
+
+    async def is_selected(self) -> bool:
+        return await self._execute("GET", "/selected")
+
+    async def is_enabled(self) -> bool:
+        return await self._execute("GET", "/enabled")
+
+    async def _execute(self, method: str, path: str, body=None):
+        return await self.driver.execute(
+            method, f"/element/{self.id}{path}", body
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, AsyncWebElement) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class AsyncWebDriver:
+    """A WebDriver session whose commands are coroutines.
+
+    Commands never block a thread, so one event loop can drive many
+    sessions at once. Errors returned by the driver are raised as the same
+    selenium exceptions ``WebDriver`` raises.
+    """
+
+    def __init__(self, executor: str, session_id: str, pool: HttpPool):
+        self.executor = executor
+        self.session_id = session_id
+        self._pool = pool
+        self._errors = ErrorHandler()
+
+    @classmethod
+    async def start(
+        cls, executor: str, capabilities: dict, pool_size: int = MAX_CONNECTIONS
+    ) -> "AsyncWebDriver":
+        starttime = timeit.default_timer()
+        pool = HttpPool(executor, pool_size)
+        value = await cls._call(
+            pool,
+            ErrorHandler(),
+            "POST",
+            "/session",
+            {"capabilities": {"alwaysMatch": capabilities}},
+        )
+        time_taken = "{:.2f}".format(timeit.default_timer() - starttime)
+        session_id = value["sessionId"]
+        logger.info(
+            f"Async session {session_id} started in {time_taken} seconds"
+        )
+        return cls(executor, session_id, pool)
+
+    async def quit(self):
+        try:
+            await self.execute("DELETE", "")
+        finally:
+            await self._pool.close()
+
+    async def execute(self, method: str, path: str, body=None):
+        value = await self._call(
+            self._pool,
+            self._errors,
+            method,
+            f"/session/{self.session_id}{path}",
+            self._wrap(body),
+        )
+        return self._unwrap(value)
+
+    async def get(self, url: str):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def back(self):
+        await self.execute("POST", "/back", {})
+
+    async def refresh(self):
+        await self.execute("POST", "/refresh", {})
+
+    async def title(self) -> str:
+        return await self.execute("GET", "/title")
+
+    async def current_url(self) -> str:
+        return await self.execute("GET", "/url")
+
+    async def page_source(self) -> str:
+        return await self.execute("GET", "/source")
+
+    async def execute_script(self, script: str, *args):
+        return await self.execute(
+            "POST", "/execute/sync", {"script": script, "args": list(args)}
+        )
+
+    async def find_elements(self, by: str, value: str) -> List[AsyncWebElement]:
+        return await self.execute(
+            "POST", "/elements", {"using": by, "value": value}
+        )
+
+    async def delete_all_cookies(self):
+        await self.execute("DELETE", "/cookie")
+
+    @staticmethod
+    async def _call(pool, errors, method, path, body):
+        status, text = await pool.request(method, path, body)
+        response = json.loads(text) if text else {}
+        value = response.get("value") if isinstance(response, dict) else None
+        if status >= 300 or (isinstance(value, dict) and "error" in value):
+            errors.check_response({"status": status, "value": text})
+            raise WebDriverException(text)
+        return value
+
+    def _wrap(self, value):
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+
+class AsyncPage:
+    """Async counterparts of the core ``SeleniumBase``, ``Interaction`` and
+    ``Checks`` methods, for pages driven through an ``AsyncWebDriver``.
+
+    Element lookups use the same single-call resolve script as the
+    synchronous pages, and waits poll with ``asyncio.sleep`` so other
+    sessions run in the meantime.
+    """
+
+    def __init__(self, driver: AsyncWebDriver):
+        self.driver = driver
+
+    # region SeleniumBase
+
+    async def go_to(self, url: str):
+        await self.driver.get(url)
+
+    async def go_back(self):
+        await self.driver.back()
+
+    async def reload_page(self):
+        await self.driver.refresh()
+
+    async def get_source(self) -> str:
+        return await self.driver.page_source()
+
+    async def get_title(self) -> str:
+        return await self.driver.title()
+
+    async def get_location(self) -> str:
+        return await self.driver.current_url()
+
+    async def get_text(self, locator: Union[Locator, str]) -> str:
+        by, value = self._locator(locator)
+        deadline = timeit.default_timer() + DEFAULT
+        while True:
+            result = await self.driver.execute_script(
+                READ_SCRIPT, by, value, "text"
+            )
+            if result is not None:
+                return result["value"]
+            if timeit.default_timer() >= deadline:
+                raise ElementNotVisibleException(
+                    f"Element - locator: ({by}, {value}) "
+                    f"was not visible after {DEFAULT} seconds"
+                )
+            await asyncio.sleep(POLL_FREQUENCY)
+
+    async def get_element(
+        self, locator: Union[Locator, str], timeout=DEFAULT
+    ) -> AsyncWebElement:
+        return await self._wait_for(locator, timeout, enabled=False)
+
+    async def get_elements(
+        self, locator: Union[Locator, str], timeout=DEFAULT
+    ) -> List[AsyncWebElement]:
+        by, value = self._locator(locator)
+        deadline = timeit.default_timer() + timeout
+        while not (elements := await self.driver.find_elements(by, value)):
+            if timeit.default_timer() >= deadline:
+                break
+            await asyncio.sleep(POLL_FREQUENCY)
+        return elements
+
+    async def execute_script(self, script: str, *args):
+        return await self.driver.execute_script(script, *args)
+
+    async def wait_until_page_is_completely_loaded(self):
+        await self._wait_until(
+            lambda: self.driver.execute_script("return document.readyState"),
+            lambda state: state == "complete",
+            SHORT,
+            "Page taking too long to load",
+        )
+
+    async def wait_until_element_is_visible(
+        self, locator: Union[Locator, str], timeout=DEFAULT
+    ) -> AsyncWebElement:
+        return await self.get_element(locator, timeout)
+
+    async def wait_until_element_is_clickable(
+        self, locator: Union[Locator, str], timeout=DEFAULT
+    ) -> AsyncWebElement:
+        return await self._wait_for(locator, timeout, enabled=True)
+
+    async def wait_until_page_contains_text(self, text: str, timeout=DEFAULT):
+        await self._wait_until(
+            lambda: self.is_text_present(text),
+            bool,
+            timeout,
+            f"Text '{text}' did not appear in {timeout} seconds.",
+        )
+
+    async def is_text_present(self, text: str) -> bool:
+        match = await self.driver.execute_script(
+            TEXT_SEARCH_SCRIPT, text, False, False
+        )
+        return match is not None
+
+    # endregion
+
+    # region Interaction
+
+    async def click_element(
+        self, locator: Union[Locator, str]
+    ) -> AsyncWebElement:
+        element = await self.wait_until_element_is_clickable(locator)
+        await element.click()
+        return element
+
+    async def input_text(
+        self, locator: Union[Locator, str], text: str, clear: bool = True
+    ):
+        logger.info(f"Typing text '{text}' into text field '{locator}'.")
+        element = await self.get_element(locator)
+        if clear:
+            await element.clear()
+        await element.send_keys(text)
+
+    async def clear_text(self, locator: Union[Locator, str]) -> AsyncWebElement:
+        element = await self.get_element(locator)
+        await element.clear()
+        return element
+
+    async def get_attribute(
+        self, locator: Union[Locator, str], attribute_name: str
+    ):
+        element = await self.get_element(locator)
+        return await element.get_attribute(attribute_name)
+
+    async def get_value(self, locator: Union[Locator, str], timeout=DEFAULT):
+        element = await self.get_element(locator, timeout)
+        return await element.get_property("value")
+
+    # endregion
+
+    # region Checks
+
+    async def is_checked(self, locator: Union[Locator, str]) -> bool:
+        element = await self.get_element(locator)
+        return await element.is_selected()
+
+    async def element_exists(
+        self, locator: Union[Locator, str], timeout=DEFAULT
+    ) -> bool:
+        try:
+            await self.get_element(locator, timeout)
+            return True
+        except (ElementNotFoundException, ElementNotVisibleException):
+            return False
+
+    async def page_should_contain(self, text: str):
+        if not await self.is_text_present(text):
+            raise AssertionError(
+                f"Page should have contained text '{text}' but did not."
+            )
+        logger.info(f"Current page contains text '{text}'.")
+
+    async def title_should_be(self, title: str, message: Optional[str] = None):
+        actual = await self.get_title()
+        if actual != title:
+            raise AssertionError(
+                message
+                or f"Title should have been '{title}' but was '{actual}'."
+            )
+
+    async def location_should_contain(
+        self, expected: str, message: Optional[str] = None
+    ):
+        actual = await self.get_location()
+        if expected not in actual:
+            raise AssertionError(
+                message
+                or f"Location should have contained '{expected}' but it was '{actual}'."
+            )
+
+    async def element_text_should_be(
+        self,
+        locator: Union[Locator, str],
+        expected: str,
+        message: Optional[str] = None,
+    ):
+        actual = await self.get_text(locator)
+        if actual != expected:
+            raise AssertionError(
+                message
+                or f"The text of element '{locator}' should have been '{expected}' "
+                f"but it was '{actual}'."
+            )
+
+    # endregion
+
+    def _locator(self, locator: Union[Locator, str]) -> Tuple[str, str]:
+        if isinstance(locator, Locator):
+            return locator.as_tuple()
+        return parse_locator(locator).as_tuple()
+
+    async def _wait_for(
+        self, locator, timeout, enabled: bool
+    ) -> AsyncWebElement:
+        by, value = self._locator(locator)
+        deadline = timeit.default_timer() + timeout
+        found = False
+        while True:
+            result = await self.driver.execute_script(
+                RESOLVE_SCRIPT, by, value, True
+            )
+            for match in result["matches"]:
+                found = True
+                if match["visible"] and (match["enabled"] or not enabled):
+                    return match["element"]
+            if timeit.default_timer() >= deadline:
+                break
+            await asyncio.sleep(POLL_FREQUENCY)
+        if not found:
+            raise ElementNotFoundException(
+                f"Element - locator: ({by}, {value}) was not found "
+                f"after {timeout} seconds"
+            )
+        raise ElementNotVisibleException(
+            f"Element - locator: ({by}, {value}) was not visible "
+            f"after {timeout} seconds"
+        )
+
+    async def _wait_until(self, probe, accept, timeout, error: str):
+        deadline = timeit.default_timer() + timeout
+        while not accept(await probe()):
+            if timeit.default_timer() >= deadline:
+                raise AssertionError(error)
+            await asyncio.sleep(POLL_FREQUENCY)
@@ -0,0 +1,110 @@
+"""Batched read operations executed as one combined script"""
+
+from concurrent.futures import Future
+from typing import List, Union
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from automation.element_resolver import FIND_SNIPPET, READ_SNIPPET
+from automation.error import ElementNotFoundException
+
+TITLE = "title"
+LOCATION = "location"
+PROPERTY = "property"
+COUNT = "count"
+
+# Runs every queued read in order. A failing read only fails its own entry.
+BATCH_SCRIPT = FIND_SNIPPET + READ_SNIPPET + """
+function top() {
+    try { return window.top.document; } catch (e) { return document; }
+}
+function element(op) {
+    var found = __pyselFind(op.by, op.value);
+    for (var i = 0; i < found.length; i++) {
+        if (__pyselVisible(found[i])) { return found[i]; }
+    }
+    return null;
+}
+return arguments[0].map(function (op) {
+    try {
+        var el;
+        if (op.kind === 'title') { return {value: top().title}; }
+        if (op.kind === 'location') { return {value: top().location.href}; }
+        if (op.kind === 'count') {
+            return {value: __pyselFind(op.by, op.value).length};
+        }
+        el = element(op);
+        if (el === null) { return {missing: true}; }
+        return {value: __pyselRead(el, op.name)};
+    } catch (e) {
+        return {error: String(e)};
+    }
+});
+"""
+
+
+class Batch:
+    """Queues reads and runs them as one ``execute_script`` on ``flush``.
+
+    Every queued read returns a ``concurrent.futures.Future`` that is
+    resolved when the batch is flushed, which ``SeleniumBase.batch`` does
+    when its ``with`` block exits. Reads see the page as it is at that
+    moment and do not wait for elements to appear. Only reads whose value
+    is used after the block can be queued; checks that return a bool are
+    used in conditions right away and are never batched.
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self._operations: List[dict] = []
+        self._futures: List[Future] = []
+
+    def queue(
+        self,
+        kind: str,
+        locator: Union[WebElement, tuple, None] = None,
+        name: str = None,
+    ) -> Future:
+        """``locator`` is a ``(by, value)`` tuple or a ``WebElement``."""
+        if isinstance(locator, WebElement):
+            by, value = "element", locator
+        else:
+            by, value = locator if locator is not None else (None, None)
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self._operations.append(
+            {"kind": kind, "by": by, "value": value, "name": name}
+        )
+        self._futures.append(future)
+        return future
+
+    def flush(self):
+        operations, futures = self._operations, self._futures
+        self._operations, self._futures = [], []
+        if not operations:
+            return
+        try:
+            results = self.driver.execute_script(BATCH_SCRIPT, operations)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            raise
+        for operation, future, result in zip(operations, futures, results):
+            if result.get("missing"):
+                future.set_exception(
+                    ElementNotFoundException(
+                        "Element - locator: "
+                        f"({operation['by']}, {operation['value']}) "
+                        "was not visible when the batch ran"
+                    )
+                )
+            elif "error" in result:
+                future.set_exception(RuntimeError(result["error"]))
+            else:
+                future.set_result(result["value"])
+
+    def cancel(self):
+        for future in self._futures:
+            future.set_exception(RuntimeError("Batch was not executed"))
+        self._operations, self._futures = [], []
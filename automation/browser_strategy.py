@@ -1,16 +1,25 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+import timeit
+from automation.driver_resolver import DriverResolver
 from automation.selenium_base import SeleniumBase
+from automation.network_policy import network_policy
+from automation.remote_connection import PooledRemoteConnection
+from config.config import (
+    LEAN_VIEWPORT,
+    NETWORK_POLICY_ENABLED,
+    PAGE_LOAD_STRATEGY,
+    REMOTE_HUB_URL,
+)
 import logging as logger
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.drivers.edge import EdgeChromiumDriver
 
 
 @dataclass
 class BrowserStrategy(ABC):
+    maximize = True
+
     @abstractmethod
     def start(self):
         pass
@@ -20,23 +29,12 @@ class BrowserStrategy(ABC):
 class Chrome(BrowserStrategy):
     def start(self):
         try:
-            chrome_options = webdriver.ChromeOptions()
-            chrome_options.add_argument("--start-maximized")
-            chrome_options.add_argument("--disable-infobars")
-            chrome_options.add_argument("--ignore-ssl-errors=yes")
-            chrome_options.add_argument("--ignore-certificate-errors")
-            chrome_options.add_argument("--disable-xss-auditor")
-            chrome_options.add_argument("--disable-web-security")
-            chrome_options.add_argument("--allow-running-insecure-content")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-setuid-sandbox")
-            chrome_options.add_argument("--disable-webgl")
-            chrome_options.add_argument("--disable-popup-blocking")
             # driver = webdriver.Chrome(
             #     ChromeDriverManager().install(), options=chrome_options
             # )
             driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()), options=chrome_options
+                service=Service(DriverResolver().resolve("chrome")),
+                options=self.options(),
             )
 
             return driver
@@ -47,12 +45,63 @@ class Chrome(BrowserStrategy):
         # driver = webdriver.Remote(command_executor="http://localhost:4444", options=options)
         # return driver
 
+    def options(self):
+        chrome_options = webdriver.ChromeOptions()
+        chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY
+        chrome_options.add_argument("--start-maximized")
+        chrome_options.add_argument("--disable-infobars")
+        chrome_options.add_argument("--ignore-ssl-errors=yes")
+        chrome_options.add_argument("--ignore-certificate-errors")
+        chrome_options.add_argument("--disable-xss-auditor")
+        chrome_options.add_argument("--disable-web-security")
+        chrome_options.add_argument("--allow-running-insecure-content")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-setuid-sandbox")
+        chrome_options.add_argument("--disable-webgl")
+        chrome_options.add_argument("--disable-popup-blocking")
+        if NETWORK_POLICY_ENABLED:
+            # network events only, page and tracing events are not read
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "INFO"})
+            chrome_options.add_experimental_option(
+                "perfLoggingPrefs", {"enableNetwork": True, "enablePage": False}
+            )
+        return chrome_options
+
+
+@dataclass
+class LeanChrome(Chrome):
+    """Headless Chrome that skips everything a DOM-only crawl does not read.
+
+    Images, media and web fonts are not loaded and the viewport is fixed,
+    so pages render the same way on every machine without a display.
+    """
+
+    maximize = False
+
+    def options(self):
+        chrome_options = super().options()
+        chrome_options.arguments.remove("--start-maximized")
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-remote-fonts")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--window-size={},{}".format(*LEAN_VIEWPORT))
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+        return chrome_options
+
 
 @dataclass
 class Firefox(BrowserStrategy):
     def start(self):
         options = webdriver.FirefoxOptions()
-        return webdriver.Remote(GeckoDriverManager().install(), options=options)
+        options.page_load_strategy = PAGE_LOAD_STRATEGY
+        return webdriver.Remote(
+            command_executor=PooledRemoteConnection(REMOTE_HUB_URL), options=options
+        )
 
         # driver = webdriver.Remote(command_executor="http://localhost:4444", options=opt)
         # return driver
@@ -62,13 +111,12 @@ class Firefox(BrowserStrategy):
 class Edge(BrowserStrategy):
     def start(self):
         # return webdriver.Remote(EdgeChromiumDriver().install())
+        options = webdriver.EdgeOptions()
+        options.page_load_strategy = PAGE_LOAD_STRATEGY
+        options.add_argument("--remote-allow-origins=*")
+        options.platform_name = "mac"
         return webdriver.Remote(
-            command_executor="http://localhost:4444/wd/hub",
-            desired_capabilities={
-                "browserName": "MicrosoftEdge",
-                "ms:edgeOptions": {"args": ["--remote-allow-origins=*"]},
-                "platformName": "mac",
-            },
+            command_executor=PooledRemoteConnection(REMOTE_HUB_URL), options=options
         )
 
 
@@ -90,12 +138,23 @@ class BrowserSelector:
         """
         browsers = {
             "CHROME": Chrome(),
+            "CHROME-LEAN": LeanChrome(),
             "FIREFOX": Firefox(),
             "EDGE": Edge(),
             "SAFARI": Safari(),
         }
-        driver = browsers[self.browser.upper()].start()
-        driver.maximize_window()
+        starttime = timeit.default_timer()
+        strategy = browsers[self.browser.upper()]
+        driver = strategy.start()
+        time_taken = "{:.2f}".format(timeit.default_timer() - starttime)
+        logger.info(f"{self.browser} driver started in {time_taken} seconds")
+        if strategy.maximize:
+            driver.maximize_window()
+        if NETWORK_POLICY_ENABLED:
+            network_policy.apply(driver)
+        starttime = timeit.default_timer()
         driver.get(self.url)
         SeleniumBase(driver).wait_until_page_is_completely_loaded()
+        time_taken = "{:.2f}".format(timeit.default_timer() - starttime)
+        logger.info(f"{self.browser} loaded {self.url} in {time_taken} seconds")
         return driver
@@ -0,0 +1,245 @@
+"""Event-driven waits that run inside the browser"""
+
+import logging as logger
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from automation.element_resolver import FIND_SNIPPET
+from automation.text_search import TEXT_SEARCH_SNIPPET
+from automation.wait_times import DEFAULT, SHORT
+from config.config import NETWORK_IDLE_QUIET_MS, PAGE_READINESS
+
+TEXT_PRESENT = "text_present"
+ELEMENT_PRESENT = "element_present"
+ELEMENT_CONTAINS_TEXT = "element_contains_text"
+
+# Seconds added to the driver's script timeout so the in-page timer always
+# fires before the driver gives up on the async script.
+SCRIPT_TIMEOUT_MARGIN = 2
+
+# Checks the condition once, then re-checks it on DOM mutations until it
+# holds or the timeout passes. Mutation bursts are coalesced into one check
+# per task so large re-renders do not run the condition thousands of times.
+# CSS transitions and animations change visibility without a mutation, so
+# the condition is also re-checked when one ends and every RECHECK_MS.
+WAIT_SCRIPT = FIND_SNIPPET + TEXT_SEARCH_SNIPPET + """
+var kind = arguments[0], by = arguments[1], value = arguments[2];
+var text = arguments[3], negate = arguments[4], timeoutMs = arguments[5];
+var done = arguments[arguments.length - 1];
+function first() {
+    var found = __pyselFind(by, value);
+    return found.length ? found[0] : null;
+}
+function holds() {
+    var result = false;
+    if (kind === 'text_present') {
+        result = __pyselTextSearch(text, false, false) !== null;
+    } else if (kind === 'element_present') {
+        var element = first();
+        result = element !== null && __pyselVisible(element);
+    } else if (kind === 'element_contains_text') {
+        var element = first();
+        result = element !== null
+            && (element.innerText || element.textContent || '').indexOf(text) !== -1;
+    }
+    return negate ? !result : result;
+}
+var RECHECK_MS = 100;
+if (holds()) { return done(true); }
+var scheduled = false, finished = false, observer, timer, interval;
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(interval);
+    document.removeEventListener('transitionend', schedule, true);
+    document.removeEventListener('animationend', schedule, true);
+    done(result);
+}
+function schedule() {
+    if (scheduled || finished) { return; }
+    scheduled = true;
+    setTimeout(function () {
+        scheduled = false;
+        if (!finished && holds()) { finish(true); }
+    }, 0);
+}
+observer = new MutationObserver(schedule);
+observer.observe(document.documentElement,
+    {subtree: true, childList: true, attributes: true, characterData: true});
+document.addEventListener('transitionend', schedule, true);
+document.addEventListener('animationend', schedule, true);
+interval = setInterval(schedule, RECHECK_MS);
+timer = setTimeout(function () { finish(holds()); }, timeoutMs);
+"""
+
+
+# Resolves once the document reaches ``readiness`` ("interactive" or
+# "complete"), listening for readystatechange/load instead of polling. With a
+# quiet window, it then also waits until no resource finished loading and no
+# fetch/XHR was pending for that long. The fetch/XHR wrappers and the resource
+# observer are installed once per document and count into window.__pyselNet.
+READY_SCRIPT = """
+var readiness = arguments[0], quietMs = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var finished = false, quietTimer, timer;
+var net = window.__pyselNet;
+function isReady() {
+    return readiness === 'interactive'
+        ? document.readyState !== 'loading'
+        : document.readyState === 'complete';
+}
+function finish(idle) {
+    if (finished) { return; }
+    finished = true;
+    clearTimeout(timer);
+    clearTimeout(quietTimer);
+    document.removeEventListener('readystatechange', onState);
+    window.removeEventListener('load', onState);
+    done({ready: isReady(), idle: idle});
+}
+function scheduleQuiet() {
+    clearTimeout(quietTimer);
+    var quiet = Date.now() - net.last;
+    if (net.pending === 0 && quiet >= quietMs) { return finish(true); }
+    quietTimer = setTimeout(
+        scheduleQuiet, net.pending === 0 ? quietMs - quiet : quietMs);
+}
+function onState() {
+    if (!isReady()) { return; }
+    if (quietMs <= 0) { return finish(true); }
+    scheduleQuiet();
+}
+if (quietMs > 0 && !net) {
+    net = window.__pyselNet = {pending: 0, last: Date.now()};
+    var touch = function () { net.last = Date.now(); };
+    if (window.PerformanceObserver) {
+        new PerformanceObserver(touch).observe({type: 'resource'});
+    }
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            net.pending++;
+            touch();
+            return fetch.apply(this, arguments).finally(function () {
+                net.pending--;
+                touch();
+            });
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        net.pending++;
+        touch();
+        this.addEventListener('loadend', function () { net.pending--; touch(); });
+        return send.apply(this, arguments);
+    };
+}
+document.addEventListener('readystatechange', onState);
+window.addEventListener('load', onState);
+timer = setTimeout(function () { finish(false); }, timeoutMs);
+onState();
+"""
+
+
+class BrowserWaitUnavailable(Exception):
+    """Raised when the condition could not be watched from inside the page."""
+
+
+def _document_unloaded(exception: JavascriptException) -> bool:
+    """Whether the script was cut short by a navigation, not a script error."""
+    return "unload" in (exception.msg or "").lower()
+
+
+class BrowserWait:
+    """Waits for page conditions with a MutationObserver in the page.
+
+    The Python polling loop in ``SeleniumBase._wait_until_worker`` sleeps
+    between checks and pays a round trip per check. This resolves as soon as
+    the DOM change that satisfies the condition happens, in one
+    ``execute_async_script`` call.
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self._script_timeout = None
+
+    def until(
+        self,
+        kind: str,
+        locator=None,
+        text: str = None,
+        negate: bool = False,
+        timeout=DEFAULT,
+    ) -> bool:
+        """Returns whether the condition held before ``timeout`` expired.
+
+        ``locator`` is a ``(by, value)`` tuple or a ``WebElement``. Raises
+        ``BrowserWaitUnavailable`` when the script could not run to the end,
+        for example because the page navigated away while waiting.
+        """
+        by, value = (
+            ("element", locator) if locator is not None else (None, None)
+        )
+        if isinstance(locator, tuple):
+            by, value = locator
+        self._ensure_script_timeout(timeout)
+        try:
+            return bool(
+                self.driver.execute_async_script(
+                    WAIT_SCRIPT,
+                    kind,
+                    by,
+                    value,
+                    text,
+                    negate,
+                    int(timeout * 1000),
+                )
+            )
+        except JavascriptException as e:
+            if not _document_unloaded(e):
+                raise
+            logger.info(f"Browser side wait for {kind} unavailable: {e.msg}")
+            raise BrowserWaitUnavailable(str(e)) from e
+        except (TimeoutException, WebDriverException) as e:
+            logger.info(f"Browser side wait for {kind} unavailable: {e.msg}")
+            raise BrowserWaitUnavailable(str(e)) from e
+
+    def page_ready(
+        self,
+        readiness: str = PAGE_READINESS,
+        quiet_ms: int = NETWORK_IDLE_QUIET_MS,
+        timeout=SHORT,
+    ) -> dict:
+        """Waits for the current document to be ready and the network idle.
+
+        Returns ``{"ready": bool, "idle": bool}``. ``quiet_ms`` of 0 skips
+        the network idle wait. Raises ``BrowserWaitUnavailable`` when the
+        document was replaced while waiting, for example by a navigation
+        that had not committed yet.
+        """
+        self._ensure_script_timeout(timeout)
+        try:
+            return self.driver.execute_async_script(
+                READY_SCRIPT, readiness, quiet_ms, int(timeout * 1000)
+            )
+        except JavascriptException as e:
+            if not _document_unloaded(e):
+                raise
+            logger.info(f"Browser side page readiness unavailable: {e.msg}")
+            raise BrowserWaitUnavailable(str(e)) from e
+        except (TimeoutException, WebDriverException) as e:
+            logger.info(f"Browser side page readiness unavailable: {e.msg}")
+            raise BrowserWaitUnavailable(str(e)) from e
+
+    def _ensure_script_timeout(self, timeout):
+        required = timeout + SCRIPT_TIMEOUT_MARGIN
+        if self._script_timeout is None or self._script_timeout < required:
+            self.driver.set_script_timeout(required)
+            self._script_timeout = required
@@ -5,6 +5,7 @@ from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
+from automation.locator import Locator
 from automation.selenium_base import SeleniumBase
 from automation.wait_times import DEFAULT
 from typing import List, Optional, Tuple, Union
@@ -15,7 +16,7 @@ class Checks(SeleniumBase):
         self.driver = driver
         logger.info("Checks  initialized")
 
-    def is_checked(self, locator: Union[WebElement, str]) -> bool:
+    def is_checked(self, locator: Union[WebElement, Locator, str]) -> bool:
         """
         Check if Radio button / CheckBox is selected
         :param: WebElement or locator string
@@ -37,7 +38,7 @@ class Checks(SeleniumBase):
             return False
 
     def child_element_exists(
-        self, parent_element: WebElement, child_locator: Union[WebElement, str]
+        self, parent_element: WebElement, child_locator: Union[WebElement, Locator, str]
     ) -> bool:
         """
         checking if the given parent element contains child element")
@@ -81,7 +82,7 @@ class Checks(SeleniumBase):
 
     def page_should_contain_element(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
         limit: Optional[int] = None,
     ):
@@ -121,7 +122,7 @@ class Checks(SeleniumBase):
 
     def page_should_not_contain_element(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies that element ``locator`` is not found on the current page."""
@@ -130,7 +131,7 @@ class Checks(SeleniumBase):
             message=message,
         )
 
-    def element_should_be_disabled(self, locator: Union[WebElement, str]):
+    def element_should_be_disabled(self, locator: Union[WebElement, Locator, str]):
         """Verifies that element identified by ``locator`` is disabled.
 
         This keyword considers also elements that are read-only to be
@@ -141,7 +142,7 @@ class Checks(SeleniumBase):
         if self.is_element_enabled(locator):
             raise AssertionError(f"Element '{locator}' is enabled.")
 
-    def element_should_be_enabled(self, locator: Union[WebElement, str]):
+    def element_should_be_enabled(self, locator: Union[WebElement, Locator, str]):
         """Verifies that element identified by ``locator`` is enabled.
 
         This keyword considers also elements that are read-only to be
@@ -152,7 +153,7 @@ class Checks(SeleniumBase):
         if not self.is_element_enabled(locator):
             raise AssertionError(f"Element '{locator}' is disabled.")
 
-    def element_should_be_focused(self, locator: Union[WebElement, str]):
+    def element_should_be_focused(self, locator: Union[WebElement, Locator, str]):
         """Verifies that element identified by ``locator`` is focused."""
         element = self.get_element(locator)
         focused = self.driver.switch_to.active_element
@@ -163,7 +164,7 @@ class Checks(SeleniumBase):
             raise AssertionError(f"Element '{locator}' does not have focus.")
 
     def element_should_be_visible(
-        self, locator: Union[WebElement, str], message: Optional[str] = None
+        self, locator: Union[WebElement, Locator, str], message: Optional[str] = None
     ):
         """Verifies that the element identified by ``locator`` is visible.
 
@@ -182,7 +183,7 @@ class Checks(SeleniumBase):
         logger.info(f"Element '{locator}' is displayed.")
 
     def element_should_not_be_visible(
-        self, locator: Union[WebElement, str], message: Optional[str] = None
+        self, locator: Union[WebElement, Locator, str], message: Optional[str] = None
     ):
         """Verifies that the element identified by ``locator`` is NOT visible.
 
@@ -200,7 +201,7 @@ class Checks(SeleniumBase):
 
     def element_text_should_be(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         expected: str,
         message: Optional[str] = None,
         ignore_case: bool = False,
@@ -229,7 +230,7 @@ class Checks(SeleniumBase):
 
     def element_text_should_not_be(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         not_expected: str,
         message: Optional[str] = None,
         ignore_case: bool = False,
@@ -283,18 +284,7 @@ class Checks(SeleniumBase):
 
     def _page_contains(self, text):
         self.driver.switch_to.default_content()
-
-        if self.is_text_present(text):
-            return True
-
-        subframes = self.get_elements("xpath://frame|//iframe")
-        for frame in subframes:
-            self.driver.switch_to.frame(frame)
-            found_text = self.is_text_present(text)
-            self.driver.switch_to.default_content()
-            if found_text:
-                return True
-        return False
+        return self.is_text_present(text, include_frames=True)
 
     def location_should_be(self, url: str, message: Optional[str] = None):
         """Verifies that the current URL is exactly ``url``.
@@ -351,7 +341,7 @@ class Checks(SeleniumBase):
 
     def element_should_contain(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         expected: str,
         message: Optional[str] = None,
         ignore_case: bool = False,
@@ -385,7 +375,7 @@ class Checks(SeleniumBase):
 
     def element_should_not_contain(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         expected: str,
         message: str = "",
         ignore_case: bool = False,
@@ -425,7 +415,7 @@ class Checks(SeleniumBase):
 
     def page_should_contain_link(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies link identified by ``locator`` is found from current page.
@@ -439,7 +429,7 @@ class Checks(SeleniumBase):
 
     def page_should_not_contain_link(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies link identified by ``locator`` is not found from current page.
@@ -453,7 +443,7 @@ class Checks(SeleniumBase):
 
     def page_should_contain_button(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies button ``locator`` is found from current page.
@@ -476,7 +466,7 @@ class Checks(SeleniumBase):
 
     def page_should_not_contain_button(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies button ``locator`` is not found from current page.
@@ -485,7 +475,7 @@ class Checks(SeleniumBase):
         """
         self.assert_page_not_contains(locator, message)
 
-    def checkbox_should_be_selected(self, locator: Union[WebElement, str]):
+    def checkbox_should_be_selected(self, locator: Union[WebElement, Locator, str]):
         """Verifies checkbox ``locator`` is selected/checked."""
         logger.info(f"Verifying checkbox '{locator}' is selected.")
         element = self._get_checkbox(locator)
@@ -494,7 +484,7 @@ class Checks(SeleniumBase):
                 f"Checkbox '{locator}' should have been selected but was not."
             )
 
-    def checkbox_should_not_be_selected(self, locator: Union[WebElement, str]):
+    def checkbox_should_not_be_selected(self, locator: Union[WebElement, Locator, str]):
         """Verifies checkbox ``locator`` is not selected/checked."""
         logger.info(f"Verifying checkbox '{locator}' is not selected.")
         element = self._get_checkbox(locator)
@@ -503,7 +493,7 @@ class Checks(SeleniumBase):
 
     def page_should_contain_checkbox(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies checkbox ``locator`` is found from the current page."""
@@ -511,7 +501,7 @@ class Checks(SeleniumBase):
 
     def page_should_not_contain_checkbox(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies checkbox ``locator`` is not found from the current page."""
@@ -519,7 +509,7 @@ class Checks(SeleniumBase):
 
     def page_should_contain_radio_button(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies radio button ``locator`` is found from current page.
@@ -531,7 +521,7 @@ class Checks(SeleniumBase):
 
     def page_should_not_contain_radio_button(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies radio button ``locator`` is not found from current page.
@@ -572,7 +562,7 @@ class Checks(SeleniumBase):
 
     def page_should_contain_textfield(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies text field ``locator`` is found from current page."""
@@ -580,7 +570,7 @@ class Checks(SeleniumBase):
 
     def page_should_not_contain_textfield(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies text field ``locator`` is not found from current page."""
@@ -588,7 +578,7 @@ class Checks(SeleniumBase):
 
     def textfield_should_contain(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         expected: str,
         message: Optional[str] = None,
     ):
@@ -610,7 +600,7 @@ class Checks(SeleniumBase):
 
     def textfield_value_should_be(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         expected: str,
         message: Optional[str] = None,
     ):
@@ -631,7 +621,7 @@ class Checks(SeleniumBase):
 
     def textarea_should_contain(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         expected: str,
         message: Optional[str] = None,
     ):
@@ -651,7 +641,7 @@ class Checks(SeleniumBase):
 
     def textarea_value_should_be(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         expected: str,
         message: Optional[str] = None,
     ):
@@ -0,0 +1,243 @@
+"""Per-command latency recording for WebDriver sessions"""
+
+import json
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Upper bounds in seconds, Prometheus style. The last bucket is +Inf.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_RECORDS = 10000
+# Frames searched for the page method that sent a command
+MAX_CALLER_DEPTH = 25
+# Public helpers every element method goes through, never the caller itself
+PLUMBING_METHODS = frozenset({"get_element", "handle_exception"})
+RUN = "run"
+
+
+@dataclass
+class CommandRecord:
+    """One WebDriver command as sent to the driver"""
+
+    name: str
+    duration: float
+    success: bool
+    locator: Optional[str] = None
+    caller: Optional[str] = None
+    test: Optional[str] = None
+
+
+class Histogram:
+    """Cumulative latency histogram for one command name"""
+
+    __slots__ = ("counts", "count", "total", "failures")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.failures = 0
+
+    def observe(self, duration: float, success: bool):
+        index = 0
+        while index < len(BUCKETS) and duration > BUCKETS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += duration
+        if not success:
+            self.failures += 1
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            running += count
+            yield bound, running
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "failures": self.failures,
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in self.cumulative()
+            },
+        }
+
+
+def _caller():
+    """Returns the innermost public page or mixin method and its locator.
+
+    For ``click_element`` that is ``click_element`` itself rather than the
+    page method that called it, which keeps the breakdown per method. Only
+    ``MAX_CALLER_DEPTH`` frames are looked at, since this runs on every
+    command.
+    """
+    from automation.selenium_base import SeleniumBase
+
+    locator = None
+    frame = sys._getframe(2)
+    for _ in range(MAX_CALLER_DEPTH):
+        if frame is None:
+            break
+        code = frame.f_code
+        if code.co_argcount and code.co_varnames[0] == "self":
+            local_vars = frame.f_locals
+            instance = local_vars.get("self")
+            if isinstance(instance, SeleniumBase):
+                if locator is None and local_vars.get("locator") is not None:
+                    locator = str(local_vars["locator"])
+                name = code.co_name
+                if not name.startswith("_") and name not in PLUMBING_METHODS:
+                    return f"{type(instance).__name__}.{name}", locator
+        frame = frame.f_back
+    return None, locator
+
+
+class CommandRecorder:
+    """Records every command sent through an instrumented driver.
+
+    Commands are aggregated into one histogram per command name for the
+    whole run and for each test. The most recent ``MAX_RECORDS`` raw
+    records are kept for the JSON export.
+    """
+
+    def __init__(self):
+        self.current_test: Optional[str] = None
+        self.histograms: Dict[str, Dict[str, Histogram]] = {RUN: {}}
+        self.records = deque(maxlen=MAX_RECORDS)
+        self._lock = threading.Lock()
+
+    def instrument(self, driver: WebDriver) -> WebDriver:
+        """Wraps the command executor of ``driver`` to record its commands."""
+        executor = driver.command_executor
+        if getattr(executor, "_pysel_recorder", None) is not None:
+            return driver
+        execute = executor.execute
+
+        def recorded_execute(command, params):
+            locator = None
+            if isinstance(params, dict) and "using" in params:
+                locator = f"{params['using']}={params.get('value')}"
+            started = time.perf_counter()
+            response = None
+            try:
+                response = execute(command, params)
+                return response
+            finally:
+                self.record(
+                    command,
+                    time.perf_counter() - started,
+                    self._succeeded(response),
+                    locator,
+                )
+
+        executor.execute = recorded_execute
+        executor._pysel_recorder = self
+        return driver
+
+    def record(self, name, duration, success, locator=None):
+        caller, caller_locator = _caller()
+        record = CommandRecord(
+            name=name,
+            duration=duration,
+            success=success,
+            locator=locator or caller_locator,
+            caller=caller,
+            test=self.current_test,
+        )
+        with self._lock:
+            self.records.append(record)
+            self._observe(RUN, record)
+            if record.test is not None:
+                self._observe(record.test, record)
+
+    def test_summary(self, test: str) -> str:
+        histograms = self.histograms.get(test, {})
+        count = sum(h.count for h in histograms.values())
+        total = sum(h.total for h in histograms.values())
+        return f"{count} driver commands, {total:.2f} seconds in driver"
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            scopes = {
+                scope: {name: h.to_dict() for name, h in histograms.items()}
+                for scope, histograms in self.histograms.items()
+            }
+            records = [asdict(record) for record in self.records]
+        return {"run": scopes.pop(RUN), "tests": scopes, "records": records}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Returns the histograms in the Prometheus text exposition format."""
+        seconds = "pyselenium_webdriver_command_seconds"
+        failures = "pyselenium_webdriver_command_failures_total"
+        with self._lock:
+            series = [
+                (
+                    f'scope="{_escape(scope)}",command="{_escape(name)}"',
+                    histogram,
+                )
+                for scope, histograms in self.histograms.items()
+                for name, histogram in sorted(histograms.items())
+            ]
+            lines = [
+                f"# HELP {seconds} Duration of WebDriver commands.",
+                f"# TYPE {seconds} histogram",
+            ]
+            for labels, histogram in series:
+                for bound, count in histogram.cumulative():
+                    le = "+Inf" if bound == float("inf") else str(bound)
+                    lines.append(
+                        f'{seconds}_bucket{{{labels},le="{le}"}} {count}'
+                    )
+                lines.append(f"{seconds}_sum{{{labels}}} {histogram.total:.6f}")
+                lines.append(f"{seconds}_count{{{labels}}} {histogram.count}")
+            lines += [
+                f"# HELP {failures} WebDriver commands that returned an error.",
+                f"# TYPE {failures} counter",
+            ]
+            for labels, histogram in series:
+                lines.append(f"{failures}{{{labels}}} {histogram.failures}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """Writes ``<path>.json`` and ``<path>.prom``."""
+        with open(f"{path}.json", "w") as f:
+            f.write(self.to_json())
+        with open(f"{path}.prom", "w") as f:
+            f.write(self.to_prometheus())
+
+    def _observe(self, scope, record):
+        histograms = self.histograms.setdefault(scope, {})
+        histogram = histograms.get(record.name)
+        if histogram is None:
+            histogram = histograms[record.name] = Histogram()
+        histogram.observe(record.duration, record.success)
+
+    @staticmethod
+    def _succeeded(response) -> bool:
+        if not isinstance(response, dict):
+            return False
+        status = response.get("status")
+        if status not in (None, 0) and not (
+            isinstance(status, int) and 200 <= status < 300
+        ):
+            return False
+        value = response.get("value")
+        return not (isinstance(value, dict) and "error" in value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+recorder = CommandRecorder()
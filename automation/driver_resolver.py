@@ -0,0 +1,97 @@
+"""Cached driver binary resolution for the local browser strategies"""
+
+import importlib
+import json
+import logging as logger
+import os
+import timeit
+from datetime import datetime
+from typing import Optional
+
+from config.config import DRIVER_MANIFEST_PATH
+
+# browser name -> (webdriver_manager browser type, driver manager class path).
+# webdriver_manager is only imported when a driver has to be resolved.
+DRIVER_MANAGERS = {
+    "chrome": ("google-chrome", "webdriver_manager.chrome.ChromeDriverManager"),
+    "firefox": ("firefox", "webdriver_manager.firefox.GeckoDriverManager"),
+    "edge": ("edge", "webdriver_manager.microsoft.EdgeChromiumDriverManager"),
+}
+
+
+class DriverResolver:
+    """Resolves driver binaries once per installed browser version.
+
+    ``ChromeDriverManager().install()`` checks versions and touches the
+    filesystem or network on every call. The resolved path is pinned in a
+    manifest keyed by browser and browser version, so later runs only read
+    the local browser version and the manifest. A new driver is resolved
+    only when the installed browser version changes. When the browser
+    version cannot be read, the last pinned driver is used, which keeps
+    resolution working fully offline.
+    """
+
+    _resolved = {}
+
+    def __init__(self, manifest_path: str = DRIVER_MANIFEST_PATH):
+        self.manifest_path = manifest_path
+
+    def resolve(self, browser: str) -> str:
+        browser = browser.lower()
+        if browser in DriverResolver._resolved:
+            return DriverResolver._resolved[browser]
+        starttime = timeit.default_timer()
+        browser_type, manager = DRIVER_MANAGERS[browser]
+        version = self.browser_version(browser_type)
+        manifest = self._read_manifest()
+        entry = manifest.get(browser)
+        if self._is_usable(entry, version):
+            path = entry["driver_path"]
+            source = "manifest"
+        else:
+            module, _, name = manager.rpartition(".")
+            path = getattr(importlib.import_module(module), name)().install()
+            manifest[browser] = {
+                "browser_version": version,
+                "driver_path": path,
+                "resolved_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._write_manifest(manifest)
+            source = "driver manager"
+        DriverResolver._resolved[browser] = path
+        time_taken = "{:.2f}".format(timeit.default_timer() - starttime)
+        logger.info(
+            f"Resolved {browser} driver {path} for browser version {version} "
+            f"from {source} in {time_taken} seconds"
+        )
+        return path
+
+    def browser_version(self, browser_type: str) -> Optional[str]:
+        from webdriver_manager.core.os_manager import OperationSystemManager
+
+        try:
+            return OperationSystemManager().get_browser_version_from_os(
+                browser_type
+            )
+        except Exception as e:
+            logger.info(f"Could not read the {browser_type} version: {e}")
+            return None
+
+    def _is_usable(self, entry: Optional[dict], version: Optional[str]) -> bool:
+        if not entry or not os.path.exists(entry["driver_path"]):
+            return False
+        return version is None or entry["browser_version"] == version
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: dict):
+        folder = os.path.dirname(self.manifest_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(self.manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
@@ -0,0 +1,157 @@
+"""Historical test durations and shards balanced with them"""
+
+import fcntl
+import hashlib
+import json
+import logging as logger
+import os
+import statistics
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from config.config import DEFAULT_TEST_DURATION, TEST_DURATIONS_PATH
+
+# Weight of the newest run in the moving average of a test's duration
+SMOOTHING = 0.5
+
+
+@dataclass
+class Shard:
+    index: int
+    nodeids: List[str] = field(default_factory=list)
+    predicted: float = 0.0
+
+
+class DurationStore:
+    """Moving average of each test's duration, kept between runs.
+
+    Durations are recorded in memory and merged into the file on ``save``
+    under an exclusive lock, so parallel workers can all save at the end of
+    their session.
+    """
+
+    def __init__(self, path: str = TEST_DURATIONS_PATH):
+        self.path = path
+        self.durations: Dict[str, dict] = self._read()
+        self._recorded: Dict[str, float] = {}
+
+    def record(self, nodeid: str, seconds: float):
+        self._recorded[nodeid] = seconds
+
+    def estimate(self, nodeid: str) -> float:
+        if nodeid in self.durations:
+            return self.durations[nodeid]["duration"]
+        known = [entry["duration"] for entry in self.durations.values()]
+        return statistics.median(known) if known else DEFAULT_TEST_DURATION
+
+    def save(self):
+        if not self._recorded:
+            return
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                durations = json.load(f)
+            except ValueError:
+                durations = {}
+            for nodeid, seconds in self._recorded.items():
+                entry = durations.get(nodeid)
+                if entry is None:
+                    durations[nodeid] = {"duration": seconds, "runs": 1}
+                else:
+                    entry["duration"] += SMOOTHING * (
+                        seconds - entry["duration"]
+                    )
+                    entry["runs"] += 1
+            f.seek(0)
+            f.truncate()
+            json.dump(durations, f, indent=2, sort_keys=True)
+        self.durations = durations
+        self._recorded = {}
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+def lpt_shards(
+    nodeids: List[str], store: DurationStore, count: int
+) -> List[Shard]:
+    """Splits the tests into ``count`` shards, longest processing time first.
+
+    Each test, slowest first, goes to the shard with the least predicted
+    time so far. Within a shard the tests stay slowest first.
+    """
+    shards = [Shard(index) for index in range(count)]
+    estimates = {nodeid: store.estimate(nodeid) for nodeid in nodeids}
+    for nodeid in sorted(nodeids, key=lambda nodeid: -estimates[nodeid]):
+        shard = min(shards, key=lambda shard: shard.predicted)
+        shard.nodeids.append(nodeid)
+        shard.predicted += estimates[nodeid]
+    return shards
+
+
+def hash_shards(
+    nodeids: List[str], store: DurationStore, count: int
+) -> List[Shard]:
+    """Splits the tests into ``count`` shards by a hash of their node id.
+
+    Unlike ``lpt_shards`` on a local durations file, every machine computes
+    the same shards from the same tests.
+    """
+    shards = [Shard(index) for index in range(count)]
+    for nodeid in sorted(nodeids):
+        digest = hashlib.sha1(nodeid.encode()).hexdigest()
+        shard = shards[int(digest, 16) % count]
+        shard.nodeids.append(nodeid)
+        shard.predicted += store.estimate(nodeid)
+    return shards
+
+
+def makespan_report(
+    shards: List[Shard],
+    actual: Dict[int, float],
+    planned: Optional[float] = None,
+) -> dict:
+    """Compares the predicted and measured time of each shard.
+
+    ``shards`` hold the tests that actually ran together, ``actual`` the
+    measured seconds by shard index, and ``planned`` the makespan predicted
+    before work stealing moved tests around.
+    """
+    report = {
+        "predicted_makespan": round(
+            max((shard.predicted for shard in shards), default=0.0), 2
+        ),
+        "actual_makespan": round(max(actual.values(), default=0.0), 2),
+        "shards": [
+            {
+                "index": shard.index,
+                "tests": len(shard.nodeids),
+                "predicted": round(shard.predicted, 2),
+                "actual": round(actual.get(shard.index, 0.0), 2),
+            }
+            for shard in shards
+        ],
+    }
+    if planned is not None:
+        report["planned_makespan"] = round(planned, 2)
+    for shard in report["shards"]:
+        logger.info(
+            f"Shard {shard['index']}: {shard['tests']} tests, predicted "
+            f"{shard['predicted']:.2f} seconds, actual {shard['actual']:.2f} seconds"
+        )
+    logger.info(
+        f"Makespan predicted {report['predicted_makespan']:.2f} seconds, "
+        f"actual {report['actual_makespan']:.2f} seconds"
+    )
+    return report
+
+
+durations = DurationStore()
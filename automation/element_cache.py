@@ -0,0 +1,145 @@
+"""Element handle cache invalidated by DOM mutations and navigation"""
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Optional, Tuple
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+if TYPE_CHECKING:
+    from automation.element_resolver import ResolvedElement
+
+ELEMENT_CACHE_SIZE = 256
+
+# Installs a MutationObserver on first use that bumps a counter on every DOM
+# change. Each document (a new page, or a frame) gets its own random id so
+# the (document id, counter) pair identifies one state of one document.
+GENERATION_SNIPPET = """
+function __pyselGeneration() {
+    if (!window.__pysel_generation) {
+        var state = {id: Date.now() + '-' + String(Math.random()).slice(2), count: 0};
+        new MutationObserver(function () { state.count += 1; }).observe(
+            document.documentElement,
+            {subtree: true, childList: true, attributes: true, characterData: true}
+        );
+        window.__pysel_generation = state;
+    }
+    return [window.__pysel_generation.id, window.__pysel_generation.count];
+}
+"""
+
+GENERATION_SCRIPT = GENERATION_SNIPPET + "return __pyselGeneration();"
+
+
+def cached_read_script(body: str, snippets: str = "") -> str:
+    """Wraps ``body`` so it only runs when the document changed.
+
+    ``arguments[0]`` is the generation the cached value was read at, the
+    remaining arguments are passed on to ``body``. The result holds the
+    current generation and either ``hit`` or the ``value`` returned by
+    ``body``. ``body`` returns undefined when it cannot read the value yet.
+    """
+    return (
+        GENERATION_SNIPPET
+        + snippets
+        + """
+var generation = __pyselGeneration();
+var expected = arguments[0];
+if (expected && expected[0] === generation[0] && expected[1] === generation[1]) {
+    return {generation: generation, hit: true};
+}
+var value = (function () {
+"""
+        + body
+        + """
+}).apply(null, Array.prototype.slice.call(arguments, 1));
+return {generation: generation, hit: false, ready: value !== undefined,
+        value: value === undefined ? null : value};
+"""
+    )
+
+
+Generation = Tuple[str, int]
+
+
+class ElementCache:
+    """Caches resolved elements and read results per DOM generation.
+
+    Nothing here costs a browser call of its own. A cached element is
+    passed to ``RESOLVE_SCRIPT``, which reuses it when the document's
+    ``(id, mutation count)`` generation has not moved and reads its
+    visibility and rect again in the same call, since CSS-only changes do
+    not bump the generation. Reads go through ``cached_read_script``,
+    which checks the generation and reads the value in one call.
+    ``clear`` is called on navigation so a new page never sees entries
+    from the previous one.
+    """
+
+    def __init__(
+        self, driver: WebDriver, max_entries: int = ELEMENT_CACHE_SIZE
+    ):
+        self.driver = driver
+        self.max_entries = max_entries
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Generation, Any]]" = (
+            OrderedDict()
+        )
+
+    def get_element(self, locator) -> Optional["ResolvedElement"]:
+        """Returns the last resolution of ``locator`` for the resolver to check."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(("element", locator))
+        return None if entry is None else entry[1]
+
+    def put_element(self, locator, resolved: "ResolvedElement"):
+        if not self.enabled:
+            return
+        if resolved.reused:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self._put(("element", locator), resolved, resolved.generation)
+
+    def drop_element(self, locator):
+        self._entries.pop(("element", locator), None)
+
+    def memoize(
+        self,
+        kind: str,
+        locator,
+        script: str,
+        args: tuple,
+        loader: Callable[[], Any],
+    ) -> Any:
+        """Returns the cached ``kind`` read for ``locator`` or reads it again.
+
+        ``script`` comes from ``cached_read_script`` and takes ``args``.
+        ``loader`` is only called when the script could not read the value,
+        for example when the element is not visible yet.
+        """
+        if not self.enabled:
+            return loader()
+        key = (kind, locator)
+        entry = self._entries.get(key)
+        result = self.driver.execute_script(
+            script, list(entry[0]) if entry else None, *args
+        )
+        if result["hit"]:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        value = result["value"] if result["ready"] else loader()
+        self._put(key, value, tuple(result["generation"]))
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def _put(self, key, value, generation: Generation):
+        self._entries[key] = (generation, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,320 @@
+"""Browser-side element resolution used by SeleniumBase"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import WebDriverWait
+
+from automation.element_cache import (
+    GENERATION_SNIPPET,
+    Generation,
+    cached_read_script,
+)
+from automation.error import (
+    ElementNotFoundException,
+    ElementNotVisibleException,
+)
+from automation.wait_times import DEFAULT
+
+POLL_FREQUENCY = 0.1
+
+# Shared by the resolver and the browser-side waits. __pyselFind returns the
+# element matches for a (by, value) pair below ``root`` (the document by
+# default), __pyselVisible approximates WebElement.is_displayed without a
+# round trip per element. The 'elements' strategy takes a list of elements
+# that were already found.
+FIND_SNIPPET = """
+function __pyselFind(by, value, root) {
+    var found = [];
+    root = root || document;
+    function all(list) { return Array.prototype.slice.call(list); }
+    function links(partial) {
+        return all(root.getElementsByTagName('a')).filter(function (a) {
+            var text = (a.innerText || a.textContent || '').trim();
+            return partial ? text.indexOf(value) !== -1 : text === value;
+        });
+    }
+    if (by === 'element') {
+        found = [value];
+    } else if (by === 'elements') {
+        found = all(value);
+    } else if (by === 'xpath') {
+        var snapshot = document.evaluate(
+            value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < snapshot.snapshotLength; i++) {
+            found.push(snapshot.snapshotItem(i));
+        }
+    } else if (by === 'css selector') {
+        found = all(root.querySelectorAll(value));
+    } else if (by === 'id') {
+        found = all(root.querySelectorAll('#' + CSS.escape(value)));
+    } else if (by === 'name') {
+        found = all(root.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+    } else if (by === 'class name') {
+        found = all(root.getElementsByClassName(value));
+    } else if (by === 'tag name') {
+        found = all(root.getElementsByTagName(value));
+    } else if (by === 'link text') {
+        found = links(false);
+    } else if (by === 'partial link text') {
+        found = links(true);
+    }
+    return found.filter(function (el) { return el && el.nodeType === 1; });
+}
+function __pyselVisible(el) {
+    if (!el.isConnected || el.getClientRects().length === 0) { return false; }
+    for (var node = el; node && node.nodeType === 1; node = node.parentElement) {
+        var style = window.getComputedStyle(node);
+        if (style.display === 'none' || style.opacity === '0') { return false; }
+        if (node === el && (style.visibility === 'hidden'
+                || style.visibility === 'collapse')) { return false; }
+    }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 || rect.height > 0 || el.children.length > 0;
+}
+"""
+
+# Finds the matches for a (by, value) pair and reports visibility, enabled
+# state and the page relative rect of each one, along with the DOM
+# generation they were read at. Runs as a single execute_script call so a
+# poll costs one HTTP round trip to the driver. ``arguments[3]`` and
+# ``arguments[4]`` are an optional cached element and the generation it
+# was found at. It is reused instead of searching again while that
+# generation is current, and its state is still read fresh.
+RESOLVE_SCRIPT = GENERATION_SNIPPET + FIND_SNIPPET + """
+var generation = __pyselGeneration();
+var cached = arguments[3], expected = arguments[4];
+var reused = !!(cached && expected && cached.isConnected
+    && expected[0] === generation[0] && expected[1] === generation[1]);
+var found = reused ? [cached] : __pyselFind(arguments[0], arguments[1]);
+if (arguments[2]) { found = found.slice(0, 1); }
+var matches = found.map(function (el) {
+    var rect = el.getBoundingClientRect();
+    return {
+        element: el,
+        visible: __pyselVisible(el),
+        enabled: !el.disabled,
+        rect: {
+            x: Math.round(rect.left + window.scrollX),
+            y: Math.round(rect.top + window.scrollY),
+            width: Math.round(rect.width),
+            height: Math.round(rect.height)
+        }
+    };
+});
+return {generation: generation, reused: reused, matches: matches};
+"""
+
+# "text" is the rendered text like WebElement.text; other names follow
+# WebElement.get_attribute and read the DOM property first, then the
+# attribute.
+READ_SNIPPET = """
+function __pyselRead(el, name) {
+    var value;
+    if (name === 'text') {
+        value = el.tagName === 'OPTION' ? el.text : el.innerText;
+    } else if (name in el && (el[name] === null || typeof el[name] !== 'object')) {
+        value = el[name];
+    } else {
+        value = el.getAttribute(name);
+    }
+    return value === undefined ? null : value;
+}
+"""
+
+# Rendered text of the first match of a (by, value) pair once it is visible,
+# for ``ElementCache.memoize``.
+TEXT_READ_SCRIPT = cached_read_script(
+    """
+var el = __pyselFind(arguments[0], arguments[1])[0];
+if (!el || !__pyselVisible(el)) { return undefined; }
+return el.innerText;
+""",
+    FIND_SNIPPET,
+)
+
+# Reads ``properties`` from every match in one call.
+PROPERTIES_SCRIPT = FIND_SNIPPET + READ_SNIPPET + """
+var found = __pyselFind(arguments[0], arguments[1], arguments[2]);
+var properties = arguments[3];
+return {
+    visible: found.some(__pyselVisible),
+    items: found.map(function (el) {
+        var item = {};
+        properties.forEach(function (name) { item[name] = __pyselRead(el, name); });
+        return item;
+    })
+};
+"""
+
+
+@dataclass
+class ResolvedElement:
+    """An element together with the state read in the same browser call"""
+
+    element: WebElement
+    visible: bool = False
+    enabled: bool = True
+    rect: dict = field(default_factory=dict)
+    generation: Optional[Generation] = None
+    reused: bool = False
+
+
+def locator_error_message(
+    exception: Exception, locator: Tuple[str, str]
+) -> str:
+    return (
+        "An exception of type "
+        + type(exception).__name__
+        + " occurred. With Element -: "
+        + " - locator: ("
+        + locator[0]
+        + ", "
+        + locator[1]
+        + ")"
+    )
+
+
+class ElementResolver:
+    """Resolves locators with one execute_script call per poll.
+
+    Finding the element, checking its visibility and reading its rect used to
+    be separate WebDriver commands, each repeated on every poll of a
+    ``WebDriverWait``. Here they are done together inside the browser.
+    """
+
+    def __init__(
+        self, driver: WebDriver, poll_frequency: float = POLL_FREQUENCY
+    ):
+        self.driver = driver
+        self.poll_frequency = poll_frequency
+
+    def resolve(
+        self,
+        locator,
+        first: bool = True,
+        cached: Optional[ResolvedElement] = None,
+    ) -> List[ResolvedElement]:
+        """Returns the current matches for ``locator`` without waiting.
+
+        ``locator`` is either a ``(by, value)`` tuple or a ``WebElement``.
+        ``cached`` is an earlier resolution of ``locator`` that is reused
+        when the DOM has not changed since. When the driver rejects it as
+        stale, ``locator`` is searched for again without it.
+        """
+        if isinstance(locator, WebElement):
+            by, value = "element", locator
+        else:
+            by, value = locator
+        args = [by, value, first]
+        if cached is not None and first:
+            try:
+                result = self.driver.execute_script(
+                    RESOLVE_SCRIPT,
+                    *args,
+                    cached.element,
+                    list(cached.generation)
+                )
+            except (StaleElementReferenceException, NoSuchElementException):
+                # the driver checks element arguments before the script runs
+                result = self.driver.execute_script(RESOLVE_SCRIPT, *args)
+        else:
+            result = self.driver.execute_script(RESOLVE_SCRIPT, *args)
+        generation = tuple(result["generation"])
+        return [
+            ResolvedElement(
+                element=match["element"],
+                visible=match["visible"],
+                enabled=match["enabled"],
+                rect=match["rect"],
+                generation=generation,
+                reused=result.get("reused", False),
+            )
+            for match in result["matches"]
+        ]
+
+    def read_properties(
+        self, locator, properties: List[str], timeout=DEFAULT, parent=None
+    ) -> List[dict]:
+        """Returns ``properties`` of every match of ``locator`` as dicts.
+
+        ``locator`` is a ``(by, value)`` tuple or a list of ``WebElement``.
+        Polls until at least one match is visible and returns an empty list
+        if none became visible before ``timeout``.
+        """
+        if isinstance(locator, list):
+            by, value = "elements", locator
+        else:
+            by, value = locator
+        last = {"items": []}
+
+        def condition(_):
+            nonlocal last
+            last = self.driver.execute_script(
+                PROPERTIES_SCRIPT, by, value, parent, list(properties)
+            )
+            return last["visible"] or not timeout
+
+        try:
+            WebDriverWait(
+                self.driver, timeout, poll_frequency=self.poll_frequency
+            ).until(condition)
+        except TimeoutException:
+            return []
+        return last["items"]
+
+    def wait_for(
+        self,
+        locator,
+        timeout=DEFAULT,
+        visible: bool = True,
+        enabled: bool = False,
+        first: bool = True,
+        cached: Optional[ResolvedElement] = None,
+    ) -> List[ResolvedElement]:
+        """Polls until ``locator`` matches and satisfies the requested state.
+
+        Raises ``ElementNotFoundException`` when nothing matched before the
+        timeout and ``ElementNotVisibleException`` when the match never
+        became visible (or enabled when ``enabled`` is requested).
+        """
+        last: Optional[List[ResolvedElement]] = None
+
+        def condition(_):
+            nonlocal last, cached
+            last = self.resolve(locator, first, cached)
+            if cached is not None and not (last and last[0].reused):
+                # once the cached element is not reused it never will be
+                cached = None
+            if not last:
+                return False
+            if visible and not any(
+                r.visible and (r.enabled or not enabled) for r in last
+            ):
+                return False
+            return last
+
+        try:
+            return WebDriverWait(
+                self.driver, timeout, poll_frequency=self.poll_frequency
+            ).until(condition)
+        except TimeoutException as e:
+            locator_tuple = (
+                ("element", str(locator))
+                if isinstance(locator, WebElement)
+                else locator
+            )
+            if not last:
+                raise ElementNotFoundException(
+                    locator_error_message(e, locator_tuple)
+                ) from e
+            raise ElementNotVisibleException(
+                locator_error_message(e, locator_tuple)
+            ) from e
@@ -28,3 +28,7 @@ class NoOpenBrowser(PageException):
 
 class PluginError(PageException):
     pass
+
+
+class NavigationNotCommitted(PageException):
+    """Raise when a navigation never replaced the document, e.g. a download."""
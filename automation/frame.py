@@ -1,4 +1,5 @@
 import logging as logger
+from automation.locator import Locator
 from automation.selenium_base import SeleniumBase
 from automation.wait_times import DEFAULT, SHORT
 from selenium.common.exceptions import (
@@ -43,7 +44,7 @@ class Frame(SeleniumBase):
             )
         logger.info(f"Current frame did not contain text '{text}'.")
 
-    def frame_should_contain(self, locator: Union[WebElement, str], text: str):
+    def frame_should_contain(self, locator: Union[WebElement, Locator, str], text: str):
         """Verifies that frame identified by ``locator`` contains ``text``."""
         if not self._frame_contains(locator, text):
             raise AssertionError(
@@ -51,7 +52,7 @@ class Frame(SeleniumBase):
             )
         logger.info(f"Frame '{locator}' contains text '{text}'.")
 
-    def _frame_contains(self, locator: Union[WebElement, str], text: str):
+    def _frame_contains(self, locator: Union[WebElement, Locator, str], text: str):
         element = self.get_element(locator)
         self.driver.switch_to.frame(element)
         logger.info(f"Searching for text from frame '{locator}'.")
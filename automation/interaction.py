@@ -5,10 +5,12 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from utils.common import plural_or_not
 from automation.wait_times import DEFAULT
+from automation.locator import Locator
 from automation.selenium_base import SeleniumBase
 from selenium.webdriver.remote.webdriver import WebDriver
 from typing import List
 import os
+from automation import batch as batched
 from automation.error import ElementNotFoundException
 
 
@@ -17,16 +19,22 @@ class Interaction(SeleniumBase):
         self.driver = driver
         logger.info("Interaction  initialized")
 
-    def get_attribute(self, locator: Union[WebElement, str], attribute_name):
+    def get_attribute(self, locator: Union[WebElement, Locator, str], attribute_name):
         """
         get webElement attribute
         :param: name of Attribute
         :return: webElement attribute value
         """
+        if (
+            future := self._batched(batched.PROPERTY, locator, attribute_name)
+        ) is not None:
+            return future
         element = self.get_element(locator)
         return element.get_attribute(attribute_name)
 
-    def set_attribute(self, locator: Union[WebElement, str], attribute_name, value):
+    def set_attribute(
+        self, locator: Union[WebElement, Locator, str], attribute_name, value
+    ):
         """
         set webElement attribute
         :param: name of Attribute
@@ -48,7 +56,7 @@ class Interaction(SeleniumBase):
             "arguments[0].style.border='2px ridge #33ffff'", element
         )
 
-    def click_element(self, locator: Union[WebElement, str]) -> WebElement:
+    def click_element(self, locator: Union[WebElement, Locator, str]) -> WebElement:
         # logger.info("clicking %s", locator)
         """
         Perform  click on webElement
@@ -60,7 +68,7 @@ class Interaction(SeleniumBase):
         return element
 
     def click_element_at_coordinates(
-        self, locator: Union[WebElement, str], xoffset: int, yoffset: int
+        self, locator: Union[WebElement, Locator, str], xoffset: int, yoffset: int
     ):
         """Click the element ``locator`` at ``xoffset/yoffset``.
         The Cursor is moved and the center of the element and x/y coordinates are
@@ -76,7 +84,7 @@ class Interaction(SeleniumBase):
         action.click()
         action.perform()
 
-    def double_click_element(self, locator: Union[WebElement, str]):
+    def double_click_element(self, locator: Union[WebElement, Locator, str]):
         """Double clicks the element identified by ``locator``."""
         logger.info(f"Double clicking element '{locator}'.")
         element = self.get_element(locator)
@@ -84,7 +92,9 @@ class Interaction(SeleniumBase):
         action.double_click(element).perform()
 
     def drag_and_drop(
-        self, locator: Union[WebElement, str], target: Union[WebElement, str]
+        self,
+        locator: Union[WebElement, Locator, str],
+        target: Union[WebElement, Locator, str],
     ):
         """Drags the element identified by ``locator`` into the ``target`` element.
 
@@ -97,7 +107,7 @@ class Interaction(SeleniumBase):
         action.drag_and_drop(element, target).perform()
 
     def drag_and_drop_by_offset(
-        self, locator: Union[WebElement, str], xoffset: int, yoffset: int
+        self, locator: Union[WebElement, Locator, str], xoffset: int, yoffset: int
     ):
         """Drags the element identified with ``locator`` by ``xoffset/yoffset``.
         The element will be moved by ``xoffset`` and ``yoffset``, each of which
@@ -108,7 +118,7 @@ class Interaction(SeleniumBase):
         action.drag_and_drop_by_offset(element, xoffset, yoffset)
         action.perform()
 
-    def mouse_down(self, locator: Union[WebElement, str]):
+    def mouse_down(self, locator: Union[WebElement, Locator, str]):
         """Simulates pressing the left mouse button on the element ``locator``.
 
         The element is pressed without releasing the mouse button.
@@ -119,7 +129,7 @@ class Interaction(SeleniumBase):
         action = ActionChains(self.driver)
         action.click_and_hold(element).perform()
 
-    def mouse_out(self, locator: Union[WebElement, str]):
+    def mouse_out(self, locator: Union[WebElement, Locator, str]):
         """Simulates moving the mouse away from the element ``locator``."""
         logger.info(f"Simulating Mouse Out on element '{locator}'.")
         element = self.get_element(locator)
@@ -131,30 +141,30 @@ class Interaction(SeleniumBase):
         action.move_by_offset(offsetx, offsety)
         action.perform()
 
-    def mouse_over(self, locator: Union[WebElement, str]):
+    def mouse_over(self, locator: Union[WebElement, Locator, str]):
         """Simulates hovering the mouse over the element ``locator``."""
         logger.info(f"Simulating Mouse Over on element '{locator}'.")
         element = self.get_element(locator)
         action = ActionChains(self.driver)
         action.move_to_element(element).perform()
 
-    def mouse_up(self, locator: Union[WebElement, str]):
+    def mouse_up(self, locator: Union[WebElement, Locator, str]):
         """Simulates releasing the left mouse button on the element ``locator``."""
         logger.info(f"Simulating Mouse Up on element '{locator}'.")
         element = self.get_element(locator)
         ActionChains(self.driver).release(element).perform()
 
-    def open_context_menu(self, locator: Union[WebElement, str]):
+    def open_context_menu(self, locator: Union[WebElement, Locator, str]):
         """Opens the context menu on the element identified by ``locator``."""
         element = self.get_element(locator)
         action = ActionChains(self.driver)
         action.context_click(element).perform()
 
-    def clear_element_text(self, locator: Union[WebElement, str]):
+    def clear_element_text(self, locator: Union[WebElement, Locator, str]):
         """Clears the value of the text-input-element identified by ``locator``."""
         self.get_element(locator).clear()
 
-    def click_and_hold(self, locator: Union[WebElement, str]) -> WebElement:
+    def click_and_hold(self, locator: Union[WebElement, Locator, str]) -> WebElement:
         """
         This method will replace the moveToElement(onElement).clickAndHold()
         Added support for Selenium 4
@@ -165,7 +175,7 @@ class Interaction(SeleniumBase):
         ActionChains(self.driver).click_and_hold(on_element=element)
         return element
 
-    def _click_with_action_chain(self, locator: Union[WebElement, str]):
+    def _click_with_action_chain(self, locator: Union[WebElement, Locator, str]):
         logger.info(f"Clicking '{locator}' using an action chain.")
         action = ActionChains(self.driver)
         element = self.get_element(locator)
@@ -173,7 +183,7 @@ class Interaction(SeleniumBase):
         action.click()
         action.perform()
 
-    def release(self, locator: Union[WebElement, str]) -> WebElement:
+    def release(self, locator: Union[WebElement, Locator, str]) -> WebElement:
         """
         Releasing a held mouse button on an element.
         Added support for Selenium 4
@@ -184,7 +194,7 @@ class Interaction(SeleniumBase):
         ActionChains(self.driver).release(on_element=element)
         return element
 
-    def set_text(self, locator: Union[WebElement, str], value) -> WebElement:
+    def set_text(self, locator: Union[WebElement, Locator, str], value) -> WebElement:
         """
         type text in input box
         :param: Text to be Enter
@@ -195,10 +205,12 @@ class Interaction(SeleniumBase):
         return element
 
     def get_value(self, locator, timeout=DEFAULT):
+        if (future := self._batched(batched.PROPERTY, locator, "value")) is not None:
+            return future
         element = self.get_element(locator, timeout)
         return None if element is None else element.get_attribute("value")
 
-    def clear_text(self, locator: Union[WebElement, str]) -> WebElement:
+    def clear_text(self, locator: Union[WebElement, Locator, str]) -> WebElement:
         """
         Clear text from EditBox
         :param: None
@@ -208,7 +220,7 @@ class Interaction(SeleniumBase):
         element.clear()
         return element
 
-    def hover(self, locator: Union[WebElement, str]) -> WebElement:
+    def hover(self, locator: Union[WebElement, Locator, str]) -> WebElement:
         """
         perform hover operation on webElement
         :param: None
@@ -220,7 +232,9 @@ class Interaction(SeleniumBase):
         ActionChains(self.driver).move_to_element(element).perform()
         return element
 
-    def press_keys(self, locator: Union[WebElement, None, str] = None, *keys: str):
+    def press_keys(
+        self, locator: Union[WebElement, Locator, None, str] = None, *keys: str
+    ):
         """Simulates the user pressing key(s) to an element or on the active browser."""
         parsed_keys = self._parse_keys(*keys)
         logger.info(f"Sending key(s) {keys} to {locator} element.")
@@ -261,6 +275,8 @@ class Interaction(SeleniumBase):
         self.get_element(locator).submit()
 
     def get_url(self, locator):
+        if (future := self._batched(batched.PROPERTY, locator, "href")) is not None:
+            return future
         return self.get_element(locator).get_attribute("href")
 
     def click_by_js(self, locator, timeout=DEFAULT):
@@ -268,19 +284,23 @@ class Interaction(SeleniumBase):
         # logger.info("clicking element using javascript")
         self.driver.execute_script("arguments[0].click()", element)
 
-    def send_keys_by_js(self, locator: Union[WebElement, str], text, timeout=DEFAULT):
+    def send_keys_by_js(
+        self, locator: Union[WebElement, Locator, str], text, timeout=DEFAULT
+    ):
         element = self.get_element(locator, timeout)
         # logger.info("sening keys  element using javascript")
         self.driver.execute_script(f"arguments[0].value='{text}';", element)
 
-    def change_color(self, locator: Union[WebElement, str], color, timeout=DEFAULT):
+    def change_color(
+        self, locator: Union[WebElement, Locator, str], color, timeout=DEFAULT
+    ):
         element = self.get_element(locator, timeout)
 
         self.driver.execute_script(
             self, f"arguments[0].style.backgroundColor = '{color}'", element
         )
 
-    def draw_border(self, locator: Union[WebElement, str], timeout=DEFAULT):
+    def draw_border(self, locator: Union[WebElement, Locator, str], timeout=DEFAULT):
         element = self.get_element(locator, timeout)
         self.driver.execute_script(
             "arguments[0].style.border = '3px solid red'", element
@@ -295,19 +315,21 @@ class Interaction(SeleniumBase):
     def get_page_inner_text_by_js(self):
         return self.driver.execute_script("return document.documentElement.innerText")
 
-    def select_date(self, locator: Union[WebElement, str], date, timeout=DEFAULT):
+    def select_date(
+        self, locator: Union[WebElement, Locator, str], date, timeout=DEFAULT
+    ):
         element = self.get_element(locator, timeout)
         self.driver.execute_script
         (f"arguments[0].setAttribute('value', '{date}')", element)
 
-    def focus(self, locator: Union[WebElement, str], timeout=DEFAULT):
+    def focus(self, locator: Union[WebElement, Locator, str], timeout=DEFAULT):
         element = self.get_element(locator, timeout)
         self.driver.execute_script("arguments[0].focus();", element)
 
     def focus_on_page(self):
         self.driver.execute_script("window.focus();")
 
-    def mouse_down_on_image(self, locator: Union[WebElement, str]):
+    def mouse_down_on_image(self, locator: Union[WebElement, Locator, str]):
         """Simulates a mouse down event on an image identified by ``locator``.
 
         When using the default locator strategy, images are searched
@@ -317,7 +339,7 @@ class Interaction(SeleniumBase):
         action = ActionChains(self.driver)
         action.click_and_hold(element).perform()
 
-    def mouse_down_on_link(self, locator: Union[WebElement, str]):
+    def mouse_down_on_link(self, locator: Union[WebElement, Locator, str]):
         """Simulates a mouse down event on a link identified by ``locator``.
 
         When using the default locator strategy, links are searched
@@ -327,7 +349,7 @@ class Interaction(SeleniumBase):
         action = ActionChains(self.driver)
         action.click_and_hold(element).perform()
 
-    def submit_form(self, locator: Union[WebElement, None, str] = None):
+    def submit_form(self, locator: Union[WebElement, Locator, None, str] = None):
         """Submits a form identified by ``locator``.
         If ``locator`` is not given, first form on the page is submitted.
         """
@@ -337,7 +359,7 @@ class Interaction(SeleniumBase):
         element = self.get_element(locator)
         element.submit()
 
-    def select_checkbox(self, locator: Union[WebElement, str]):
+    def select_checkbox(self, locator: Union[WebElement, Locator, str]):
         """Selects the checkbox identified by ``locator``.
         Does nothing if checkbox is already selected.
         """
@@ -346,7 +368,7 @@ class Interaction(SeleniumBase):
         if not element.is_selected():
             element.click()
 
-    def unselect_checkbox(self, locator: Union[WebElement, str]):
+    def unselect_checkbox(self, locator: Union[WebElement, Locator, str]):
         """Removes the selection of checkbox identified by ``locator``.
         Does nothing if the checkbox is not selected.
         """
@@ -367,21 +389,24 @@ class Interaction(SeleniumBase):
         if not element.is_selected():
             element.click()
 
-    def choose_file(self, locator: Union[WebElement, str], file_path: str):
+    def choose_file(self, locator: Union[WebElement, Locator, str], file_path: str):
         """Inputs the ``file_path`` into the file input field ``locator``."""
 
         logger.info(f"Sending {os.path.abspath(file_path)} to browser.")
         self.get_element(locator).send_keys(file_path)
 
     def input_password(
-        self, locator: Union[WebElement, str], password: str, clear: bool = True
+        self,
+        locator: Union[WebElement, Locator, str],
+        password: str,
+        clear: bool = True,
     ):
         """Types the given password into the text field identified by ``locator``."""
         logger.info(f"Typing password into text field '{locator}'.")
         self._input_text_into_text_field(locator, password, clear)
 
     def input_text(
-        self, locator: Union[WebElement, str], text: str, clear: bool = True
+        self, locator: Union[WebElement, Locator, str], text: str, clear: bool = True
     ):
         """Types the given ``text`` into the text field identified by ``locator``."""
         logger.info(f"Typing text '{text}' into text field '{locator}'.")
@@ -390,7 +415,7 @@ class Interaction(SeleniumBase):
     def _get_value(self, locator):
         return self.get_element(locator).get_attribute("value")
 
-    def _get_checkbox(self, locator: Union[WebElement, str]) -> WebElement:
+    def _get_checkbox(self, locator: Union[WebElement, Locator, str]) -> WebElement:
         return self.get_element(locator)
 
     def _get_radio_buttons(self, group_name):
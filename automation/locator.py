@@ -0,0 +1,87 @@
+"""Pre-parsed locators for page object classes"""
+
+import re
+from functools import lru_cache
+
+from selenium.webdriver.common.by import By
+
+from automation.error import NotValidLocatorException
+
+LOCATOR_CACHE_SIZE = 1024
+
+locator_types = {
+    "css": By.CSS_SELECTOR,
+    "id": By.ID,
+    "name": By.NAME,
+    "xpath": By.XPATH,
+    "x": By.XPATH,
+    "link_text": By.LINK_TEXT,
+    "partial_link_text": By.PARTIAL_LINK_TEXT,
+    "tag": By.TAG_NAME,
+    "class": By.CLASS_NAME,
+}
+
+# "<strategy>=<value>" or "<strategy>:<value>". Anything else is an xpath.
+_STRATEGY_PATTERN = re.compile(r"^\s*([a-zA-Z_]+)\s*[=:](?!:)(.*)$", re.DOTALL)
+
+
+class Locator:
+    """A locator string parsed into its ``(by, value)`` pair.
+
+    Page objects declare their locators as ``Locator`` instances so the
+    string is parsed once at import time. Plain strings passed to the
+    ``SeleniumBase`` methods go through ``parse_locator`` which caches the
+    parsed instance. ``str(locator)`` gives back the original string so
+    locators can still be composed with f-strings.
+    """
+
+    __slots__ = ("by", "value", "raw")
+
+    def __init__(self, raw: str):
+        match = _STRATEGY_PATTERN.match(raw)
+        if match and match.group(1).lower() in locator_types:
+            by = locator_types[match.group(1).lower()]
+            value = match.group(2).strip()
+        else:
+            by = By.XPATH
+            value = raw.strip()
+        if not value:
+            raise NotValidLocatorException(f"""An exception of type
+                NotValidLocatorException
+                occurred. With Element -:
+                + {raw}""")
+        self.by = by
+        self.value = value
+        self.raw = raw
+
+    def as_tuple(self) -> tuple:
+        return (self.by, self.value)
+
+    def __iter__(self):
+        return iter((self.by, self.value))
+
+    def __getitem__(self, index):
+        return self.as_tuple()[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, Locator):
+            return NotImplemented
+        return self.by == other.by and self.value == other.value
+
+    def __hash__(self):
+        return hash((self.by, self.value))
+
+    def __str__(self):
+        return self.raw
+
+    def __repr__(self):
+        return f"Locator({self.raw!r})"
+
+
+@lru_cache(maxsize=LOCATOR_CACHE_SIZE)
+def parse_locator(locator: str) -> Locator:
+    """Returns the cached ``Locator`` for ``locator``.
+
+    Hit and miss counters are available through ``parse_locator.cache_info()``.
+    """
+    return Locator(locator)
@@ -7,10 +7,7 @@ from automation.scroll import Scroll
 from automation.selectelement import SelectElement
 from automation.tableelement import TableElement
 from automation.asserts import Verify
-
-from config.config import LOG_SUMMARY_PATH
-
-from datetime import datetime
+from automation.result_sink import result_sink
 
 
 class PageBase(
@@ -24,7 +21,5 @@ class PageBase(
     TableElement,
     Verify,
 ):
-    def write_to_summary(self, message):
-        f = open(LOG_SUMMARY_PATH, "a")
-        time = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
-        f.write(f"{time}|{message}\n")
+    def write_to_summary(self, message, **fields):
+        result_sink.write(message, **fields)
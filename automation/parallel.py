@@ -0,0 +1,426 @@
+"""Pytest plugin running tests on several local browser workers.
+
+``pytest --workers 3`` collects the tests once, starts three worker pytest
+processes and hands tests out to them while they run. Every worker starts
+with a shard balanced on the historical test durations, slowest tests
+first, and steals from the back of the longest remaining shard once its own
+is done. Reports and log records of the workers are forwarded to the main
+process, which prints one merged result.
+
+``pytest --shard 2/4`` runs the second of four shards, for splitting a run
+across machines. Tests are split by a hash of their node id, or balanced on
+``--shard-durations``, a durations file every machine shares, so that all
+of them agree on the shards. The hash split ignores the durations, so its
+shards can differ a lot in length; the local durations file is not used as
+a default because it differs between machines.
+"""
+
+import argparse
+import json
+import logging as logger
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import timeit
+from collections import deque
+from multiprocessing.managers import BaseManager
+from typing import Dict, List, Optional
+
+import pytest
+
+from automation.durations import (
+    DurationStore,
+    Shard,
+    durations,
+    hash_shards,
+    lpt_shards,
+    makespan_report,
+)
+from config.config import SHARD_REPORT_PATH
+
+ADDRESS_ENV = "PYSEL_PARALLEL_ADDRESS"
+AUTHKEY_ENV = "PYSEL_PARALLEL_AUTHKEY"
+WORKER_LOG_PATH = "./logs/workers"
+RESULT_POLL_INTERVAL = 0.5
+
+REPORT = "report"
+LOG = "log"
+DONE = "done"
+
+
+class WorkQueue:
+    """Per-worker deques of test node ids with stealing between them.
+
+    Ids handed to a worker stay assigned to it until ``complete``, so the
+    tests a crashed worker had taken, including the one it prefetched, can
+    still be reported.
+    """
+
+    def __init__(self, shards: List[Shard]):
+        self._queues = [deque(shard.nodeids) for shard in shards]
+        self._assigned: Dict[int, Dict[str, None]] = {}
+        self.completed: Dict[int, List[str]] = {}
+        self._lock = threading.Lock()
+        self.stolen = 0
+
+    def take(self, worker: int) -> Optional[str]:
+        with self._lock:
+            own = self._queues[worker]
+            if own:
+                nodeid = own.popleft()
+            else:
+                victim = max(self._queues, key=len)
+                if not victim:
+                    return None
+                self.stolen += 1
+                nodeid = victim.pop()
+            self._assigned.setdefault(worker, {})[nodeid] = None
+            return nodeid
+
+    def complete(self, worker: int, nodeid: str):
+        with self._lock:
+            self._assigned.get(worker, {}).pop(nodeid, None)
+            self.completed.setdefault(worker, []).append(nodeid)
+
+    def unfinished(self, worker: int) -> List[str]:
+        """Returns and forgets the ids ``worker`` took but did not finish."""
+        with self._lock:
+            return list(self._assigned.pop(worker, {}))
+
+    def remaining(self) -> List[str]:
+        """Returns and forgets the ids no worker took."""
+        with self._lock:
+            nodeids = [nodeid for own in self._queues for nodeid in own]
+            for own in self._queues:
+                own.clear()
+            return nodeids
+
+
+class ParallelManager(BaseManager):
+    pass
+
+
+def _serve(server):
+    try:
+        server.serve_forever()
+    except SystemExit:
+        # serve_forever exits once stop_event is set
+        pass
+
+
+def is_worker(config) -> bool:
+    return config.getoption("worker_id") is not None
+
+
+def worker_name(worker: int) -> str:
+    return f"gw{worker}"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--workers",
+        action="store",
+        type=int,
+        default=1,
+        help="number of local browser workers to run the tests on",
+    )
+    parser.addoption(
+        "--shard",
+        action="store",
+        help=(
+            "run only shard K of N shards, given as K/N; without "
+            "--shard-durations tests are split by a hash of their node id, "
+            "which ignores how long they take"
+        ),
+    )
+    parser.addoption(
+        "--shard-durations",
+        action="store",
+        help="durations file shared by all machines to balance the shards on",
+    )
+    parser.addoption(
+        "--worker-id", action="store", type=int, help=argparse.SUPPRESS
+    )
+
+
+def pytest_configure(config):
+    if is_worker(config):
+        config.pluginmanager.register(Worker(config), "pysel_parallel_worker")
+    elif config.getoption("--shard"):
+        config.pluginmanager.register(ShardSelector(config), "pysel_shard")
+
+
+def write_shard_report(
+    shards: List[Shard],
+    actual: Dict[int, float],
+    planned: Optional[float] = None,
+):
+    report = makespan_report(shards, actual, planned)
+    folder = os.path.dirname(SHARD_REPORT_PATH)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(SHARD_REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    config = session.config
+    if is_worker(config):
+        return config.pluginmanager.get_plugin("pysel_parallel_worker").run(
+            session
+        )
+    workers = min(config.getoption("--workers"), len(session.items))
+    if workers <= 1 or config.option.collectonly:
+        return None
+    return Controller(session, workers).run()
+
+
+class Controller:
+    """Starts the workers and replays their reports in this process"""
+
+    def __init__(self, session, workers: int):
+        self.session = session
+        self.config = session.config
+        self.workers = workers
+        nodeids = [item.nodeid for item in session.items]
+        self.shards = lpt_shards(nodeids, durations, workers)
+        self.work = WorkQueue(self.shards)
+        self.results = queue.Queue()
+        self.finished: Dict[int, float] = {}
+        self.items = {item.nodeid: item for item in session.items}
+
+    def run(self) -> bool:
+        ParallelManager.register("work", callable=lambda: self.work)
+        ParallelManager.register("results", callable=lambda: self.results)
+        authkey = secrets.token_bytes(16)
+        server = ParallelManager(
+            address=("127.0.0.1", 0), authkey=authkey
+        ).get_server()
+        threading.Thread(target=_serve, args=(server,), daemon=True).start()
+        host, port = server.address
+        env = dict(os.environ, **{ADDRESS_ENV: f"{host}:{port}"})
+        env[AUTHKEY_ENV] = authkey.hex()
+        os.makedirs(WORKER_LOG_PATH, exist_ok=True)
+        self.started = timeit.default_timer()
+        processes = {
+            worker: subprocess.Popen(
+                self._worker_args(worker), env=env, stdout=subprocess.DEVNULL
+            )
+            for worker in range(self.workers)
+        }
+        logger.info(f"Started {self.workers} workers")
+        try:
+            self._collect(processes)
+        finally:
+            for process in processes.values():
+                if process.poll() is None:
+                    process.terminate()
+            server.stop_event.set()
+        remaining = self.work.remaining()
+        if remaining:
+            logger.error(f"No worker ran {len(remaining)} tests")
+        for nodeid in remaining:
+            self._report_lost(nodeid, f"No worker ran {nodeid}")
+        logger.info(f"Workers finished, {self.work.stolen} tests were stolen")
+        write_shard_report(
+            self._executed(),
+            self.finished,
+            planned=max(shard.predicted for shard in self.shards),
+        )
+        return True
+
+    def _executed(self) -> List[Shard]:
+        """The tests each worker finished, stolen ones included."""
+        executed = []
+        for worker in range(self.workers):
+            nodeids = self.work.completed.get(worker, [])
+            predicted = sum(durations.estimate(nodeid) for nodeid in nodeids)
+            executed.append(Shard(worker, nodeids, predicted))
+        return executed
+
+    def _worker_args(self, worker: int) -> List[str]:
+        args, skip = [], False
+        for arg in self.config.invocation_params.args:
+            if not skip and not arg.startswith("--workers"):
+                args.append(arg)
+            skip = arg == "--workers"
+        return [
+            sys.executable,
+            "-m",
+            "pytest",
+            *args,
+            "--worker-id",
+            str(worker),
+            "-q",
+            "-o",
+            "log_cli=false",
+            "-o",
+            f"log_file={WORKER_LOG_PATH}/{worker_name(worker)}.log",
+        ]
+
+    def _collect(self, processes: Dict[int, subprocess.Popen]):
+        running = set(processes)
+        while running:
+            try:
+                message = self.results.get(timeout=RESULT_POLL_INTERVAL)
+            except queue.Empty:
+                for worker in list(running):
+                    code = processes[worker].poll()
+                    if code is not None and self.results.empty():
+                        running.discard(worker)
+                        self._finish(worker, f"exited with code {code}")
+                continue
+            kind, worker, payload = message
+            if kind == REPORT:
+                self._report(worker, payload)
+            elif kind == LOG:
+                level, text = payload
+                logger.log(level, f"[{worker_name(worker)}] {text}")
+            elif kind == DONE:
+                running.discard(worker)
+                processes[worker].wait()
+                self._finish(worker, "stopped")
+
+    def _finish(self, worker: int, reason: str):
+        self.finished[worker] = timeit.default_timer() - self.started
+        lost = self.work.unfinished(worker)
+        if not lost:
+            logger.info(f"{worker_name(worker)} {reason}")
+            return
+        logger.error(
+            f"{worker_name(worker)} {reason} before finishing {len(lost)} tests"
+        )
+        for nodeid in lost:
+            self._report_lost(
+                nodeid,
+                f"{worker_name(worker)} {reason} before finishing {nodeid}",
+            )
+
+    def _report(self, worker: int, data: dict):
+        hook = self.config.hook
+        report = hook.pytest_report_from_serializable(
+            config=self.config, data=data
+        )
+        if report.when == "setup":
+            hook.pytest_runtest_logstart(
+                nodeid=report.nodeid, location=report.location
+            )
+        hook.pytest_runtest_logreport(report=report)
+        if report.when == "teardown":
+            self.work.complete(worker, report.nodeid)
+            hook.pytest_runtest_logfinish(
+                nodeid=report.nodeid, location=report.location
+            )
+
+    def _report_lost(self, nodeid: str, longrepr: str):
+        """Reports a test that never finished on a worker as an error."""
+        hook = self.config.hook
+        location = self.items[nodeid].location
+        report = pytest.TestReport(
+            nodeid=nodeid,
+            location=location,
+            keywords={},
+            outcome="failed",
+            longrepr=longrepr,
+            when="setup",
+        )
+        hook.pytest_runtest_logstart(nodeid=nodeid, location=location)
+        hook.pytest_runtest_logreport(report=report)
+        hook.pytest_runtest_logfinish(nodeid=nodeid, location=location)
+
+
+class ShardSelector:
+    """Deselects every test outside the requested shard"""
+
+    def __init__(self, config):
+        index, count = config.getoption("--shard").split("/")
+        self.index = int(index) - 1
+        self.count = int(count)
+        self.shared = config.getoption("--shard-durations")
+        self.shards: List[Shard] = []
+
+    def pytest_collection_modifyitems(self, config, items):
+        nodeids = [item.nodeid for item in items]
+        if self.shared:
+            self.shards = lpt_shards(
+                nodeids, DurationStore(self.shared), self.count
+            )
+        else:
+            self.shards = hash_shards(nodeids, durations, self.count)
+        selected = set(self.shards[self.index].nodeids)
+        deselected = [item for item in items if item.nodeid not in selected]
+        items[:] = [item for item in items if item.nodeid in selected]
+        config.hook.pytest_deselected(items=deselected)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtestloop(self, session):
+        started = timeit.default_timer()
+        yield
+        if self.shards and not session.config.option.collectonly:
+            actual = {self.index: timeit.default_timer() - started}
+            write_shard_report([self.shards[self.index]], actual)
+
+
+class ForwardingHandler(logger.Handler):
+    def __init__(self, results, worker: int):
+        super().__init__()
+        self.results = results
+        self.worker = worker
+
+    def emit(self, record):
+        try:
+            self.results.put(
+                (LOG, self.worker, (record.levelno, self.format(record)))
+            )
+        except Exception:
+            self.handleError(record)
+
+
+class Worker:
+    """Runs the tests handed out by the controller and reports back"""
+
+    def __init__(self, config):
+        self.config = config
+        self.worker = config.getoption("worker_id")
+        host, port = os.environ[ADDRESS_ENV].rsplit(":", 1)
+        ParallelManager.register("work")
+        ParallelManager.register("results")
+        manager = ParallelManager(
+            address=(host, int(port)),
+            authkey=bytes.fromhex(os.environ[AUTHKEY_ENV]),
+        )
+        manager.connect()
+        self.work = manager.work()
+        self.results = manager.results()
+
+    def run(self, session) -> bool:
+        items = {item.nodeid: item for item in session.items}
+        handler = ForwardingHandler(self.results, self.worker)
+        logger.getLogger().addHandler(handler)
+        try:
+            nodeid = self.work.take(self.worker)
+            while nodeid is not None:
+                nextid = self.work.take(self.worker)
+                item = items[nodeid]
+                item.config.hook.pytest_runtest_protocol(
+                    item=item, nextitem=items.get(nextid)
+                )
+                if session.shouldfail:
+                    raise session.Failed(session.shouldfail)
+                if session.shouldstop:
+                    raise session.Interrupted(session.shouldstop)
+                nodeid = nextid
+        finally:
+            logger.getLogger().removeHandler(handler)
+            self.results.put((DONE, self.worker, None))
+        return True
+
+    def pytest_runtest_logreport(self, report):
+        data = self.config.hook.pytest_report_to_serializable(
+            config=self.config, report=report
+        )
+        self.results.put((REPORT, self.worker, data))
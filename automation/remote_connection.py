@@ -0,0 +1,184 @@
+"""Pooled keep-alive connections to a remote WebDriver hub"""
+
+import itertools
+import logging as logger
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+import urllib3
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from config.config import (
+    REMOTE_POOL_SIZE,
+    REMOTE_RETRIES,
+    REMOTE_RETRY_BACKOFF,
+    REMOTE_TIMEOUT,
+)
+
+SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+
+@dataclass
+class ConnectionLatency:
+    """Request latencies seen on one TCP connection to the hub"""
+
+    connection: int
+    requests: int = 0
+    total: float = 0.0
+    slowest: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.requests if self.requests else 0.0
+
+
+class LatencyStats:
+    def __init__(self):
+        self.connections: Dict[int, ConnectionLatency] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    def record(self, connection: int, seconds: float):
+        with self._lock:
+            latency = self.connections.get(connection)
+            if latency is None:
+                latency = self.connections[connection] = ConnectionLatency(
+                    connection
+                )
+            latency.requests += 1
+            latency.total += seconds
+            latency.slowest = max(latency.slowest, seconds)
+
+    def summary(self) -> str:
+        with self._lock:
+            latencies = list(self.connections.values())
+        return ", ".join(
+            f"#{latency.connection}: {latency.requests} requests, "
+            f"mean {latency.mean * 1000:.1f} ms, "
+            f"slowest {latency.slowest * 1000:.1f} ms"
+            for latency in latencies
+        )
+
+
+class _TimedConnectionMixin:
+    stats: LatencyStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connection_id = self.stats.next_id()
+        self._started = None
+
+    def request(self, *args, **kwargs):
+        self._started = time.perf_counter()
+        return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        if self._started is not None:
+            self.stats.record(
+                self.connection_id, time.perf_counter() - self._started
+            )
+            self._started = None
+        return response
+
+
+def _timed_pool_classes(stats: LatencyStats) -> dict:
+    attributes = {"stats": stats}
+    connection = type(
+        "TimedHTTPConnection",
+        (_TimedConnectionMixin, HTTPConnection),
+        attributes,
+    )
+    secure_connection = type(
+        "TimedHTTPSConnection",
+        (_TimedConnectionMixin, HTTPSConnection),
+        attributes,
+    )
+    return {
+        "http": type(
+            "TimedPool", (HTTPConnectionPool,), {"ConnectionCls": connection}
+        ),
+        "https": type(
+            "TimedHTTPSPool",
+            (HTTPSConnectionPool,),
+            {"ConnectionCls": secure_connection},
+        ),
+    }
+
+
+class PooledRemoteConnection(RemoteConnection):
+    """``RemoteConnection`` sharing one tuned connection pool per hub.
+
+    Every session in the process talks to the hub through the same
+    ``urllib3`` pool of ``REMOTE_POOL_SIZE`` keep-alive connections with
+    TCP_NODELAY set. Failures to connect are retried with exponential
+    backoff. Commands that reached the hub are never retried, so a click
+    is not sent twice. Latencies are recorded per TCP connection and
+    logged when a session closes.
+    """
+
+    _managers: Dict[str, urllib3.PoolManager] = {}
+    _stats: Dict[str, LatencyStats] = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self, remote_server_addr: str, pool_size: int = REMOTE_POOL_SIZE
+    ):
+        self.pool_size = pool_size
+        self.stats = self._hub_stats(remote_server_addr)
+        super().__init__(
+            client_config=ClientConfig(
+                remote_server_addr, keep_alive=True, timeout=REMOTE_TIMEOUT
+            )
+        )
+
+    def _get_connection_manager(self):
+        address = self._client_config.remote_server_addr
+        with PooledRemoteConnection._lock:
+            manager = PooledRemoteConnection._managers.get(address)
+            if manager is None:
+                manager = urllib3.PoolManager(
+                    maxsize=self.pool_size,
+                    block=True,
+                    timeout=self._client_config.timeout,
+                    socket_options=SOCKET_OPTIONS,
+                    retries=Retry(
+                        total=REMOTE_RETRIES,
+                        connect=REMOTE_RETRIES,
+                        read=0,
+                        status=0,
+                        other=0,
+                        redirect=False,
+                        backoff_factor=REMOTE_RETRY_BACKOFF,
+                        raise_on_status=False,
+                    ),
+                )
+                manager.pool_classes_by_scheme = _timed_pool_classes(self.stats)
+                PooledRemoteConnection._managers[address] = manager
+        return manager
+
+    def close(self):
+        # the pool outlives the session and is shared with the other sessions
+        logger.info(f"Hub connection latency: {self.stats.summary()}")
+
+    @classmethod
+    def _hub_stats(cls, address: str) -> LatencyStats:
+        with cls._lock:
+            if address not in cls._stats:
+                cls._stats[address] = LatencyStats()
+            return cls._stats[address]
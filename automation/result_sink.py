@@ -0,0 +1,194 @@
+"""Buffered result writer with a background flush thread"""
+
+import atexit
+import fcntl
+import json
+import logging as logger
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from config.config import (
+    LOG_SUMMARY_PATH,
+    RESULT_BATCH_SIZE,
+    RESULT_FLUSH_INTERVAL,
+    RESULT_FSYNC_INTERVAL,
+    RESULT_QUEUE_SIZE,
+    RESULT_SINK_PATH,
+)
+
+SQLITE_SUFFIXES = (".sqlite3", ".sqlite", ".db")
+_CLOSE = object()
+
+
+class ResultSink:
+    """Collects result records in memory and writes them in batches.
+
+    ``write`` only puts the record on a bounded queue. When the queue is
+    full it blocks, so a slow disk slows the test down instead of growing
+    memory. A daemon thread drains the queue every ``flush_interval``
+    seconds or ``batch_size`` records. It appends each batch to ``path``
+    as JSONL, or inserts it in one transaction when ``path`` is a SQLite
+    file. Records with a ``message`` also go to the plain text summary at
+    ``summary_path``. Files are fsynced at most every ``fsync_interval``
+    seconds (0 fsyncs every batch), and always on ``close``.
+
+    Every batch is a single append under an exclusive ``flock``, so the
+    parallel workers can share the same files without interleaving lines.
+    """
+
+    def __init__(
+        self,
+        path: str = RESULT_SINK_PATH,
+        summary_path: Optional[str] = LOG_SUMMARY_PATH,
+        queue_size: int = RESULT_QUEUE_SIZE,
+        batch_size: int = RESULT_BATCH_SIZE,
+        flush_interval: float = RESULT_FLUSH_INTERVAL,
+        fsync_interval: float = RESULT_FSYNC_INTERVAL,
+    ):
+        self.path = path
+        self.summary_path = summary_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.written = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._files = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._synced = time.monotonic()
+        atexit.register(self.close)
+
+    def write(self, message: Optional[str] = None, **fields):
+        record = {
+            "time": datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
+            "pid": os.getpid(),
+        }
+        if message is not None:
+            record["message"] = message
+        record.update(fields)
+        self._start()
+        self._queue.put(record)
+
+    def close(self):
+        """Writes every queued record and fsyncs the files."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_CLOSE)
+        thread.join()
+        self._sync()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        logger.info(f"Result sink wrote {self.written} records to {self.path}")
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="result-sink", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        closing = False
+        while not closing:
+            batch: List[dict] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    record = self._queue.get(
+                        timeout=max(deadline - time.monotonic(), 0)
+                    )
+                except queue.Empty:
+                    break
+                if record is _CLOSE:
+                    closing = True
+                    break
+                batch.append(record)
+            if not batch:
+                continue
+            try:
+                self._flush(batch)
+            except Exception:
+                logger.exception(f"Failed to write {len(batch)} results")
+
+    def _flush(self, batch: List[dict]):
+        if self.path.endswith(SQLITE_SUFFIXES):
+            self._insert(batch)
+        else:
+            self._append(
+                self.path,
+                "".join(json.dumps(record) + "\n" for record in batch),
+            )
+        if self.summary_path:
+            lines = "".join(
+                f"{record['time']}|{record['message']}\n"
+                for record in batch
+                if "message" in record
+            )
+            if lines:
+                self._append(self.summary_path, lines)
+        self.written += len(batch)
+        if time.monotonic() - self._synced >= self.fsync_interval:
+            self._sync()
+
+    def _append(self, path: str, text: str):
+        f = self._files.get(path)
+        if f is None:
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            f = self._files[path] = open(path, "ab")
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.write(text.encode())
+            f.flush()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _insert(self, batch: List[dict]):
+        if self._db is None:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._db = sqlite3.connect(
+                self.path, timeout=30, check_same_thread=False
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(time TEXT, pid INTEGER, message TEXT, record TEXT)"
+            )
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        record["time"],
+                        record["pid"],
+                        record.get("message"),
+                        json.dumps(record),
+                    )
+                    for record in batch
+                ],
+            )
+
+    def _sync(self):
+        for f in self._files.values():
+            os.fsync(f.fileno())
+        # SQLite syncs every committed transaction itself
+        self._synced = time.monotonic()
+
+
+result_sink = ResultSink()
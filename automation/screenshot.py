@@ -2,6 +2,7 @@ import contextlib
 import os
 import logging as logger
 import random
+from automation.screenshot_pipeline import screenshots
 from automation.selenium_base import SeleniumBase
 from selenium.webdriver.remote.webdriver import WebDriver
 
@@ -30,9 +31,21 @@ class Screenshot(SeleniumBase):
         logger.info(f" screenshot for {image_path.lower()}")
         return image_path.lower()
 
-    def take_screenshot(self, message=None):
+    def take_screenshot(self, message=None, failed=None, locator=None, clip=None):
+        """Queues a screenshot of the page, of ``locator`` or of ``clip``.
+
+        ``failed`` is the outcome of the check the screenshot documents, and
+        decides with ``SCREENSHOT_POLICY`` whether it is taken at all. Only
+        screenshots with the same ``message`` are deduplicated, and failures
+        never are.
+        """
+        if not screenshots.wanted(failed):
+            return
         try:
             path = self.get_image_path(message)
-            self.driver.save_screenshot(path)
+            element = self.get_element(locator) if locator is not None else None
+            screenshots.capture(
+                self.driver, path, element, clip, key=message, failed=failed
+            )
         except Exception:
             logger.info(f"Failed to take screenshot for {message}")
@@ -0,0 +1,197 @@
+"""Screenshot capture policies and a background writer"""
+
+import base64
+import hashlib
+import io
+import logging as logger
+import queue
+import random
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from config.config import (
+    SCREENSHOT_DEDUPE_DISTANCE,
+    SCREENSHOT_POLICY,
+    SCREENSHOT_QUEUE_SIZE,
+    SCREENSHOT_SAMPLE_RATE,
+)
+
+ALWAYS = "always"
+FAILURE = "failure"
+SAMPLED = "sampled"
+
+# Page coordinates of an element, for a CDP clip of the full page
+ELEMENT_CLIP_SCRIPT = """
+const rect = arguments[0].getBoundingClientRect();
+return {x: rect.left + window.scrollX, y: rect.top + window.scrollY,
+        width: rect.width, height: rect.height};
+"""
+
+# Side of the grayscale thumbnail the average hash is taken from
+HASH_SIZE = 16
+# Dedupe keys whose last fingerprint is remembered
+DEDUPE_KEYS = 256
+
+_CLOSE = object()
+
+
+@dataclass
+class Capture:
+    path: str
+    data: str
+    # captures are only compared with the previous one of the same key
+    key: Optional[str] = None
+
+
+class ScreenshotPipeline:
+    """Takes screenshots by policy and writes them on a background thread.
+
+    ``policy`` is ``always``, ``failure`` (only failed checks) or
+    ``sampled`` (failures plus ``sample_rate`` of the rest). Screenshots
+    asked for outside a check are always taken. The calling thread only
+    fetches the base64 PNG from the browser. Decoding, hashing and writing
+    happen on a daemon thread fed by a bounded queue.
+
+    A page capture that matches the previous capture with the same key,
+    e.g. the same node checked again, is not written. Captures match on
+    their SHA-1, or when Pillow is installed, on a 16x16 average hash within
+    ``dedupe_distance`` bits, which also catches near-identical pages.
+    Captures of failures, elements and clips are always written.
+    """
+
+    def __init__(
+        self,
+        policy: str = SCREENSHOT_POLICY,
+        sample_rate: float = SCREENSHOT_SAMPLE_RATE,
+        queue_size: int = SCREENSHOT_QUEUE_SIZE,
+        dedupe_distance: int = SCREENSHOT_DEDUPE_DISTANCE,
+    ):
+        self.policy = policy
+        self.sample_rate = sample_rate
+        self.dedupe_distance = dedupe_distance
+        self.written = 0
+        self.duplicates = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._previous: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def wanted(self, failed: Optional[bool] = None) -> bool:
+        if failed is None or failed or self.policy == ALWAYS:
+            return True
+        if self.policy == SAMPLED:
+            return random.random() < self.sample_rate
+        return False
+
+    def capture(
+        self,
+        driver: WebDriver,
+        path: str,
+        element: Optional[WebElement] = None,
+        clip: Optional[dict] = None,
+        key: Optional[str] = None,
+        failed: Optional[bool] = None,
+    ):
+        """Queues a screenshot of the page, of ``element`` or of ``clip``.
+
+        ``clip`` is ``{"x", "y", "width", "height"}`` in page coordinates.
+        Element and clip screenshots go through CDP on Chromium, so parts
+        of the page outside the viewport can be captured too. A page capture
+        with a ``key`` is skipped when it matches the previous one with the
+        same key, unless ``failed``.
+        """
+        cdp = hasattr(driver, "execute_cdp_cmd")
+        if element is not None and clip is None and cdp:
+            clip = driver.execute_script(ELEMENT_CLIP_SCRIPT, element)
+        if clip is not None and cdp:
+            data = driver.execute_cdp_cmd(
+                "Page.captureScreenshot",
+                {
+                    "format": "png",
+                    "clip": dict(clip, scale=1),
+                    "captureBeyondViewport": True,
+                },
+            )["data"]
+        elif element is not None:
+            data = element.screenshot_as_base64
+        else:
+            data = driver.get_screenshot_as_base64()
+        whole_page = element is None and clip is None
+        self._start()
+        self._queue.put(
+            Capture(path, data, key if whole_page and not failed else None)
+        )
+
+    def close(self):
+        """Writes every queued screenshot."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_CLOSE)
+        thread.join()
+        logger.info(
+            f"Wrote {self.written} screenshots, skipped {self.duplicates} duplicates"
+        )
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="screenshots", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            capture = self._queue.get()
+            if capture is _CLOSE:
+                return
+            try:
+                self._write(capture)
+            except Exception:
+                logger.info(f"Failed to write screenshot {capture.path}")
+
+    def _write(self, capture: Capture):
+        png = base64.b64decode(capture.data)
+        if capture.key is not None:
+            fingerprint = self._fingerprint(png)
+            previous = self._previous.pop(capture.key, None)
+            if previous is not None and self._is_duplicate(
+                fingerprint, previous[0]
+            ):
+                self.duplicates += 1
+                self._previous[capture.key] = previous
+                logger.info(f" screenshot {capture.path} same as {previous[1]}")
+                return
+            self._previous[capture.key] = (fingerprint, capture.path)
+            if len(self._previous) > DEDUPE_KEYS:
+                self._previous.popitem(last=False)
+        with open(capture.path, "wb") as f:
+            f.write(png)
+        self.written += 1
+
+    def _fingerprint(self, png: bytes):
+        try:
+            from PIL import Image
+        except ImportError:
+            return hashlib.sha1(png).hexdigest()
+        thumbnail = Image.open(io.BytesIO(png)).convert("L")
+        pixels = list(thumbnail.resize((HASH_SIZE, HASH_SIZE)).getdata())
+        mean = sum(pixels) / len(pixels)
+        return sum(1 << i for i, pixel in enumerate(pixels) if pixel > mean)
+
+    def _is_duplicate(self, fingerprint, previous) -> bool:
+        if type(previous) is not type(fingerprint):
+            return False
+        if isinstance(fingerprint, str):
+            return fingerprint == previous
+        return bin(fingerprint ^ previous).count("1") <= self.dedupe_distance
+
+
+screenshots = ScreenshotPipeline()
@@ -1,4 +1,5 @@
 from selenium.webdriver.support.ui import Select
+from automation.locator import Locator
 from automation.selenium_base import SeleniumBase
 from typing import List, Optional, Union
 from selenium.webdriver.remote.webelement import WebElement
@@ -9,33 +10,39 @@ import logging as logger
 
 class SelectElement(SeleniumBase):
     def get_select_items(
-        self, locator: Union[WebElement, str], values: bool = False
+        self, locator: Union[WebElement, Locator, str], values: bool = False
     ) -> List[str]:
         """Returns all labels or values of selection list ``locator``."""
         options = self._get_options(locator)
         return self._get_values(options) if values else self._get_labels(options)
 
-    def get_selected_list_label(self, locator: Union[WebElement, str]) -> str:
+    def get_selected_list_label(self, locator: Union[WebElement, Locator, str]) -> str:
         """Returns the label of selected option from selection list ``locator``."""
         select = self._get_select_list(locator)
         return select.first_selected_option.text
 
-    def get_selected_list_labels(self, locator: Union[WebElement, str]) -> List[str]:
+    def get_selected_list_labels(
+        self, locator: Union[WebElement, Locator, str]
+    ) -> List[str]:
         """Returns labels of selected options from selection list ``locator``."""
         options = self._get_selected_options(locator)
         return self._get_labels(options)
 
-    def get_selected_list_value(self, locator: Union[WebElement, str]) -> str:
+    def get_selected_list_value(self, locator: Union[WebElement, Locator, str]) -> str:
         """Returns the value of selected option from selection list ``locator``."""
         select = self._get_select_list(locator)
         return select.first_selected_option.get_attribute("value")
 
-    def get_selected_list_values(self, locator: Union[WebElement, str]) -> List[str]:
+    def get_selected_list_values(
+        self, locator: Union[WebElement, Locator, str]
+    ) -> List[str]:
         """Returns values of selected options from selection list ``locator``."""
         options = self._get_selected_options(locator)
         return self._get_values(options)
 
-    def list_selection_should_be(self, locator: Union[WebElement, str], *expected: str):
+    def list_selection_should_be(
+        self, locator: Union[WebElement, Locator, str], *expected: str
+    ):
         """Verifies selection list ``locator`` has ``expected`` options selected."""
 
         self.page_should_contain_list(locator)
@@ -48,7 +55,7 @@ class SelectElement(SeleniumBase):
                 f"but selection was [ {self._format_selection(labels, values)} ]."
             )
 
-    def list_should_have_no_selections(self, locator: Union[WebElement, str]):
+    def list_should_have_no_selections(self, locator: Union[WebElement, Locator, str]):
         """Verifies selection list ``locator`` has no options selected."""
         logger.info(f"Verifying list '{locator}' has no selections.")
         if options := self._get_selected_options(locator):
@@ -89,7 +96,7 @@ class SelectElement(SeleniumBase):
 
     def page_should_contain_list(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies selection list ``locator`` is found from current page."""
@@ -97,13 +104,13 @@ class SelectElement(SeleniumBase):
 
     def page_should_not_contain_list(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         message: Optional[str] = None,
     ):
         """Verifies selection list ``locator`` is not found from current page."""
         self.assert_page_not_contains(locator, message)
 
-    def select_all_from_list(self, locator: Union[WebElement, str]):
+    def select_all_from_list(self, locator: Union[WebElement, Locator, str]):
         """Selects all options from multi-selection list ``locator``."""
         logger.info(f"Selecting all options from list '{locator}'.")
         select = self._get_select_list(locator)
@@ -114,7 +121,9 @@ class SelectElement(SeleniumBase):
         for index in range(len(select.options)):
             select.select_by_index(index)
 
-    def select_from_list_by_index(self, locator: Union[WebElement, str], *indexes: str):
+    def select_from_list_by_index(
+        self, locator: Union[WebElement, Locator, str], *indexes: str
+    ):
         """Selects options from selection list ``locator`` by ``indexes``.
 
         Indexes of list options start from 0.
@@ -135,7 +144,9 @@ class SelectElement(SeleniumBase):
         for index in indexes:
             select.select_by_index(int(index))
 
-    def select_from_list_by_value(self, locator: Union[WebElement, str], *values: str):
+    def select_from_list_by_value(
+        self, locator: Union[WebElement, Locator, str], *values: str
+    ):
         """Selects options from selection list ``locator`` by ``values``.
 
         If more than one option is given for a single-selection list,
@@ -153,7 +164,9 @@ class SelectElement(SeleniumBase):
         for value in values:
             select.select_by_value(value)
 
-    def select_from_list_by_label(self, locator: Union[WebElement, str], *labels: str):
+    def select_from_list_by_label(
+        self, locator: Union[WebElement, Locator, str], *labels: str
+    ):
         """Selects options from selection list ``locator`` by ``labels``.
 
         If more than one option is given for a single-selection list,
@@ -172,7 +185,7 @@ class SelectElement(SeleniumBase):
         for label in labels:
             select.select_by_visible_text(label)
 
-    def unselect_all_from_list(self, locator: Union[WebElement, str]):
+    def unselect_all_from_list(self, locator: Union[WebElement, Locator, str]):
         """Unselects all options from multi-selection list ``locator``."""
         logger.info(f"Unselecting all options from list '{locator}'.")
         select = self._get_select_list(locator)
@@ -182,7 +195,7 @@ class SelectElement(SeleniumBase):
         select.deselect_all()
 
     def unselect_from_list_by_value(
-        self, locator: Union[WebElement, str], *values: str
+        self, locator: Union[WebElement, Locator, str], *values: str
     ):
         """Unselects options from selection list ``locator`` by ``values``.
 
@@ -201,7 +214,7 @@ class SelectElement(SeleniumBase):
             select.deselect_by_value(value)
 
     def unselect_from_list_by_label(
-        self, locator: Union[WebElement, str], *labels: str
+        self, locator: Union[WebElement, Locator, str], *labels: str
     ):
         """Unselects options from selection list ``locator`` by ``labels``.
 
@@ -221,7 +234,7 @@ class SelectElement(SeleniumBase):
             select.deselect_by_visible_text(label)
 
     def unselect_from_list_by_index(
-        self, locator: Union[WebElement, str], *indexes: str
+        self, locator: Union[WebElement, Locator, str], *indexes: str
     ):
         """Unselects options from selection list ``locator`` by ``indexes``.
 
@@ -242,19 +255,25 @@ class SelectElement(SeleniumBase):
             select.deselect_by_index(int(index))
 
     def _get_select_list(self, locator):
-        element = self.get_element(self, locator)
+        element = self.get_element(locator)
         return Select(element)
 
-    def _get_options(self, locator: Union[WebElement, str]):
+    def _get_options(self, locator: Union[WebElement, Locator, str]):
         return self._get_select_list(locator).options
 
     def _get_labels(self, options):
-        return [opt.text for opt in options]
+        if not options:
+            return []
+        properties = self.get_elements_properties(options, ["text"], timeout=0)
+        return [opt["text"] for opt in properties]
 
     def _get_values(self, options):
-        return [opt.get_attribute("value") for opt in options]
+        if not options:
+            return []
+        properties = self.get_elements_properties(options, ["value"], timeout=0)
+        return [opt["value"] for opt in properties]
 
-    def _get_selected_options(self, locator: Union[WebElement, str]):
+    def _get_selected_options(self, locator: Union[WebElement, Locator, str]):
         return self._get_select_list(locator).all_selected_options
 
     def _format_selection(self, labels, values):
@@ -1,3 +1,4 @@
+import contextlib
 import datetime
 import logging as logger
 import time
@@ -8,87 +9,134 @@ from selenium.common.exceptions import (
     StaleElementReferenceException,
     TimeoutException,
 )
-from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-from automation.error import (
-    ElementNotFoundException,
-    ElementNotVisibleException,
-    NotValidLocatorException,
+from automation import batch as batched
+from automation.batch import Batch
+from automation.browser_wait import (
+    ELEMENT_CONTAINS_TEXT,
+    ELEMENT_PRESENT,
+    TEXT_PRESENT,
+    BrowserWait,
+    BrowserWaitUnavailable,
 )
+from automation.element_cache import ElementCache
+from automation.element_resolver import (
+    TEXT_READ_SCRIPT,
+    ElementResolver,
+    ResolvedElement,
+)
+from automation.error import ElementNotFoundException
+from automation.locator import Locator, locator_types, parse_locator
+from automation.network_policy import network_policy
+from automation.text_search import TextMatch, TextSearch
 from utils.common import type_converter
 from automation.wait_times import DEFAULT, SHORT
+from config.config import PAGE_READINESS
 from selenium.webdriver.common.action_chains import ActionChains
 
+POLL_INTERVAL = 0.2
+
 
 class SeleniumBase:
     def __init__(self, driver: WebDriver):
         self.driver = driver
         logger.info("Selenium Base initialized")
 
-    locator_types = {
-        "css": By.CSS_SELECTOR,
-        "id": By.ID,
-        "name": By.NAME,
-        "xpath": By.XPATH,
-        "x": By.XPATH,
-        "link_text": By.LINK_TEXT,
-        "partial_link_text": By.PARTIAL_LINK_TEXT,
-        "tag": By.TAG_NAME,
-        "class": By.CLASS_NAME,
-    }
+    locator_types = locator_types
+    event_driven_waits = True
 
     def get_date_string(self):
         """Getting a date string to use for naming files"""
         return datetime.datetime.now().strftime("%y%m%d%H%M%S")
 
     def go_to(self, url):
+        self._leave_page()
         self.driver.get(url)
 
     def go_back(self):
+        self._leave_page()
         self.driver.back()
 
     def reload_page(self):
+        self._leave_page()
         self.driver.refresh()
 
+    def _leave_page(self):
+        self.element_cache.clear()
+        network_policy.collect(self.driver)
+
     def get_source(self) -> str:
         """Returns the entire HTML source of the current page or frame."""
         return self.driver.page_source
 
     def get_title(self) -> str:
         """Returns the title of the current page."""
+        if (future := self._batched(batched.TITLE)) is not None:
+            return future
         return self.driver.title
 
     def get_location(self) -> str:
         """Returns the current browser window URL."""
+        if (future := self._batched(batched.LOCATION)) is not None:
+            return future
         return self.driver.current_url
 
     # region element finder methods
 
-    def get_text(self, locator: Union[WebElement, str]) -> WebElement:
+    def get_text(self, locator: Union[WebElement, Locator, str]) -> WebElement:
         """
         get text from input box
         :param: None
         :return: text from webElement
         """
-        element = self.get_element(locator)
-        return element.get_attribute("innerText")
+        if (future := self._batched(batched.PROPERTY, locator, "text")) is not None:
+            return future
+        if isinstance(locator, WebElement):
+            return locator.get_attribute("innerText")
+        locator = self._get_locator(locator)
+        return self.element_cache.memoize(
+            "innerText",
+            locator,
+            TEXT_READ_SCRIPT,
+            locator.as_tuple(),
+            lambda: self.get_element(locator).get_attribute("innerText"),
+        )
 
     def get_elements(self, locator, timeout=DEFAULT):
         locator = self._get_locator_tuple(locator)
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
-            return self.driver.find_elements(locator[0], locator[1])
+            resolved = self.resolver.wait_for(locator, timeout, first=False)
+            return [result.element for result in resolved]
         except Exception as exception:
             self.handle_exception(
                 exception, f"Exception at get_elements for: {locator}"
             )
 
+    def get_elements_properties(
+        self,
+        locator: Union[List[WebElement], Locator, str],
+        properties: List[str],
+        timeout=DEFAULT,
+        parent: Optional[WebElement] = None,
+    ) -> List[dict]:
+        """Returns a dict of ``properties`` for every element matching ``locator``.
+
+        All values are read with a single script execution instead of one
+        ``get_attribute`` round trip per element. Use ``"text"`` for the
+        rendered text of the element. ``parent`` limits the search to the
+        children of that element and ``locator`` can also be a list of
+        elements that were already found. Returns an empty list if no
+        matching element became visible within ``timeout``; a ``timeout``
+        of 0 reads the current matches without waiting.
+        """
+        if not isinstance(locator, list):
+            locator = self._get_locator_tuple(locator)
+        return self.resolver.read_properties(locator, properties, timeout, parent)
+
     def get_child_elements(self, parentlocator, locator):
         try:
             parentelement = self.get_element(parentlocator)
@@ -111,79 +159,104 @@ class SeleniumBase:
     def get_element(self, locator, timeout=DEFAULT) -> WebElement:
         if isinstance(locator, WebElement):
             return locator
+        return self._resolve_element(locator, timeout).element
 
-        locator = self._get_locator_tuple(locator)
-
-        try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
-            )
-        except (
-            StaleElementReferenceException,
-            NoSuchElementException,
-            TimeoutException,
-        ) as e:
-            raise ElementNotFoundException(
-                "An exception of type "
-                + type(e).__name__
-                + " occurred. With Element -: "
-                + " - locator: ("
-                + locator[0]
-                + ", "
-                + locator[1]
-                + ")"
-            ) from e
+    def _resolve_element(
+        self, locator, timeout=DEFAULT, enabled=False
+    ) -> ResolvedElement:
+        """Waits for ``locator`` to be visible using one browser call per poll.
 
+        Resolutions of locator strings are kept in the element cache and
+        reused until the DOM of the page they were found on changes. Their
+        visibility is checked again on every use. A locator that fails to
+        resolve is dropped from the cache.
+        """
+        if isinstance(locator, WebElement):
+            return self.resolver.wait_for(locator, timeout, enabled=enabled)[0]
+        locator = self._get_locator(locator)
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
-        except (
-            StaleElementReferenceException,
-            NoSuchElementException,
-            TimeoutException,
-        ) as e:
-            raise ElementNotVisibleException(
-                "An exception of type "
-                + type(e).__name__
-                + " occurred. With Element -: "
-                + " - locator: ("
-                + locator[0]
-                + ", "
-                + locator[1]
-                + ")"
-            ) from e
-
-        return element
-
-    def _get_locator_tuple(self, locator: str) -> tuple:
-        if locator_given := [
-            x for x in SeleniumBase.locator_types.keys() if locator.startswith(x)
-        ]:
-            locator_split = locator.split("=", 1)
-            identify_by = locator_split[0].strip().lower()
-            locator = locator_split[1].strip().lower()
-        else:
-            identify_by = "xpath"
-
-        if identify_by not in SeleniumBase.locator_types:
-            raise NotValidLocatorException(
-                f"""An exception of type
-                NotValidLocatorException
-                occurred. With Element -:
-                + {locator}"""
-            )
-        by = SeleniumBase.locator_types[identify_by]
-        return (by, locator)
+            resolved = self.resolver.wait_for(
+                locator.as_tuple(),
+                timeout,
+                enabled=enabled,
+                cached=self.element_cache.get_element(locator),
+            )[0]
+        except Exception:
+            self.element_cache.drop_element(locator)
+            raise
+        self.element_cache.put_element(locator, resolved)
+        return resolved
+
+    @property
+    def resolver(self) -> ElementResolver:
+        if getattr(self, "_resolver", None) is None:
+            self._resolver = ElementResolver(self.driver)
+        return self._resolver
+
+    @property
+    def browser_wait(self) -> BrowserWait:
+        if getattr(self, "_browser_wait", None) is None:
+            self._browser_wait = BrowserWait(self.driver)
+        return self._browser_wait
+
+    @property
+    def text_search(self) -> TextSearch:
+        if getattr(self, "_text_search", None) is None:
+            self._text_search = TextSearch(self.driver)
+        return self._text_search
+
+    @property
+    def element_cache(self) -> ElementCache:
+        if getattr(self, "_element_cache", None) is None:
+            self._element_cache = ElementCache(self.driver)
+        return self._element_cache
+
+    def _get_locator_tuple(self, locator: Union[Locator, str]) -> tuple:
+        return self._get_locator(locator).as_tuple()
+
+    def _get_locator(self, locator: Union[Locator, str]) -> Locator:
+        return locator if isinstance(locator, Locator) else parse_locator(locator)
+
+    def _wait_locator(self, locator):
+        if isinstance(locator, WebElement):
+            return locator
+        return self._get_locator_tuple(locator)
 
     # endregion
 
     # region wait methods
 
     def wait_until_page_is_completely_loaded(self):
-        WebDriverWait(self.driver, SHORT).until(
+        """Waits until the page reaches ``PAGE_READINESS``.
+
+        That is the full load ("complete") unless the config opts in to
+        "interactive". With ``event_driven_waits`` on, the wait listens for
+        the document's lifecycle events inside the page. When
+        ``NETWORK_IDLE_QUIET_MS`` is set, it then waits for the network to
+        stay idle that long. A page that never goes idle is used once the
+        timeout passes. ``document.readyState`` is polled otherwise, and
+        when the page navigates away during the event wait.
+        """
+        timeout = SHORT
+        if self.event_driven_waits:
+            started = time.time()
+            try:
+                state = self.browser_wait.page_ready(timeout=timeout)
+                if not state["ready"]:
+                    raise TimeoutException("Page taking too long to load")
+                if not state["idle"]:
+                    logger.info(f"Network not idle after {timeout} seconds")
+                return
+            except BrowserWaitUnavailable:
+                timeout = max(timeout - (time.time() - started), POLL_INTERVAL)
+        ready_states = (
+            ("interactive", "complete")
+            if PAGE_READINESS == "interactive"
+            else ("complete",)
+        )
+        WebDriverWait(self.driver, timeout).until(
             lambda wd: self.driver.execute_script("return document.readyState")
-            == "complete",
+            in ready_states,
             "Page taking too long to load",
         )
 
@@ -200,13 +273,10 @@ class SeleniumBase:
         """
         Wait till the element to be clickable
         """
-        element = self.get_element(locator)
-        return WebDriverWait(self.driver, timeout).until(
-            EC.element_to_be_clickable(element)
-        )
+        return self._resolve_element(locator, timeout, enabled=True).element
 
     def wait_until_element_is_visible(
-        self, locator: Union[WebElement, str], timeout=DEFAULT
+        self, locator: Union[WebElement, Locator, str], timeout=DEFAULT
     ):
         """
         Wait till the element to be invisible
@@ -214,7 +284,7 @@ class SeleniumBase:
         return self.get_element(locator, timeout)
 
     def wait_until_element_is_not_visible(
-        self, locator: Union[WebElement, str], timeout=DEFAULT
+        self, locator: Union[WebElement, Locator, str], timeout=DEFAULT
     ) -> WebElement:
         """
         Wait till the element to be invisible
@@ -236,6 +306,7 @@ class SeleniumBase:
             f"Text '{text}' did not appear in <TIMEOUT>.",
             timeout,
             error,
+            browser_condition={"kind": TEXT_PRESENT, "text": text},
         )
 
     def wait_until_page_does_not_contain_text(
@@ -251,11 +322,12 @@ class SeleniumBase:
             f"Text '{text}' did not disappear in <TIMEOUT>.",
             timeout,
             error,
+            browser_condition={"kind": TEXT_PRESENT, "text": text, "negate": True},
         )
 
     def wait_until_page_contains_element(
         self,
-        locator: Union[WebElement, None, str],
+        locator: Union[WebElement, Locator, None, str],
         timeout: int = DEFAULT,
         error=None,
     ):
@@ -268,11 +340,15 @@ class SeleniumBase:
             f"Element '{locator}' did not appear in <TIMEOUT>.",
             timeout,
             error,
+            browser_condition={
+                "kind": ELEMENT_PRESENT,
+                "locator": self._wait_locator(locator),
+            },
         )
 
     def wait_until_page_does_not_contain_element(
         self,
-        locator: Union[WebElement, None, str],
+        locator: Union[WebElement, Locator, None, str],
         timeout: int = DEFAULT,
         error=None,
     ):
@@ -281,15 +357,22 @@ class SeleniumBase:
         ``error`` can be used to override the default error message.
         """
         return self._wait_until(
-            lambda: self.get_element(locator) is None,
-            f"Element '{locator}' did not appear in <TIMEOUT>.",
+            lambda: not any(
+                r.visible for r in self.resolver.resolve(self._wait_locator(locator))
+            ),
+            f"Element '{locator}' did not disappear in <TIMEOUT>.",
             timeout,
             error,
+            browser_condition={
+                "kind": ELEMENT_PRESENT,
+                "locator": self._wait_locator(locator),
+                "negate": True,
+            },
         )
 
     def wait_until_element_contains_text(
         self,
-        locator: Union[WebElement, None, str],
+        locator: Union[WebElement, Locator, None, str],
         text: str,
         timeout: int = DEFAULT,
         error=None,
@@ -298,17 +381,21 @@ class SeleniumBase:
         Fails if ``timeout`` expires before the element appears.
         ``error`` can be used to override the default error message.
         """
-        element = self.get_element(locator)
         self._wait_until(
-            lambda: text in self.get_text(element),
+            lambda: text in self.get_text(locator),
             f"Element '{locator}' did not get text '{text}' in <TIMEOUT>.",
             timeout,
             error,
+            browser_condition={
+                "kind": ELEMENT_CONTAINS_TEXT,
+                "locator": self._wait_locator(locator),
+                "text": text,
+            },
         )
 
     def wait_until_element_does_not_contain_text(
         self,
-        locator: Union[WebElement, None, str],
+        locator: Union[WebElement, Locator, None, str],
         text: str,
         timeout: int = DEFAULT,
         error=None,
@@ -317,19 +404,47 @@ class SeleniumBase:
         Fails if ``timeout`` expires before the element appears.
         ``error`` can be used to override the default error message.
         """
-        element = self.get_element(locator)
         self._wait_until(
-            lambda: text not in self.get_text(element),
-            f"Element '{locator}' did not get text '{text}' in <TIMEOUT>.",
+            lambda: text not in self.get_text(locator),
+            f"Element '{locator}' did not lose text '{text}' in <TIMEOUT>.",
             timeout,
             error,
+            browser_condition={
+                "kind": ELEMENT_CONTAINS_TEXT,
+                "locator": self._wait_locator(locator),
+                "text": text,
+                "negate": True,
+            },
         )
 
-    def _wait_until(self, condition, error, timeout=DEFAULT, custom_error=None):
+    def _wait_until(
+        self,
+        condition,
+        error,
+        timeout=DEFAULT,
+        custom_error=None,
+        browser_condition=None,
+    ):
+        """Waits for ``condition`` to become true.
+
+        When ``browser_condition`` is given and ``event_driven_waits`` is on,
+        the wait runs inside the page and returns as soon as a DOM change
+        satisfies it. The Python polling loop on ``condition`` is used
+        otherwise, and for the remaining time if the page navigates away
+        during the browser side wait.
+        """
         if custom_error is None:
             error = error.replace("<TIMEOUT>", f"{timeout} Seconds")
         else:
             error = custom_error
+        if browser_condition is not None and self.event_driven_waits:
+            started = time.time()
+            try:
+                if self.browser_wait.until(timeout=timeout, **browser_condition):
+                    return
+                raise AssertionError(error)
+            except BrowserWaitUnavailable:
+                timeout = max(timeout - (time.time() - started), POLL_INTERVAL)
         self._wait_until_worker(condition, timeout, error)
 
     def _wait_until_worker(self, condition, timeout, error):
@@ -344,19 +459,32 @@ class SeleniumBase:
             except StaleElementReferenceException as err:
                 logger.info("Suppressing StaleElementReferenceException from Selenium.")
                 not_found = f"{error}{str(err)}"
-            time.sleep(0.2)
+            time.sleep(POLL_INTERVAL)
         raise AssertionError(not_found or error)
 
     # endregion
 
     # region helper methods
 
-    def is_text_present(self, text: str) -> bool:
-        xpath = f"//*[contains(., '{text}')]"
-        self.get_element(xpath)
-        return True
+    def is_text_present(self, text: str, include_frames: bool = False) -> bool:
+        """Returns whether the current document contains ``text``.
+
+        Checks immediately without waiting. With ``include_frames`` the
+        same-origin frames below the current document are searched too.
+        """
+        return self.text_search.contains(text, include_frames)
+
+    def find_text(self, text: str, include_frames: bool = True) -> Optional[TextMatch]:
+        """Returns where ``text`` is on the page, or None if it is not there.
+
+        The match holds the frame indexes leading to the document that
+        contains the text and the xpath of the deepest element containing it.
+        """
+        return self.text_search.find(text, include_frames, with_path=True)
 
-    def execute_script(self, locator: Union[WebElement, str], script, timeout=DEFAULT):
+    def execute_script(
+        self, locator: Union[WebElement, Locator, str], script, timeout=DEFAULT
+    ):
         """
         Execute JavaScript using web driver on selected web element
         :param: Javascript to be execute
@@ -365,6 +493,51 @@ class SeleniumBase:
         element = self.get_element(locator, timeout)
         return self.driver.execute_script(script, element)
 
+    @contextlib.contextmanager
+    def batch(self):
+        """Queues reads made inside the ``with`` block and runs them together.
+
+        Inside the block ``get_title``, ``get_location``, ``get_text``,
+        ``get_element_attribute``, ``get_value``, ``get_element_count`` and
+        the matching ``Interaction`` reads return a ``Future`` instead of
+        the value. Boolean checks such as ``is_text_present`` and
+        ``is_checked`` still run right away, since waits and fallbacks use
+        their result inside the block. All of them are
+        executed as one combined script when the block exits, so a group of
+        independent reads costs one round trip to the driver::
+
+            with page.batch():
+                title = page.get_title()
+                crumbs = page.get_text(HomePO.breadcrumbs)
+            logger.info(f"{title.result()} {crumbs.result()}")
+
+        Reads do not wait for elements; a read of an element that is not
+        visible when the block exits fails with ``ElementNotFoundException``.
+        Nested blocks join the outer batch.
+        """
+        if getattr(self, "_batch", None) is not None:
+            yield self._batch
+            return
+        self._batch = Batch(self.driver)
+        try:
+            yield self._batch
+        except BaseException:
+            self._batch.cancel()
+            raise
+        else:
+            self._batch.flush()
+        finally:
+            self._batch = None
+
+    def _batched(self, kind: str, locator=None, name: str = None):
+        """Returns a Future for the read if a batch is active, else None."""
+        batch = getattr(self, "_batch", None)
+        if batch is None:
+            return None
+        if locator is not None:
+            locator = self._wait_locator(locator)
+        return batch.queue(kind, locator, name)
+
     def handle_exception(self, thrown_exception, message):
         logger.error(message)
         raise thrown_exception(message)
@@ -372,14 +545,16 @@ class SeleniumBase:
     # endregion
 
     def get_element_attribute(
-        self, locator: Union[WebElement, str], attribute: str
+        self, locator: Union[WebElement, Locator, str], attribute: str
     ) -> str:
         """Returns the value of ``attribute`` from the element ``locator``."""
+        if (future := self._batched(batched.PROPERTY, locator, attribute)) is not None:
+            return future
         return self.get_element(locator).get_attribute(attribute)
 
     def element_attribute_value_should_be(
         self,
-        locator: Union[WebElement, str],
+        locator: Union[WebElement, Locator, str],
         attribute: str,
         expected: Union[None, str],
         message: Optional[str] = None,
@@ -398,7 +573,7 @@ class SeleniumBase:
             f"Element '{locator}' attribute '{attribute}' contains value '{expected}'."
         )
 
-    def get_horizontal_position(self, locator: Union[WebElement, str]) -> int:
+    def get_horizontal_position(self, locator: Union[WebElement, Locator, str]) -> int:
         """Returns the horizontal position of the element identified by ``locator``.
 
 
@@ -406,35 +581,37 @@ class SeleniumBase:
         as an integer.
 
         """
-        return self.get_element(locator).location["x"]
+        return self._resolve_element(locator).rect["x"]
 
-    def get_element_size(self, locator: Union[WebElement, str]) -> Tuple[int, int]:
+    def get_element_size(
+        self, locator: Union[WebElement, Locator, str]
+    ) -> Tuple[int, int]:
         """Returns width and height of the element identified by ``locator``.
 
         Both width and height are returned as integers.
 
         """
-        element = self.get_element(locator)
-        return element.size["width"], element.size["height"]
+        rect = self._resolve_element(locator).rect
+        return rect["width"], rect["height"]
 
-    def get_value(self, locator: Union[WebElement, str]) -> str:
+    def get_value(self, locator: Union[WebElement, Locator, str]) -> str:
         """Returns the value attribute of the element identified by ``locator``."""
         return self.get_element_attribute(locator, "value")
 
-    def get_vertical_position(self, locator: Union[WebElement, str]) -> int:
+    def get_vertical_position(self, locator: Union[WebElement, Locator, str]) -> int:
         """Returns the vertical position of the element identified by ``locator``.
 
         The position is returned in pixels off the top of the page,
         as an integer.
         """
-        return self.get_element(locator).location["y"]
+        return self._resolve_element(locator).rect["y"]
 
-    def set_focus_to_element(self, locator: Union[WebElement, str]):
+    def set_focus_to_element(self, locator: Union[WebElement, Locator, str]):
         """Sets the focus to the element identified by ``locator``."""
         element = self.get_element(locator)
         self.driver.execute_script("arguments[0].focus();", element)
 
-    def scroll_element_into_view(self, locator: Union[WebElement, str]):
+    def scroll_element_into_view(self, locator: Union[WebElement, Locator, str]):
         """Scrolls the element identified by ``locator`` into view."""
         element = self.get_element(locator)
         ActionChains(self.driver).move_to_element(element).perform()
@@ -444,10 +621,10 @@ class SeleniumBase:
 
         If a link has no id, an empty string will be in the list instead.
         """
-        links = self.get_elements("tag=a")
-        return [link.get_attribute("id") for link in links]
+        links = self.get_elements_properties("tag=a", ["id"])
+        return [link["id"] for link in links]
 
-    def get_element_count(self, locator: Union[WebElement, str]) -> int:
+    def get_element_count(self, locator: Union[WebElement, Locator, str]) -> int:
         """Returns the number of elements matching ``locator``.
 
         If you wish to assert the number of matching elements, use
@@ -455,4 +632,6 @@ class SeleniumBase:
         always return an integer.
 
         """
+        if (future := self._batched(batched.COUNT, locator)) is not None:
+            return future
         return len(self.get_elements(locator))
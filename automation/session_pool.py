@@ -0,0 +1,145 @@
+"""Pool of warm browser sessions shared between test classes"""
+
+import logging as logger
+import threading
+import timeit
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from automation.browser_strategy import BrowserSelector
+from automation.selenium_base import SeleniumBase
+from config.config import (
+    SESSION_HEALTH_CHECK,
+    SESSION_MAX_REUSE,
+    SESSION_POOL_SIZE,
+)
+
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+@dataclass
+class PooledSession:
+    driver: WebDriver
+    main_window: str
+    uses: int = 0
+    created: float = field(default_factory=timeit.default_timer)
+
+
+class SessionPool:
+    """Keeps browser sessions warm between test classes.
+
+    Starting a browser, maximizing it and loading the first page takes
+    seconds. ``lease`` hands out an idle session when one is available and
+    only starts a new browser otherwise. ``release`` resets the session
+    (cookies, local and session storage, extra windows, ``about:blank``)
+    and keeps it for the next lease, unless it reached ``max_reuse`` uses
+    or the pool already holds ``size`` idle sessions.
+    """
+
+    def __init__(
+        self,
+        browser: str,
+        url: str,
+        size: int = SESSION_POOL_SIZE,
+        max_reuse: int = SESSION_MAX_REUSE,
+        health_check: bool = SESSION_HEALTH_CHECK,
+    ):
+        self.browser = browser
+        self.url = url
+        self.size = size
+        self.max_reuse = max_reuse
+        self.health_check = health_check
+        self._idle: List[PooledSession] = []
+        self._leased: Dict[int, PooledSession] = {}
+        self._lock = threading.Lock()
+
+    def lease(self) -> WebDriver:
+        starttime = timeit.default_timer()
+        session = self._take_idle()
+        if session is None:
+            driver = BrowserSelector(self.browser, self.url).start()
+            session = PooledSession(driver, driver.current_window_handle)
+            source = "new"
+        else:
+            session.driver.get(self.url)
+            SeleniumBase(session.driver).wait_until_page_is_completely_loaded()
+            source = f"reused ({session.uses} previous uses)"
+        with self._lock:
+            self._leased[id(session.driver)] = session
+        time_taken = "{:.2f}".format(timeit.default_timer() - starttime)
+        logger.info(
+            f"Leased {source} {self.browser} session in {time_taken} seconds"
+        )
+        return session.driver
+
+    def release(self, driver: WebDriver):
+        with self._lock:
+            session = self._leased.pop(id(driver), None)
+        if session is None:
+            driver.quit()
+            return
+        session.uses += 1
+        with self._lock:
+            keep = session.uses < self.max_reuse and len(self._idle) < self.size
+        if keep and self._reset(session):
+            with self._lock:
+                self._idle.append(session)
+        else:
+            self._quit(session)
+
+    def close(self):
+        with self._lock:
+            sessions = self._idle + list(self._leased.values())
+            self._idle, self._leased = [], {}
+        for session in sessions:
+            self._quit(session)
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                session = self._idle.pop()
+            if not self.health_check or self._is_healthy(session):
+                return session
+            logger.info(f"Discarding unhealthy {self.browser} session")
+            self._quit(session)
+
+    def _is_healthy(self, session: PooledSession) -> bool:
+        try:
+            return session.main_window in session.driver.window_handles and (
+                session.driver.execute_script("return 1") == 1
+            )
+        except WebDriverException:
+            return False
+
+    def _reset(self, session: PooledSession) -> bool:
+        driver = session.driver
+        try:
+            for handle in driver.window_handles:
+                if handle != session.main_window:
+                    driver.switch_to.window(handle)
+                    driver.close()
+            driver.switch_to.window(session.main_window)
+            driver.execute_script(CLEAR_STORAGE_SCRIPT)
+            if hasattr(driver, "execute_cdp_cmd"):
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            else:
+                driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except WebDriverException as e:
+            logger.info(f"Could not reset {self.browser} session: {e.msg}")
+            return False
+
+    def _quit(self, session: PooledSession):
+        try:
+            session.driver.quit()
+        except WebDriverException:
+            pass
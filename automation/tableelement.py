@@ -1,14 +1,91 @@
-from typing import Union
+from dataclasses import dataclass, field
+from typing import List, Union
 
-from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
+from automation.element_cache import cached_read_script
+from automation.element_resolver import FIND_SNIPPET
+from automation.locator import Locator
 from automation.selenium_base import SeleniumBase
 import logging as logger
 
+# Reads the whole table in one call. Rows directly under <table> (no
+# <tbody>) are treated as body rows, like browsers render them.
+TABLE_SNAPSHOT_SCRIPT = """
+var table = arguments[0];
+function texts(rows) {
+    return Array.prototype.map.call(rows, function (row) {
+        return Array.prototype.map.call(row.cells, function (cell) {
+            return cell.innerText;
+        });
+    });
+}
+var body = [];
+Array.prototype.forEach.call(table.children, function (child) {
+    if (child.tagName === 'TBODY') { body = body.concat(texts(child.rows)); }
+    if (child.tagName === 'TR') { body = body.concat(texts([child])); }
+});
+return {
+    header: table.tHead ? texts(table.tHead.rows) : [],
+    body: body,
+    footer: table.tFoot ? texts(table.tFoot.rows) : [],
+    th: Array.prototype.map.call(table.querySelectorAll('th'), function (cell) {
+        return cell.innerText;
+    })
+};
+"""
+
+# TABLE_SNAPSHOT_SCRIPT for the first visible match of a (by, value) pair,
+# for ``ElementCache.memoize``.
+TABLE_READ_SCRIPT = cached_read_script(
+    """
+var table = __pyselFind(arguments[0], arguments[1])[0];
+if (!table || !__pyselVisible(table)) { return undefined; }
+return (function () {
+"""
+    + TABLE_SNAPSHOT_SCRIPT
+    + """
+}).call(null, table);
+""",
+    FIND_SNIPPET,
+)
+
+
+@dataclass
+class TableSnapshot:
+    """Cell texts of a table as read by `TableElement.get_table_snapshot`"""
+
+    header: List[List[str]] = field(default_factory=list)
+    body: List[List[str]] = field(default_factory=list)
+    footer: List[List[str]] = field(default_factory=list)
+    th: List[str] = field(default_factory=list)
+
+    @property
+    def rows(self) -> List[List[str]]:
+        """All rows in the order browsers render them."""
+        return self.header + self.body + self.footer
+
+    @property
+    def cells(self) -> List[str]:
+        return [cell for row in self.rows for cell in row]
+
+    def to_dataframe(self):
+        """Returns the body rows as a pandas DataFrame.
+
+        The last header row is used for the column names when it has as
+        many cells as the widest body row.
+        """
+        import pandas as pd
+
+        width = max((len(row) for row in self.body), default=0)
+        columns = self.header[-1] if self.header else None
+        if columns is not None and len(columns) != width:
+            columns = None
+        return pd.DataFrame(self.body, columns=columns)
+
 
 class TableElement(SeleniumBase):
     def get_table_cell(
-        self, locator: Union[WebElement, None, str], row: int, column: int
+        self, locator: Union[WebElement, Locator, None, str], row: int, column: int
     ) -> str:
         """Returns contents of a table cell.
 
@@ -30,42 +107,54 @@ class TableElement(SeleniumBase):
                 "Both row and column must be non-zero, "
                 f"got row {row} and column {column}."
             )
-        try:
-            cell = self._get_cell(locator, row, column)
-        except AssertionError:
-            raise
-        return cell.text
-
-    def _get_cell(self, locator, row, column):
-        rows = self._get_rows(locator, row)
+        rows = self.get_table_snapshot(locator).rows
         if len(rows) < abs(row):
             raise AssertionError(
                 f"Table '{locator}' should have had at least {abs(row)} "
                 f"rows but had only {len(rows)}."
             )
-        index = row - 1 if row > 0 else row
-        cells = rows[index].find_elements(By.XPATH, "./th|./td")
+        cells = rows[self._index(row)]
         if len(cells) < abs(column):
             raise AssertionError(
                 f"Table '{locator}' row {row} should have had at "
                 f"least {abs(column)} columns but had only {len(cells)}."
             )
-        index = column - 1 if column > 0 else column
-        return cells[index]
-
-    def _get_rows(self, locator, count):
-        # Get rows in same order as browsers render them.
-        table = self.find_element(locator, tag="table")
-        rows = table.find_elements(By.XPATH, "./thead/tr")
-        if count < 0 or len(rows) < count:
-            rows.extend(table.find_elements(By.XPATH, "./tbody/tr"))
-        if count < 0 or len(rows) < count:
-            rows.extend(table.find_elements(By.XPATH, "./tfoot/tr"))
-        return rows
+        return cells[self._index(column)]
+
+    def get_table_snapshot(
+        self, locator: Union[WebElement, Locator, str], as_dataframe: bool = False
+    ) -> Union[TableSnapshot, "pandas.DataFrame"]:
+        """Returns the text of every cell of table ``locator`` in one call.
+
+        Header, body and footer rows are read as matrices of strings in the
+        order browsers render them. The snapshot of a table found by locator
+        is reused until the DOM of the page changes, so repeated checks
+        against the same table do not read it again.
+
+        With ``as_dataframe`` the snapshot is returned as a pandas DataFrame
+        instead, see `TableSnapshot.to_dataframe`.
+        """
+        if isinstance(locator, WebElement):
+            snapshot = self._read_table_snapshot(locator)
+        else:
+            locator = self._get_locator(locator)
+            snapshot = self.element_cache.memoize(
+                "table",
+                locator,
+                TABLE_READ_SCRIPT,
+                locator.as_tuple(),
+                lambda: self._read_table_snapshot(locator),
+            )
+        snapshot = TableSnapshot(**snapshot)
+        return snapshot.to_dataframe() if as_dataframe else snapshot
+
+    def _read_table_snapshot(self, locator) -> dict:
+        table = self.get_element(locator)
+        return self.driver.execute_script(TABLE_SNAPSHOT_SCRIPT, table)
 
     def table_cell_should_contain(
         self,
-        locator: Union[WebElement, None, str],
+        locator: Union[WebElement, Locator, None, str],
         row: int,
         column: int,
         expected: str,
@@ -84,7 +173,7 @@ class TableElement(SeleniumBase):
         logger.info(f"Table cell contains '{content}'.")
 
     def table_column_should_contain(
-        self, locator: Union[WebElement, None, str], column: int, expected: str
+        self, locator: Union[WebElement, Locator, None, str], column: int, expected: str
     ):
         """Verifies table column contains text ``expected``.
 
@@ -109,7 +198,7 @@ class TableElement(SeleniumBase):
             )
 
     def table_footer_should_contain(
-        self, locator: Union[WebElement, None, str], expected: str
+        self, locator: Union[WebElement, Locator, None, str], expected: str
     ):
         """Verifies table footer contains text ``expected``.
 
@@ -129,7 +218,7 @@ class TableElement(SeleniumBase):
             )
 
     def table_header_should_contain(
-        self, locator: Union[WebElement, None, str], expected: str
+        self, locator: Union[WebElement, Locator, None, str], expected: str
     ):
         """Verifies table header contains text ``expected``.
 
@@ -149,7 +238,7 @@ class TableElement(SeleniumBase):
             )
 
     def table_row_should_contain(
-        self, locator: Union[WebElement, None, str], row: int, expected: str
+        self, locator: Union[WebElement, Locator, None, str], row: int, expected: str
     ):
         """Verifies that table row contains text ``expected``.
 
@@ -174,7 +263,7 @@ class TableElement(SeleniumBase):
             )
 
     def table_should_contain(
-        self, locator: Union[WebElement, None, str], expected: str
+        self, locator: Union[WebElement, Locator, None, str], expected: str
     ):
         """Verifies table contains text ``expected``.
 
@@ -191,39 +280,38 @@ class TableElement(SeleniumBase):
             )
 
     def _find_by_content(self, table_locator, content):
-        return self._find(table_locator, "xpath:.//*", content)
+        snapshot = self.get_table_snapshot(table_locator)
+        return self._find(snapshot.cells, content)
 
     def _find_by_header(self, table_locator, content):
-        return self._find(table_locator, "xpath:.//th", content)
+        return self._find(self.get_table_snapshot(table_locator).th, content)
 
     def _find_by_footer(self, table_locator, content):
-        return self._find(table_locator, "xpath:.//tfoot//td", content)
+        footer = self.get_table_snapshot(table_locator).footer
+        return self._find([cell for row in footer for cell in row], content)
 
     def _find_by_row(self, table_locator, row, content):
-        position = self._index_to_position(row)
-        locator = f"//tr[{position}]"
-        return self._find(table_locator, locator, content)
+        index = self._index(row)
+        rows = self.get_table_snapshot(table_locator).rows
+        if index >= len(rows) or -index > len(rows):
+            return None
+        return self._find(rows[index], content)
 
     def _find_by_column(self, table_locator, col, content):
-        position = self._index_to_position(col)
-        locator = f"//tr//*[self::td or self::th][{position}]"
-        return self._find(table_locator, locator, content)
+        index = self._index(col)
+        rows = self.get_table_snapshot(table_locator).rows
+        column = [row[index] for row in rows if -len(row) <= index < len(row)]
+        return self._find(column, content)
 
-    def _index_to_position(self, index):
+    def _index(self, index):
         if index == 0:
             raise ValueError("Row and column indexes must be non-zero.")
-        if index > 0:
-            return str(index)
-        if index == -1:
-            return "position()=last()"
-        return f"position()=last()-{abs(index) - 1}"
-
-    def _find(self, table_locator, locator, content):
-        table = self.find_element(table_locator)
-        elements = self.find_elements(locator, parent=table)
-        for element in elements:
+        return index - 1 if index > 0 else index
+
+    def _find(self, cells, content):
+        for cell in cells:
             if content is None:
-                return element
-            if element.text and content in element.text:
-                return element
+                return cell
+            if cell and content in cell:
+                return cell
         return None
@@ -0,0 +1,95 @@
+"""Text search over the page and its same-origin frames in one script call"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Looks for ``text`` in the text content of a document and, when asked, of
+# every same-origin frame below it. Cross-origin frames cannot be read from
+# the page and are skipped. When a match is found the path to the deepest
+# element containing the whole text is built as an absolute xpath.
+TEXT_SEARCH_SNIPPET = """
+function __pyselTextSearch(text, includeFrames, withPath) {
+    function contains(node) {
+        return (node.textContent || '').indexOf(text) !== -1;
+    }
+    function deepest(node) {
+        for (var i = 0; i < node.children.length; i++) {
+            if (contains(node.children[i])) { return deepest(node.children[i]); }
+        }
+        return node;
+    }
+    function pathOf(node) {
+        var parts = [];
+        for (; node && node.nodeType === 1; node = node.parentElement) {
+            var index = 1;
+            for (var s = node.previousElementSibling; s; s = s.previousElementSibling) {
+                if (s.tagName === node.tagName) { index += 1; }
+            }
+            parts.unshift(node.tagName.toLowerCase() + '[' + index + ']');
+        }
+        return '/' + parts.join('/');
+    }
+    function search(doc, frames) {
+        var root = doc && doc.documentElement;
+        if (!root) { return null; }
+        if (contains(root)) {
+            return {frames: frames, path: withPath ? pathOf(deepest(root)) : null};
+        }
+        if (!includeFrames) { return null; }
+        var children = doc.querySelectorAll('iframe, frame');
+        for (var i = 0; i < children.length; i++) {
+            var child = null;
+            try { child = children[i].contentDocument; } catch (e) { child = null; }
+            var found = search(child, frames.concat([i]));
+            if (found) { return found; }
+        }
+        return null;
+    }
+    return search(document, []);
+}
+"""
+
+TEXT_SEARCH_SCRIPT = (
+    TEXT_SEARCH_SNIPPET
+    + "return __pyselTextSearch(arguments[0], arguments[1], arguments[2]);"
+)
+
+
+@dataclass
+class TextMatch:
+    """Where a text was found.
+
+    ``frames`` holds the frame indexes to switch through from the current
+    document, empty when the text is in the current document itself.
+    ``path`` is the xpath of the deepest element containing the text.
+    """
+
+    frames: List[int] = field(default_factory=list)
+    path: Optional[str] = None
+
+
+class TextSearch:
+    """Checks a document and its frames for a text without switching frames.
+
+    Replaces a ``//*[contains(., text)]`` lookup, which matches every
+    ancestor of the text up to ``<html>`` and waits for visibility, and the
+    frame by frame ``switch_to`` walk previously done from Python.
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+
+    def find(
+        self, text: str, include_frames: bool = True, with_path: bool = False
+    ) -> Optional[TextMatch]:
+        match = self.driver.execute_script(
+            TEXT_SEARCH_SCRIPT, text, include_frames, with_path
+        )
+        if match is None:
+            return None
+        return TextMatch(frames=match["frames"], path=match["path"])
+
+    def contains(self, text: str, include_frames: bool = True) -> bool:
+        return self.find(text, include_frames) is not None
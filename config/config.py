@@ -9,3 +9,80 @@ LEARN2 = "https://www.saucedemo.com/"
 
 BASE_URL = UAT
 LOG_SUMMARY_PATH = "./logs/test_summary.log"
+# Structured results, JSONL or SQLite (.sqlite3/.sqlite/.db), written in
+# batches by a background thread
+RESULT_SINK_PATH = "./logs/results.jsonl"
+RESULT_QUEUE_SIZE = 1000
+RESULT_BATCH_SIZE = 100
+RESULT_FLUSH_INTERVAL = 1.0
+# Seconds between fsyncs of the result files (0 = after every batch)
+RESULT_FSYNC_INTERVAL = 5.0
+
+# Screenshots of checks: "always", "failure" or "sampled" (failures plus
+# SCREENSHOT_SAMPLE_RATE of the passes)
+SCREENSHOT_POLICY = "failure"
+SCREENSHOT_SAMPLE_RATE = 0.1
+SCREENSHOT_QUEUE_SIZE = 20
+# Average hash bits two frames may differ by and still count as the same
+SCREENSHOT_DEDUPE_DISTANCE = 4
+COMMAND_METRICS_PATH = "./logs/command_metrics"
+DRIVER_MANIFEST_PATH = "./.drivers/manifest.json"
+
+# Warm browser sessions kept between test classes
+SESSION_POOL_SIZE = 2
+SESSION_MAX_REUSE = 20
+SESSION_HEALTH_CHECK = True
+
+# Window size of the headless "chrome-lean" browser
+LEAN_VIEWPORT = (1366, 768)
+
+# Third-party requests blocked through CDP on Chromium browsers. Off by
+# default, as it changes what the pages under test load.
+NETWORK_POLICY_ENABLED = False
+NETWORK_BLOCK_LIST = [
+    "*google-analytics.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*newrelic.com*",
+    "*nr-data.net*",
+]
+# Blocked as well, with a script that defines the globals pages call into
+NETWORK_STUBS = {
+    "*googletagmanager.com*": "window.dataLayer = window.dataLayer || [];",
+    "*google-analytics.com/analytics.js*": "window.ga = window.ga || function () {};",
+}
+NETWORK_REPORT_PATH = "./logs/network_policy"
+
+# Test durations kept between runs to balance parallel shards
+TEST_DURATIONS_PATH = "./.test_durations.json"
+DEFAULT_TEST_DURATION = 30.0
+SHARD_REPORT_PATH = "./logs/shards.json"
+
+# Navigation returns at DOMContentLoaded ("eager"), at load ("normal") or
+# right away ("none"); wait_until_page_is_completely_loaded then waits for
+# PAGE_READINESS ("interactive" or "complete") and, when the quiet window is
+# set above 0, for that many milliseconds without network activity. The
+# defaults wait for the full load; suites that only need the DOM can opt in
+# to "eager" and "interactive".
+PAGE_LOAD_STRATEGY = "normal"
+PAGE_READINESS = "complete"
+NETWORK_IDLE_QUIET_MS = 0
+
+# Remote (grid hub) sessions
+REMOTE_HUB_URL = "http://localhost:4444/wd/hub"
+REMOTE_POOL_SIZE = SESSION_POOL_SIZE
+REMOTE_RETRIES = 3
+REMOTE_RETRY_BACKOFF = 0.2
+REMOTE_TIMEOUT = 120
+
+# Browser tabs the tree crawl keeps loading at the same time (1 = one by one)
+CRAWL_TABS = 3
+# Threads fetching node pages over HTTP for the tree crawl (0 = browser only)
+CRAWL_HTTP_WORKERS = 0
+CRAWL_HTTP_TIMEOUT = 10
+# Crawl checkpoint that lets an interrupted tree walk resume, and how many
+# times a node is tried before it is quarantined
+CRAWL_CHECKPOINT_PATH = "./.crawl_checkpoint.sqlite3"
+CRAWL_MAX_ATTEMPTS = 3
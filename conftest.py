@@ -6,44 +6,74 @@ import timeit
 import os
 import shutil
 from fnmatch import fnmatch
-from automation.browser_strategy import BrowserSelector
-from config.config import BASE_URL, BROWSER, LOG_SUMMARY_PATH
+from automation.command_metrics import recorder
+from automation.durations import durations
+from automation.network_policy import network_policy
+from automation.parallel import is_worker, worker_name
+from automation.result_sink import result_sink
+from automation.screenshot_pipeline import screenshots
+from automation.session_pool import SessionPool
+from config.config import (
+    BASE_URL,
+    BROWSER,
+    COMMAND_METRICS_PATH,
+    LOG_SUMMARY_PATH,
+    NETWORK_REPORT_PATH,
+    RESULT_SINK_PATH,
+)
 from datetime import datetime
 from utils.scripter import Scripter
 
+pytest_plugins = ["automation.parallel"]
+
 
 def pytest_addoption(parser):
     parser.addoption("--browser", action="store", default="chrome")
 
 
+@pytest.fixture(scope="session")
+def session_pool(request):
+    pool = SessionPool(request.config.getoption("--browser"), BASE_URL)
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(scope="class", autouse=True)
-def test_setup(request):
-    _browser = request.config.getoption("--browser")
-    driver = BrowserSelector(_browser, BASE_URL).start()
+def test_setup(request, session_pool):
+    driver = session_pool.lease()
+    recorder.instrument(driver)
     request.cls.driver = driver
     # Scripter(driver.page_source).generate_script()
 
     yield driver
-    driver.quit()
+    network_policy.collect(driver)
+    session_pool.release(driver)
 
 
 @pytest.fixture(autouse=True)
-def log_test_name():
+def log_test_name(request):
     starttime = timeit.default_timer()
     testname = (
         os.environ.get("PYTEST_CURRENT_TEST").split(":")[-1].split(" ")[0]
     ).upper()
     logger.info(f"{testname} STARTED")
+    recorder.current_test = testname
     yield True
+    recorder.current_test = None
     time_taken = timeit.default_timer() - starttime
+    durations.record(request.node.nodeid, time_taken)
     formatted_time = "{:.2f}".format(time_taken)
-    logger.info(f"{testname} COMPLETED IN: {formatted_time} SECONDS")
+    logger.info(
+        f"{testname} COMPLETED IN: {formatted_time} SECONDS "
+        f"({recorder.test_summary(testname)})"
+    )
 
 
-@pytest.fixture(scope="session", autouse=True)
-def create_log_summary_file():
+def pytest_sessionstart(session):
     # if os.getenv("ENVIRONMENT") != "DEV":
     #     return
+    if is_worker(session.config) or session.config.option.collectonly:
+        return
     for dirpath, dirnames, filenames in os.walk("./logs/screenshots"):
         for file in filenames:
             if fnmatch(file, "*.png"):
@@ -51,9 +81,29 @@ def create_log_summary_file():
     for dirpath, dirnames, filenames in os.walk("./logs/screenshots"):
         for name in dirnames:
             shutil.rmtree(os.path.join(dirpath, name))
-    f = open(LOG_SUMMARY_PATH, "w")
-    time = datetime.now().strftime("%d-%m-%Y %H:%S")
-    f.write(f"{time}\tTests started\n")
+    if os.path.exists(RESULT_SINK_PATH):
+        os.remove(RESULT_SINK_PATH)
+    with open(LOG_SUMMARY_PATH, "w") as f:
+        time = datetime.now().strftime("%d-%m-%Y %H:%S")
+        f.write(f"{time}\tTests started\n")
+
+
+def pytest_sessionfinish(session):
+    if is_worker(session.config) or session.config.option.collectonly:
+        return
+    with open(LOG_SUMMARY_PATH, "a") as f:
+        time = datetime.now().strftime("%d-%m-%Y %H:%S")
+        f.write(f"{time}\tTests completed\n")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def export_metrics(request):
     yield
-    time = datetime.now().strftime("%d-%m-%Y %H:%S")
-    f.write(f"{time}\tTests completed\n")
+    result_sink.close()
+    screenshots.close()
+    suffix = ""
+    if is_worker(request.config):
+        suffix = f".{worker_name(request.config.getoption('worker_id'))}"
+    recorder.export(f"{COMMAND_METRICS_PATH}{suffix}")
+    network_policy.export(f"{NETWORK_REPORT_PATH}{suffix}")
+    durations.save()
@@ -1,3 +1,7 @@
-pytest -m set3 --browser "firefox" &
-pytest -m set2 --browser "edge" &
-pytest -m set1 --browser "chrome" &
\ No newline at end of file
+# One parallel run per browser, one after another so the runs do not share
+# the worker logs and shard report
+status=0
+pytest -m set1 --workers 3 --browser "chrome" || status=1
+pytest -m set2 --workers 3 --browser "edge" || status=1
+pytest -m set3 --workers 3 --browser "firefox" || status=1
+exit $status
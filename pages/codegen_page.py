@@ -12,12 +12,13 @@ from selenium.common.exceptions import (
 from automation.error import (
     ElementNotVisibleException,
 )
-import requests
-from lxml import html
 
 
 class CodeGenPage(PageBase):
     def generate_code(self):
+        import requests
+        from lxml import html
+
         try:
             response = requests.get(
                 "https://en.wikipedia.org/wiki/List_of_countries_by_population_in_2010"
@@ -0,0 +1,176 @@
+"""SQLite checkpoint of a tree crawl, so an interrupted crawl can resume"""
+
+import json
+import logging as logger
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, List, Set, Tuple
+
+from config.config import CRAWL_CHECKPOINT_PATH, CRAWL_MAX_ATTEMPTS
+
+if TYPE_CHECKING:
+    from pages.tree_crawler import CrawlNode
+
+QUEUED = "queued"
+DONE = "done"
+QUARANTINED = "quarantined"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    crawl TEXT PRIMARY KEY,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    crawl TEXT NOT NULL,
+    url TEXT NOT NULL,
+    dept TEXT,
+    category TEXT,
+    name TEXT,
+    depth INTEGER,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    seq INTEGER NOT NULL,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (crawl, url)
+);
+"""
+
+
+class CrawlCheckpoint:
+    """Frontier, visited set and node results of one crawl.
+
+    ``crawl`` identifies the crawl, e.g. the pytest node id and department,
+    so crawls run by different tests never share rows. Every change is
+    committed right away, so a crawl that dies mid-way resumes from the
+    last node it finished. Nodes that fail ``max_attempts`` times are
+    quarantined and are not retried. A completed crawl, or one that died
+    before it was seeded, starts over on the next run.
+    """
+
+    def __init__(
+        self,
+        crawl: str,
+        path: str = CRAWL_CHECKPOINT_PATH,
+        max_attempts: int = CRAWL_MAX_ATTEMPTS,
+    ):
+        self.crawl = crawl
+        self.max_attempts = max_attempts
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._seq = 0
+
+    def start(self) -> bool:
+        """Returns whether an unfinished crawl was found to resume."""
+        row = self._db.execute(
+            "SELECT completed, (SELECT MAX(seq) FROM nodes WHERE crawl = ?) "
+            "FROM crawls WHERE crawl = ?",
+            (self.crawl, self.crawl),
+        ).fetchone()
+        if row is None or row[0] or row[1] is None:
+            return False
+        self._seq = row[1]
+        return True
+
+    def seed(self, nodes: List["CrawlNode"]):
+        """Starts the crawl over from ``nodes`` in one transaction."""
+        self._seq = 0
+        with self._transaction():
+            self._db.execute("DELETE FROM nodes WHERE crawl = ?", (self.crawl,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO crawls (crawl, completed) VALUES (?, 0)",
+                (self.crawl,),
+            )
+            for node in nodes:
+                self.queued(node)
+
+    def load(self) -> Tuple[List["CrawlNode"], Set[str]]:
+        from pages.tree_crawler import CrawlNode
+
+        rows = self._db.execute(
+            "SELECT url, dept, category, name, depth, state FROM nodes "
+            "WHERE crawl = ? ORDER BY seq",
+            (self.crawl,),
+        ).fetchall()
+        frontier = [
+            CrawlNode(url, dept, category, name, depth)
+            for url, dept, category, name, depth, state in rows
+            if state == QUEUED
+        ]
+        return frontier, {row[0] for row in rows}
+
+    def queued(self, node: "CrawlNode"):
+        self._seq += 1
+        self._db.execute(
+            "INSERT OR IGNORE INTO nodes "
+            "(crawl, url, dept, category, name, depth, state, seq) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.crawl,
+                node.url,
+                node.dept,
+                node.category,
+                node.name,
+                node.depth,
+                QUEUED,
+                self._seq,
+            ),
+        )
+
+    def done(self, node: "CrawlNode"):
+        self._db.execute(
+            "UPDATE nodes SET state = ?, result = ? WHERE crawl = ? AND url = ?",
+            (DONE, json.dumps(node.result), self.crawl, node.url),
+        )
+
+    def failed(self, node: "CrawlNode", error: Exception) -> bool:
+        """Counts a failed attempt; returns whether the node is quarantined."""
+        attempts = (
+            self._db.execute(
+                "SELECT attempts FROM nodes WHERE crawl = ? AND url = ?",
+                (self.crawl, node.url),
+            ).fetchone()[0]
+            + 1
+        )
+        quarantined = attempts >= self.max_attempts
+        self._seq += 1
+        self._db.execute(
+            "UPDATE nodes SET attempts = ?, state = ?, error = ?, seq = ? "
+            "WHERE crawl = ? AND url = ?",
+            (
+                attempts,
+                QUARANTINED if quarantined else QUEUED,
+                f"{type(error).__name__}: {error}",
+                self._seq,
+                self.crawl,
+                node.url,
+            ),
+        )
+        if quarantined:
+            logger.info(
+                f"Quarantined {node.url} after {attempts} failed attempts"
+            )
+        return quarantined
+
+    def complete(self):
+        self._db.execute(
+            "UPDATE crawls SET completed = 1 WHERE crawl = ?", (self.crawl,)
+        )
+
+    def close(self):
+        self._db.close()
+
+    @contextmanager
+    def _transaction(self):
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
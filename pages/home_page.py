@@ -1,9 +1,16 @@
 from typing import List
 from automation.page_base import PageBase
+from pages.http_crawler import HttpTreeCrawler
+from pages.tree_crawler import MultiTabCrawler, TreeCrawler
 from pos.home_po import HomePO
 import logging as logger
 import time
-from config.config import BASE_URL
+from config.config import (
+    BASE_URL,
+    CRAWL_HTTP_WORKERS,
+    CRAWL_MAX_ATTEMPTS,
+    CRAWL_TABS,
+)
 from datetime import datetime
 from selenium.common.exceptions import (
     StaleElementReferenceException,
@@ -68,7 +75,8 @@ class HomePage(PageBase):
         self.wait_until_page_is_completely_loaded()
         counter = 1
         tabs = ""
-        while True:
+        failures = 0
+        while failures < CRAWL_MAX_ATTEMPTS:
             try:
                 node_link = HomePO.cat_sublinks
 
@@ -85,19 +93,24 @@ class HomePage(PageBase):
                 cat_list = self.get_category_list()
                 self.nodes_walked += 1
                 self._process_walk_node_result([dept, cat, breadcrumb, cat_list])
+                failures = 0
             except (
                 StaleElementReferenceException,
                 ElementNotVisibleException,
                 ElementClickInterceptedException,
-            ):
+            ) as e:
                 counter -= 1
-                time.sleep(3)
+                failures += 1
+                logger.info(f"{tabs}Clicking node failed: {type(e).__name__}")
+                time.sleep(failures)
+        else:
+            logger.info(
+                f"{tabs}Quarantined {dept} > {cat} after {failures} failed attempts"
+            )
 
     def get_breadcrumbs(self) -> List[str]:
-        if not self.element_exists(HomePO.breadcrumb_links):
-            return []
-        breadcrumbs = self.get_elements(HomePO.breadcrumb_links)
-        return [self.get_text(x) for x in breadcrumbs]
+        breadcrumbs = self.get_elements_properties(HomePO.breadcrumb_links, ["text"])
+        return [x["text"] for x in breadcrumbs]
 
     def get_category_list(self) -> List[str]:
         if not self.element_exists(HomePO.cat_list):
@@ -105,7 +118,24 @@ class HomePage(PageBase):
         cat_text = self.get_text(HomePO.cat_list)
         return cat_text.replace("All Categories\n", "").split("\n")
 
+    def get_sub_node_links(self) -> List[dict]:
+        links = self.get_elements_properties(HomePO.sub_node_links, ["href", "text"], 2)
+        if not links:
+            links = self.get_elements_properties(
+                HomePO.sub_node_links_alt, ["href", "text"], 0
+            )
+        return [link for link in links if link["href"]]
+
     def perform_tree_walk(self, dept_index):
+        if CRAWL_HTTP_WORKERS > 0:
+            crawler = HttpTreeCrawler(self)
+        elif CRAWL_TABS > 1:
+            crawler = MultiTabCrawler(self)
+        else:
+            crawler = TreeCrawler(self)
+        crawler.crawl(dept_index)
+
+    def perform_tree_walk_by_clicking(self, dept_index):
         self.go_to(BASE_URL)
         if self.is_dept_index_greater_than_total_depts(dept_index):
             return
@@ -122,7 +152,7 @@ class HomePage(PageBase):
             visited_category_count += 1
             self.go_to(BASE_URL)
 
-    def _process_walk_node_result(self, result):
+    def _process_walk_node_result(self, result, screenshot: bool = True) -> str:
         dept = result[0]
         category = result[1]
         breadcrumb = result[2]
@@ -134,6 +164,17 @@ class HomePage(PageBase):
         logger.info(f"{result}")
         time = datetime.now().strftime("%d-%m-%Y %H:%S")
         self.write_to_summary(
-            f"{time}|{self.nodes_walked}|{breadcrumb}|{categories}|{result}"
+            f"{time}|{self.nodes_walked}|{breadcrumb}|{categories}|{result}",
+            node=self.nodes_walked,
+            dept=dept,
+            category=category,
+            breadcrumb=breadcrumb,
+            categories=categories,
+            result=result,
         )
-        self.take_screenshot(f"{self.nodes_walked}_{result}_{dept}_{category}_{node}")
+        if screenshot:
+            self.take_screenshot(
+                f"{self.nodes_walked}_{result}_{dept}_{category}_{node}",
+                failed=result == "fail",
+            )
+        return result
@@ -0,0 +1,202 @@
+"""Tree crawl that reads node pages over HTTP and uses the browser as fallback"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+import logging as logger
+import threading
+import timeit
+from typing import TYPE_CHECKING, Dict, List, Optional
+from urllib.parse import urljoin
+
+from automation.error import PageException
+from config.config import CRAWL_HTTP_TIMEOUT, CRAWL_HTTP_WORKERS
+from pages.tree_crawler import CrawlNode, TreeCrawler
+from pos.home_po import HomePO
+
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+    from pages.home_page import HomePage
+
+# Elements the browser's innerText puts on lines of their own
+BLOCK_TAGS = set(
+    "address article aside blockquote br dd div dl dt fieldset figcaption figure "
+    "footer form h1 h2 h3 h4 h5 h6 header hr li main nav ol p pre section table "
+    "tr ul".split()
+)
+HIDDEN_TAGS = {"script", "style", "noscript", "template"}
+
+
+@dataclass
+class FetchedNode:
+    breadcrumb: List[str]
+    categories: List[str]
+    links: List[dict]
+
+
+def inner_text(element: "HtmlElement") -> str:
+    """Approximates ``innerText``, which the browser path reads.
+
+    Block elements start a new line and scripts and styles are left out, so
+    ``TreeCrawler.check`` gets the same lines from either path.
+    """
+    parts: List[str] = []
+
+    def walk(el):
+        if not isinstance(el.tag, str) or el.tag in HIDDEN_TAGS:
+            return
+        block = el.tag in BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        parts.append(el.text or "")
+        for child in el:
+            walk(child)
+            parts.append(child.tail or "")
+        if block:
+            parts.append("\n")
+
+    walk(element)
+    return "".join(parts)
+
+
+def parse_node(page_source: bytes, url: str) -> Optional[FetchedNode]:
+    """Reads a node page the way ``TreeCrawler.read`` does in the browser.
+
+    ``page_source`` is the raw response body, so lxml reads the encoding
+    from the document, which also accepts pages with an XML declaration.
+    Returns None when the breadcrumbs are not in the served HTML, which
+    means the page renders them with JavaScript. Raises lxml's
+    ``ParserError`` for an empty document.
+    """
+    from lxml import html
+
+    tree = html.fromstring(page_source)
+    breadcrumb = [
+        inner_text(link) for link in tree.xpath(HomePO.breadcrumb_links.value)
+    ]
+    if not breadcrumb:
+        return None
+    categories = []
+    for cat_list in tree.xpath(HomePO.cat_list.value)[:1]:
+        categories = inner_text(cat_list).split("\n")
+    links = tree.xpath(HomePO.sub_node_links.value) or tree.xpath(
+        HomePO.sub_node_links_alt.value
+    )
+    return FetchedNode(
+        breadcrumb,
+        categories,
+        [
+            {"href": urljoin(url, link.get("href")), "text": inner_text(link)}
+            for link in links
+            if link.get("href")
+        ],
+    )
+
+
+class HttpTreeCrawler(TreeCrawler):
+    """``TreeCrawler`` that fetches node pages with ``requests``.
+
+    Node pages are downloaded and parsed with lxml on ``workers`` threads,
+    each with its own ``requests.Session``, while the results are checked
+    on the calling thread in the order they arrive. The sessions start
+    with the browser's cookies and user agent. Pages whose breadcrumbs are
+    not in the served HTML, or that fail to download, are opened in the
+    browser instead. Pages that cannot be parsed fail like any other node.
+    """
+
+    def __init__(
+        self,
+        page: "HomePage",
+        workers: int = CRAWL_HTTP_WORKERS,
+        timeout: float = CRAWL_HTTP_TIMEOUT,
+    ):
+        super().__init__(page)
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+        self.fallbacks = 0
+        self._user_agent = ""
+        self._cookies: List[dict] = []
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def walk(self):
+        driver = self.page.driver
+        self._user_agent = driver.execute_script("return navigator.userAgent;")
+        self._cookies = driver.get_cookies()
+        starttime = timeit.default_timer()
+        visited = 0
+        pending: Dict[Future, CrawlNode] = {}
+        try:
+            with ThreadPoolExecutor(self.workers) as pool:
+                while self.frontier or pending:
+                    while self.frontier and len(pending) < self.workers * 2:
+                        node = self.frontier.popleft()
+                        pending[pool.submit(self.fetch, node)] = node
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        node = pending.pop(future)
+                        self.process(
+                            node, partial(self.read_fetched, future=future)
+                        )
+                        visited += 1
+        finally:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
+        self._report(visited, timeit.default_timer() - starttime)
+
+    def fetch(self, node: CrawlNode) -> Optional[FetchedNode]:
+        response = self._session().get(node.url, timeout=self.timeout)
+        response.raise_for_status()
+        return parse_node(response.content, response.url)
+
+    def read_fetched(self, node: CrawlNode, future: Future) -> List[CrawlNode]:
+        import requests
+        from lxml.etree import LxmlError
+
+        try:
+            fetched = future.result()
+        except requests.RequestException as e:
+            logger.info(f"Fetching {node.url} failed: {type(e).__name__}")
+            fetched = None
+        except (LxmlError, ValueError) as e:
+            raise PageException(f"Could not parse {node.url}: {e}") from e
+        except Exception as e:
+            raise PageException(f"Could not read {node.url}: {e!r}") from e
+        if fetched is None:
+            self.fallbacks += 1
+            return self.visit(node)
+        self._log_visit(node)
+        if node.depth > 0:
+            self.check(
+                node, fetched.breadcrumb, fetched.categories, screenshot=False
+            )
+        return self.children(node, fetched.links)
+
+    def _session(self):
+        """Session of the calling thread, ``requests.Session`` is not thread safe."""
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            return session
+        import requests
+
+        session = self._local.session = requests.Session()
+        session.headers["User-Agent"] = self._user_agent
+        for cookie in self._cookies:
+            session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+        with self._lock:
+            self._sessions.append(session)
+        return session
+
+    def _report(self, visited: int, elapsed: float):
+        rate = visited / elapsed if elapsed else 0.0
+        logger.info(
+            f"Walked {visited} nodes over HTTP in {elapsed:.2f} seconds "
+            f"({rate:.1f} nodes/s), {self.fallbacks} opened in the browser"
+        )
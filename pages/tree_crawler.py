@@ -0,0 +1,327 @@
+"""Breadth-first crawl of the department category tree"""
+
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+import logging as logger
+import os
+import time
+import timeit
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from urllib.parse import urldefrag
+
+from selenium.common.exceptions import WebDriverException
+
+from automation.element_resolver import POLL_FREQUENCY
+from automation.error import NavigationNotCommitted, PageException
+from automation.network_policy import network_policy
+from automation.wait_times import LONG
+from config.config import BASE_URL, CRAWL_TABS
+from pages.crawl_checkpoint import CrawlCheckpoint
+from pos.home_po import HomePO
+
+if TYPE_CHECKING:
+    from pages.home_page import HomePage
+
+
+@dataclass
+class CrawlNode:
+    url: str
+    dept: str
+    category: str
+    name: str = ""
+    depth: int = 0
+    result: Optional[dict] = None
+
+
+# Failures that send a node back to the frontier for another attempt
+CRAWL_ERRORS = (WebDriverException, PageException)
+
+ALL_CATEGORIES = "All Categories"
+
+
+def clean_text(text: Optional[str]) -> str:
+    """Collapses runs of whitespace, as the browser and HTTP paths differ in it."""
+    return " ".join((text or "").split())
+
+
+class TreeCrawler:
+    """Visits a department's categories and sub-nodes from a URL frontier.
+
+    The department is hovered once and every category href is read from
+    the flyout in one pass. Category and sub-node pages are then opened
+    directly by URL, breadth first, instead of reloading the home page and
+    hovering again for each category. A visited set keeps every URL to one
+    visit. Each sub-node page is checked with
+    ``HomePage._process_walk_node_result``.
+
+    The frontier, visited set and node results are saved to a
+    ``CrawlCheckpoint`` after every node, so a rerun after a crash resumes
+    where the crawl stopped. A node that fails goes to the back of the
+    frontier until it is quarantined after ``CRAWL_MAX_ATTEMPTS`` attempts.
+    """
+
+    def __init__(self, page: "HomePage"):
+        self.page = page
+        self.frontier: Deque[CrawlNode] = deque()
+        self.visited: Set[str] = set()
+        self.cookie_handled = False
+        self.checkpoint: Optional[CrawlCheckpoint] = None
+
+    def crawl(self, dept_index) -> None:
+        # the running test's node id, without the " (call)" phase suffix
+        test = os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" ", 1)[0]
+        self.checkpoint = CrawlCheckpoint(f"{test}|{BASE_URL}#{dept_index}")
+        try:
+            if self.resume() or self.seed(dept_index):
+                self.walk()
+            self.checkpoint.complete()
+        finally:
+            self.checkpoint.close()
+
+    def walk(self):
+        while self.frontier:
+            self.process(self.frontier.popleft(), self.visit)
+
+    def resume(self) -> bool:
+        if not self.checkpoint.start():
+            return False
+        frontier, self.visited = self.checkpoint.load()
+        self.frontier.extend(frontier)
+        logger.info(
+            f"Resuming crawl with {len(self.frontier)} of "
+            f"{len(self.visited)} nodes left"
+        )
+        self.page.go_to(BASE_URL)
+        self.cookie_handled = self.page.handle_cookie()
+        return True
+
+    def seed(self, dept_index) -> bool:
+        self.page.go_to(BASE_URL)
+        if self.page.is_dept_index_greater_than_total_depts(dept_index):
+            return False
+        dept = self.page.walk_department(dept_index)
+        for link in self.page.get_elements_properties(
+            HomePO.cat_links, ["href", "text"]
+        ):
+            name = (link["text"] or "").replace("\n", " ")
+            self.enqueue(CrawlNode(link["href"], dept, name, name), save=False)
+        self.checkpoint.seed(list(self.frontier))
+        return True
+
+    def enqueue(self, node: CrawlNode, save: bool = True) -> bool:
+        if not node.url:
+            return False
+        node.url = urldefrag(node.url).url
+        if node.url in self.visited:
+            return False
+        self.visited.add(node.url)
+        self.frontier.append(node)
+        if save:
+            self.checkpoint.queued(node)
+        return True
+
+    def process(
+        self, node: CrawlNode, read: Callable[[CrawlNode], List[CrawlNode]]
+    ):
+        try:
+            children = read(node)
+        except CRAWL_ERRORS as e:
+            self.fail(node, e)
+            return
+        # children are saved first, so a crash in between only repeats the node
+        for child in children:
+            self.enqueue(child)
+        self.checkpoint.done(node)
+        network_policy.collect(self.page.driver)
+
+    def fail(self, node: CrawlNode, e: Exception):
+        logger.info(f"Visiting {node.url} failed: {type(e).__name__}")
+        if not self.checkpoint.failed(node, e):
+            self.frontier.append(node)
+
+    def visit(self, node: CrawlNode) -> List[CrawlNode]:
+        self.open(node)
+        return self.read(node)
+
+    def open(self, node: CrawlNode):
+        self._log_visit(node)
+        self.page.go_to(node.url)
+
+    def read(self, node: CrawlNode) -> List[CrawlNode]:
+        """Checks the node open in the current tab and returns its children."""
+        self.page.wait_until_page_is_completely_loaded()
+        if node.depth == 0 and not self.cookie_handled:
+            self.cookie_handled = self.page.handle_cookie()
+        if node.depth > 0:
+            self.check(
+                node, self.page.get_breadcrumbs(), self.page.get_category_list()
+            )
+        return self.children(node, self.page.get_sub_node_links())
+
+    def check(
+        self,
+        node: CrawlNode,
+        breadcrumb: List[str],
+        cat_list: List[str],
+        screenshot: bool = True,
+    ):
+        breadcrumb = [clean_text(text) for text in breadcrumb]
+        cat_list = [
+            line
+            for line in map(clean_text, cat_list)
+            if line and line != ALL_CATEGORIES
+        ]
+        self.page.nodes_walked += 1
+        result = self.page._process_walk_node_result(
+            [node.dept, node.category, breadcrumb, cat_list], screenshot
+        )
+        node.result = {
+            "breadcrumb": breadcrumb,
+            "categories": cat_list,
+            "result": result,
+        }
+
+    def children(self, node: CrawlNode, links: List[dict]) -> List[CrawlNode]:
+        return [
+            CrawlNode(
+                link["href"],
+                node.dept,
+                node.category,
+                (link["text"] or "").replace("\n", " "),
+                node.depth + 1,
+            )
+            for link in links
+        ]
+
+    def _log_visit(self, node: CrawlNode):
+        if node.depth == 0:
+            logger.info("=" * 100)
+            logger.info(f"    Visiting Category {node.category}")
+        else:
+            tabs = "\t" * (node.depth + 1)
+            logger.info(f"{tabs}Visiting node {node.name}")
+
+
+# Marks the document a tab is leaving, so the poll can tell when the
+# navigation committed, then starts the navigation without waiting for it.
+START_NAVIGATION_SCRIPT = """
+window.__pyselLeaving = true;
+window.location.href = arguments[0];
+"""
+
+# The new document is ready once it replaced the marked one and parsed.
+# "load" is the seconds its own navigation took to reach interactive.
+TAB_READY_SCRIPT = """
+var committed = !window.__pyselLeaving;
+var nav = performance.getEntriesByType('navigation')[0];
+return {
+    committed: committed,
+    ready: committed && document.readyState !== 'loading',
+    load: committed && nav ? nav.domInteractive / 1000 : 0
+};
+"""
+
+
+class MultiTabCrawler(TreeCrawler):
+    """``TreeCrawler`` that keeps up to ``tabs`` navigations in flight.
+
+    Every idle tab starts loading the next frontier node. The crawler then
+    polls the busy tabs and reads whichever finished first, so the nodes
+    are checked while the others are still loading. Each tab remembers the
+    node it is loading, which keeps the breadcrumb and category checks tied
+    to the right node. A tab whose navigation never replaced the previous
+    document within ``LONG`` fails its node instead of reading the old page.
+
+    ``sequential_time`` adds up each node's own load time, as the browser
+    measured it for that document, and the time it took to check it. That
+    is what the same nodes would take one at a time.
+    """
+
+    def __init__(self, page: "HomePage", tabs: int = CRAWL_TABS):
+        super().__init__(page)
+        self.tabs = max(tabs, 1)
+        self.sequential_time = 0.0
+
+    def walk(self):
+        driver = self.page.driver
+        main = driver.current_window_handle
+        handles = [main]
+        busy: Dict[str, CrawlNode] = {}
+        starttime = timeit.default_timer()
+        visited = 0
+        try:
+            while self.frontier or busy:
+                while self.frontier and len(busy) < self.tabs:
+                    handle = next((h for h in handles if h not in busy), None)
+                    if handle is None:
+                        driver.switch_to.new_window("tab")
+                        handle = driver.current_window_handle
+                        handles.append(handle)
+                    node = self.frontier.popleft()
+                    self._switch(handle)
+                    self._log_visit(node)
+                    try:
+                        driver.execute_script(START_NAVIGATION_SCRIPT, node.url)
+                    except CRAWL_ERRORS as e:
+                        self.fail(node, e)
+                        continue
+                    busy[handle] = node
+                if not busy:
+                    continue
+                handle, state = self._next_ready(busy)
+                node = busy.pop(handle)
+                self._switch(handle)
+                started = timeit.default_timer()
+                self.process(node, partial(self.read_tab, state=state))
+                self.sequential_time += state["load"]
+                self.sequential_time += timeit.default_timer() - started
+                visited += 1
+        finally:
+            for handle in handles[1:]:
+                self._switch(handle)
+                driver.close()
+            self._switch(main)
+        self._report(visited, timeit.default_timer() - starttime)
+
+    def read_tab(self, node: CrawlNode, state: dict) -> List[CrawlNode]:
+        if not state["committed"]:
+            raise NavigationNotCommitted(
+                f"Navigation to {node.url} did not replace the previous page"
+            )
+        return self.read(node)
+
+    def _switch(self, handle: str):
+        self.page.driver.switch_to.window(handle)
+        self.page.element_cache.clear()
+
+    def _next_ready(self, busy: Dict[str, CrawlNode]) -> Tuple[str, dict]:
+        deadline = timeit.default_timer() + LONG
+        while True:
+            for handle in busy:
+                self._switch(handle)
+                state = self.page.driver.execute_script(TAB_READY_SCRIPT)
+                if state["ready"]:
+                    return handle, state
+            if timeit.default_timer() >= deadline:
+                # a committed page that is still loading is left to the
+                # readiness wait in read() to report
+                return handle, state
+            time.sleep(POLL_FREQUENCY)
+
+    def _report(self, visited: int, elapsed: float):
+        speedup = self.sequential_time / elapsed if elapsed else 0.0
+        logger.info(
+            f"Walked {visited} nodes on {self.tabs} tabs in {elapsed:.2f} seconds, "
+            f"{self.sequential_time:.2f} seconds one at a time, "
+            f"speedup {speedup:.2f}x"
+        )
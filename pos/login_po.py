@@ -1,6 +1,9 @@
+from automation.locator import Locator
+
+
 class LoginPO:
     """Page Objects for Home Page"""
 
-    username_input = "xpath=//input[@id='user-name']"
-    password_input = "xpath=//input[@id='password']"
-    login_button = "xpath=//input[@type='submit']"
+    username_input = Locator("xpath=//input[@id='user-name']")
+    password_input = Locator("xpath=//input[@id='password']")
+    login_button = Locator("xpath=//input[@type='submit']")
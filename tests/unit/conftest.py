@@ -0,0 +1,21 @@
+"""Unit tests that need no browser.
+
+The browser fixtures of the root conftest are replaced with no-ops here.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="class", autouse=True)
+def test_setup():
+    yield None
+
+
+@pytest.fixture(autouse=True)
+def log_test_name():
+    yield True
+
+
+@pytest.fixture(scope="session", autouse=True)
+def export_metrics():
+    yield
@@ -0,0 +1,142 @@
+"""Unit tests for the asyncio WebDriver client against a stub driver"""
+
+import asyncio
+import json
+import timeit
+
+import pytest
+
+from automation.async_driver import AsyncWebDriver, HttpPool
+
+SESSIONS = 50
+TITLE_DELAY = 0.1
+
+
+class StubDriver:
+    """Answers a few WebDriver commands over keep-alive HTTP/1.1"""
+
+    def __init__(self):
+        self.sessions = 0
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+        self.connections = []
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/wd/hub"
+
+    async def stop(self):
+        self.server.close()
+        for writer in self.connections:
+            writer.close()
+
+    async def handle(self, reader, writer):
+        self.connections.append(writer)
+        try:
+            while True:
+                request_line = await reader.readuntil(b"\r\n")
+                headers = {}
+                while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length", 0)))
+                method, path, _ = request_line.decode().split()
+                self.requests.append((method, path))
+                value = await self.respond(method, path)
+                if value is DROP:
+                    writer.close()
+                    return
+                body = json.dumps({"value": value}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def respond(self, method, path):
+        parts = path.split("/")[3:]
+        if method == "POST" and parts == ["session"]:
+            self.sessions += 1
+            return {"sessionId": f"s{self.sessions}", "capabilities": {}}
+        if parts[-1] == "title":
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(TITLE_DELAY)
+            self.in_flight -= 1
+            return f"Title {parts[1]}"
+        if parts[-1] == "drop":
+            return DROP
+        return None
+
+
+DROP = object()
+
+
+def run_with_stub(scenario):
+    async def main():
+        stub = StubDriver()
+        url = await stub.start()
+        try:
+            return stub, await scenario(stub, url)
+        finally:
+            await stub.stop()
+
+    return asyncio.run(main())
+
+
+def test_drives_many_sessions_concurrently():
+    async def scenario(stub, url):
+        async def session():
+            driver = await AsyncWebDriver.start(url, {"browserName": "stub"})
+            titles = [await driver.title(), await driver.title()]
+            await driver.quit()
+            return titles
+
+        starttime = timeit.default_timer()
+        titles = await asyncio.gather(*(session() for _ in range(SESSIONS)))
+        return titles, timeit.default_timer() - starttime
+
+    stub, (titles, elapsed) = run_with_stub(scenario)
+    assert stub.sessions == SESSIONS
+    assert len({title for pair in titles for title in pair}) == SESSIONS
+    assert stub.peak == SESSIONS
+    assert elapsed < SESSIONS * TITLE_DELAY
+
+
+def test_reconnects_when_idle_connection_was_closed():
+    async def scenario(stub, url):
+        pool = HttpPool(url)
+        await pool.request("POST", "/session", {})
+        for writer in stub.connections:
+            writer.close()
+        await asyncio.sleep(0.05)
+        status, _ = await pool.request("POST", "/session/s1/url", {"url": "x"})
+        await pool.close()
+        return status
+
+    stub, status = run_with_stub(scenario)
+    assert status == 200
+    assert stub.requests.count(("POST", "/wd/hub/session/s1/url")) == 1
+
+
+def test_does_not_resend_commands_after_a_failure():
+    async def scenario(stub, url):
+        pool = HttpPool(url)
+        await pool.request("POST", "/session", {})
+        with pytest.raises((ConnectionError, asyncio.IncompleteReadError)):
+            await pool.request("POST", "/session/s1/drop", {})
+        await pool.close()
+
+    stub, _ = run_with_stub(scenario)
+    assert stub.requests.count(("POST", "/wd/hub/session/s1/drop")) == 1
+
+
+def test_rejects_https_endpoints():
+    with pytest.raises(ValueError):
+        HttpPool("https://hub.example.com/wd/hub")
@@ -0,0 +1,43 @@
+"""Unit tests for batched reads"""
+
+import pytest
+from selenium.webdriver.remote.webelement import WebElement
+
+from automation import batch as batched
+from automation.batch import Batch
+from automation.error import ElementNotFoundException
+
+
+class FakeDriver:
+    def __init__(self, results):
+        self.results = results
+        self.operations = None
+
+    def execute_script(self, script, operations):
+        self.operations = operations
+        return self.results
+
+
+def test_queues_elements_and_locators():
+    element = WebElement(None, "element-1")
+    driver = FakeDriver([{"value": "text"}, {"missing": True}, {"value": 3}])
+    batch = Batch(driver)
+    text = batch.queue(batched.PROPERTY, element, "text")
+    missing = batch.queue(batched.PROPERTY, ("xpath", "//a"), "href")
+    count = batch.queue(batched.COUNT, ("css selector", "li"))
+    batch.flush()
+    assert driver.operations[0]["by"] == "element"
+    assert driver.operations[0]["value"] is element
+    assert driver.operations[1]["value"] == "//a"
+    assert text.result() == "text"
+    assert count.result() == 3
+    with pytest.raises(ElementNotFoundException):
+        missing.result()
+
+
+def test_cancel_fails_the_queued_reads():
+    batch = Batch(FakeDriver([]))
+    future = batch.queue(batched.TITLE)
+    batch.cancel()
+    with pytest.raises(RuntimeError):
+        future.result()
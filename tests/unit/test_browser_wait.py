@@ -0,0 +1,37 @@
+"""Unit tests for the error handling of browser-side waits"""
+
+import pytest
+from selenium.common.exceptions import JavascriptException
+
+from automation.browser_wait import (
+    ELEMENT_PRESENT,
+    BrowserWait,
+    BrowserWaitUnavailable,
+)
+
+
+class RaisingDriver:
+    def __init__(self, message):
+        self.message = message
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_async_script(self, script, *args):
+        raise JavascriptException(self.message)
+
+
+def test_script_errors_propagate():
+    wait = BrowserWait(
+        RaisingDriver("SyntaxError: not a valid XPath expression")
+    )
+    with pytest.raises(JavascriptException):
+        wait.until(ELEMENT_PRESENT, ("xpath", "//a["), timeout=1)
+
+
+def test_navigation_makes_the_wait_unavailable():
+    wait = BrowserWait(
+        RaisingDriver("document unloaded while waiting for result")
+    )
+    with pytest.raises(BrowserWaitUnavailable):
+        wait.until(ELEMENT_PRESENT, ("xpath", "//a"), timeout=1)
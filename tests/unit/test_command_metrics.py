@@ -0,0 +1,68 @@
+"""Unit tests for WebDriver command metrics"""
+
+from types import SimpleNamespace
+
+from automation.command_metrics import BUCKETS, CommandRecorder, Histogram
+from automation.selenium_base import SeleniumBase
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram()
+    for duration in (0.001, 0.02, 0.02, 99.0):
+        histogram.observe(duration, success=duration < 1)
+    buckets = dict(histogram.cumulative())
+    assert buckets[BUCKETS[0]] == 1
+    assert buckets[0.025] == 3
+    assert buckets[float("inf")] == 4
+    assert histogram.failures == 1
+    assert histogram.to_dict()["buckets"]["+Inf"] == 4
+
+
+def test_prometheus_output():
+    recorder = CommandRecorder()
+    recorder.current_test = 'TEST_"QUOTED"'
+    recorder.record("findElement", 0.03, True)
+    recorder.record("findElement", 0.2, False)
+    text = recorder.to_prometheus()
+    lines = text.splitlines()
+    assert "# TYPE pyselenium_webdriver_command_seconds histogram" in lines
+    assert (
+        "pyselenium_webdriver_command_seconds_bucket"
+        '{scope="run",command="findElement",le="0.05"} 1'
+    ) in lines
+    assert (
+        "pyselenium_webdriver_command_seconds_count"
+        '{scope="run",command="findElement"} 2'
+    ) in lines
+    assert (
+        "pyselenium_webdriver_command_failures_total"
+        '{scope="TEST_\\"QUOTED\\"",command="findElement"} 1'
+    ) in lines
+    assert text.endswith("\n")
+
+
+class FakePage(SeleniumBase):
+    def __init__(self, driver):
+        self.driver = driver
+
+    def walk(self):
+        self.click_item("id=item")
+
+    def click_item(self, locator):
+        self._send()
+
+    def _send(self):
+        self.driver.command_executor.execute("clickElement", {})
+
+
+def test_commands_are_attributed_to_the_innermost_public_method():
+    executor = SimpleNamespace(execute=lambda command, params: {"value": None})
+    recorder = CommandRecorder()
+    page = FakePage(
+        recorder.instrument(SimpleNamespace(command_executor=executor))
+    )
+    page.walk()
+    record = recorder.records[-1]
+    assert record.caller == "FakePage.click_item"
+    assert record.locator == "id=item"
+    assert record.success
@@ -0,0 +1,155 @@
+"""Unit tests for the crawl checkpoint and resuming a tree crawl"""
+
+import sqlite3
+from functools import partial
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from pages import tree_crawler
+from pages.crawl_checkpoint import CrawlCheckpoint
+from pages.tree_crawler import CrawlNode, TreeCrawler
+
+TREE = {"u/a": ["u/a1", "u/a2"], "u/b": ["u/b1"]}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "checkpoint.sqlite3")
+
+
+def node(url, depth=0):
+    return CrawlNode(url, "Dept", "Cat", url, depth)
+
+
+def test_resumes_seeded_crawl(path):
+    checkpoint = CrawlCheckpoint("crawl", path)
+    assert not checkpoint.start()
+    checkpoint.seed([node("u/a"), node("u/b")])
+    done = node("u/a")
+    done.result = {"result": "pass"}
+    checkpoint.done(done)
+    checkpoint.queued(node("u/a1", 1))
+    checkpoint.close()
+
+    resumed = CrawlCheckpoint("crawl", path)
+    assert resumed.start()
+    frontier, visited = resumed.load()
+    assert [n.url for n in frontier] == ["u/b", "u/a1"]
+    assert visited == {"u/a", "u/b", "u/a1"}
+    resumed.complete()
+    assert not resumed.start()
+
+
+def test_crawl_without_nodes_is_not_started(path):
+    db = sqlite3.connect(path)
+    CrawlCheckpoint("crawl", path).close()
+    db.execute("INSERT INTO crawls (crawl, completed) VALUES ('crawl', 0)")
+    db.commit()
+    assert not CrawlCheckpoint("crawl", path).start()
+
+
+def test_seed_is_one_transaction(path):
+    checkpoint = CrawlCheckpoint("crawl", path)
+    unstorable = CrawlNode("u/b", "Dept", "Cat", "u/b", depth=object())
+    with pytest.raises(sqlite3.Error):
+        checkpoint.seed([node("u/a"), unstorable])
+    db = sqlite3.connect(path)
+    assert db.execute("SELECT COUNT(*) FROM crawls").fetchone()[0] == 0
+    assert db.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 0
+
+
+def test_failed_nodes_are_requeued_then_quarantined(path):
+    checkpoint = CrawlCheckpoint("crawl", path, max_attempts=2)
+    checkpoint.seed([node("u/a"), node("u/b")])
+    assert not checkpoint.failed(node("u/a"), ValueError("once"))
+    frontier, _ = checkpoint.load()
+    assert [n.url for n in frontier] == ["u/b", "u/a"]
+    assert checkpoint.failed(node("u/a"), ValueError("twice"))
+    frontier, visited = checkpoint.load()
+    assert [n.url for n in frontier] == ["u/b"]
+    assert "u/a" in visited
+
+
+def test_crawls_do_not_share_rows(path):
+    first = CrawlCheckpoint("test_walk_set1[9]|dept 9", path)
+    second = CrawlCheckpoint("test_walk_set_2[9]|dept 9", path)
+    first.seed([node("u/a")])
+    second.seed([node("u/b")])
+    second.complete()
+    assert first.start()
+    assert [n.url for n in first.load()[0]] == ["u/a"]
+
+
+class FakePage:
+    nodes_walked = 0
+    driver = None
+
+    def __init__(self, crash_at=None):
+        self.url = None
+        self.crash_at = crash_at
+        self.checked = []
+
+    def go_to(self, url):
+        if url == self.crash_at:
+            raise KeyboardInterrupt
+        self.url = url
+
+    def is_dept_index_greater_than_total_depts(self, index):
+        return False
+
+    def walk_department(self, index):
+        return "Dept"
+
+    def get_elements_properties(self, locator, properties):
+        return [{"href": "u/a", "text": "A"}, {"href": "u/b", "text": "B"}]
+
+    def wait_until_page_is_completely_loaded(self):
+        if self.url == "u/b1":
+            raise StaleElementReferenceException("stale")
+
+    def handle_cookie(self):
+        return True
+
+    def get_breadcrumbs(self):
+        return [self.url]
+
+    def get_category_list(self):
+        return []
+
+    def _process_walk_node_result(self, result, screenshot=True):
+        self.checked.append(self.url)
+        return "pass"
+
+    def get_sub_node_links(self):
+        return [{"href": url, "text": url} for url in TREE.get(self.url, [])]
+
+
+def test_tree_crawl_resumes_for_the_same_test_only(path, monkeypatch):
+    monkeypatch.setattr(
+        tree_crawler, "CrawlCheckpoint", partial(CrawlCheckpoint, path=path)
+    )
+    monkeypatch.setattr(
+        tree_crawler.network_policy, "collect", lambda driver: None
+    )
+    monkeypatch.setenv(
+        "PYTEST_CURRENT_TEST", "test_walk.py::test_walk_set1[9] (call)"
+    )
+    crashed = FakePage(crash_at="u/a2")
+    with pytest.raises(KeyboardInterrupt):
+        TreeCrawler(crashed).crawl(9)
+    assert crashed.checked == ["u/a1"]
+
+    monkeypatch.setenv(
+        "PYTEST_CURRENT_TEST", "test_walk.py::test_walk_set_2[9] (call)"
+    )
+    other = FakePage()
+    TreeCrawler(other).crawl(9)
+    assert other.checked == ["u/a1", "u/a2"]
+
+    monkeypatch.setenv(
+        "PYTEST_CURRENT_TEST", "test_walk.py::test_walk_set1[9] (call)"
+    )
+    resumed = FakePage()
+    TreeCrawler(resumed).crawl(9)
+    assert resumed.checked == ["u/a2"]
@@ -0,0 +1,75 @@
+"""Unit tests for test durations and shards"""
+
+import json
+
+from automation.durations import (
+    SMOOTHING,
+    DurationStore,
+    hash_shards,
+    lpt_shards,
+    makespan_report,
+)
+from config.config import DEFAULT_TEST_DURATION
+
+
+def make_store(tmp_path, durations):
+    path = tmp_path / "durations.json"
+    path.write_text(
+        json.dumps(
+            {k: {"duration": v, "runs": 1} for k, v in durations.items()}
+        )
+    )
+    return DurationStore(str(path))
+
+
+def test_estimate_falls_back_to_median_then_default(tmp_path):
+    assert DurationStore(str(tmp_path / "missing.json")).estimate("a") == (
+        DEFAULT_TEST_DURATION
+    )
+    store = make_store(tmp_path, {"a": 1.0, "b": 2.0, "c": 9.0})
+    assert store.estimate("c") == 9.0
+    assert store.estimate("unknown") == 2.0
+
+
+def test_save_merges_a_moving_average(tmp_path):
+    store = make_store(tmp_path, {"a": 10.0})
+    other = DurationStore(store.path)
+    store.record("a", 20.0)
+    other.record("b", 3.0)
+    store.save()
+    other.save()
+    saved = json.loads(open(store.path).read())
+    assert saved["a"] == {"duration": 10.0 + SMOOTHING * 10.0, "runs": 2}
+    assert saved["b"] == {"duration": 3.0, "runs": 1}
+
+
+def test_lpt_shards_balance_slowest_first(tmp_path):
+    store = make_store(
+        tmp_path, {"a": 8.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0}
+    )
+    shards = lpt_shards(["e", "d", "c", "b", "a"], store, 2)
+    assert [shard.nodeids for shard in shards] == [["a", "d"], ["b", "c", "e"]]
+    assert [shard.predicted for shard in shards] == [11.0, 10.0]
+
+
+def test_hash_shards_do_not_depend_on_durations_or_order(tmp_path):
+    nodeids = [f"test_{i}" for i in range(40)]
+    local = hash_shards(nodeids, make_store(tmp_path, {"test_1": 99.0}), 4)
+    other = hash_shards(list(reversed(nodeids)), DurationStore(""), 4)
+    assert [s.nodeids for s in local] == [s.nodeids for s in other]
+    assert sorted(n for s in local for n in s.nodeids) == sorted(nodeids)
+
+
+def test_makespan_report_compares_each_shard(tmp_path):
+    store = make_store(tmp_path, {"a": 4.0, "b": 2.0})
+    shards = lpt_shards(["a", "b"], store, 2)
+    report = makespan_report(shards, {0: 5.0, 1: 1.5}, planned=4.0)
+    assert report["predicted_makespan"] == 4.0
+    assert report["actual_makespan"] == 5.0
+    assert report["planned_makespan"] == 4.0
+    assert report["shards"][1] == {
+        "index": 1,
+        "tests": 1,
+        "predicted": 2.0,
+        "actual": 1.5,
+    }
@@ -0,0 +1,106 @@
+"""Unit tests for the per-generation element cache"""
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from automation.element_cache import ElementCache
+from automation.element_resolver import (
+    RESOLVE_SCRIPT,
+    TEXT_READ_SCRIPT,
+    ElementResolver,
+    ResolvedElement,
+)
+
+GENERATION = ["doc", 0]
+
+
+class FakeDriver:
+    """Answers scripts like a page whose DOM never changes"""
+
+    def __init__(self, ready=True):
+        self.calls = []
+        self.ready = ready
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        if script is RESOLVE_SCRIPT:
+            reused = len(args) > 3 and args[4] == GENERATION
+            match = {
+                "element": "el",
+                "visible": True,
+                "enabled": True,
+                "rect": {},
+            }
+            return {
+                "generation": GENERATION,
+                "reused": reused,
+                "matches": [match],
+            }
+        if args[0] == GENERATION:
+            return {"generation": GENERATION, "hit": True}
+        return {
+            "generation": GENERATION,
+            "hit": False,
+            "ready": self.ready,
+            "value": "text" if self.ready else None,
+        }
+
+
+def test_memoize_reads_in_one_call():
+    driver = FakeDriver()
+    cache = ElementCache(driver)
+    args = ("xpath", "//a")
+    assert cache.memoize("text", "a", TEXT_READ_SCRIPT, args, None) == "text"
+    assert cache.memoize("text", "a", TEXT_READ_SCRIPT, args, None) == "text"
+    assert len(driver.calls) == 2
+    assert driver.calls[1][1][0] == GENERATION
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_memoize_falls_back_to_loader():
+    driver = FakeDriver(ready=False)
+    cache = ElementCache(driver)
+    value = cache.memoize("text", "a", TEXT_READ_SCRIPT, (), lambda: "loaded")
+    assert value == "loaded"
+    assert len(driver.calls) == 1
+
+
+def test_cached_element_is_checked_in_the_resolve_call():
+    driver = FakeDriver()
+    cache = ElementCache(driver)
+    resolver = ElementResolver(driver)
+    for _ in range(2):
+        resolved = resolver.wait_for(
+            ("xpath", "//a"), 1, cached=cache.get_element("a")
+        )[0]
+        cache.put_element("a", resolved)
+    assert len(driver.calls) == 2
+    assert resolved.reused
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_are_bounded():
+    cache = ElementCache(FakeDriver(), max_entries=2)
+    for name in "abc":
+        cache.memoize("text", name, TEXT_READ_SCRIPT, (), None)
+    assert cache.get_element("a") is None
+    assert len(cache._entries) == 2
+
+
+class StaleDriver(FakeDriver):
+    """Rejects the cached element like a driver after the DOM replaced it"""
+
+    def execute_script(self, script, *args):
+        if len(args) > 3 and args[3] == "old":
+            self.calls.append((script, args))
+            raise StaleElementReferenceException("stale element reference")
+        return super().execute_script(script, *args)
+
+
+def test_stale_cached_element_is_resolved_again():
+    driver = StaleDriver()
+    resolver = ElementResolver(driver)
+    stale = ResolvedElement("old", True, generation=("doc", 0))
+    resolved = resolver.wait_for(("xpath", "//a"), 1, cached=stale)
+    assert resolved[0].element == "el"
+    assert not resolved[0].reused
+    assert len(driver.calls) == 2
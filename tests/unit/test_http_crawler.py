@@ -0,0 +1,170 @@
+"""Unit tests for the HTTP tree crawl against a fixture server"""
+
+import threading
+from concurrent.futures import Future
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from automation.error import PageException
+from pages import tree_crawler
+from pages.crawl_checkpoint import CrawlCheckpoint
+from pages.http_crawler import HttpTreeCrawler, parse_node
+from pages.tree_crawler import CrawlNode
+
+
+def node_page(breadcrumb, categories, links):
+    crumbs = "".join(f'<a href="/">\n  {text}  </a>' for text in breadcrumb)
+    items = "".join(f"<li><a href='#'>{text}</a></li>" for text in categories)
+    subs = "".join(f"<a href='{href}'>{text}</a>" for href, text in links)
+    return (
+        f"<html><body><div class='breadcrumbs top'>{crumbs}</div>"
+        "<div class='transition-horizontal-module_slide x'>"
+        f"<div>All Categories</div><ul>{items}</ul>"
+        "<script>var hidden = 1;</script></div>"
+        f"<div class='list-item sub'>{subs}</div></body></html>"
+    )
+
+
+PAGES = {
+    "/a": node_page(
+        ["Home", "A"], [], [("/a/1", "A 1"), ("/a/empty", "Empty")]
+    ),
+    "/a/1": node_page(
+        ["Home", "A", "A 1"], ["A", "A <b>1</b>"], [("/a/js", "JS")]
+    ),
+    "/a/empty": "",
+    "/a/js": "<html><body><div id='app'></div></body></html>",
+}
+
+
+class FixtureSite(BaseHTTPRequestHandler):
+    requested = []
+
+    def do_GET(self):
+        self.requested.append(self.path)
+        body = PAGES.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureSite)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FixtureSite.requested = []
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_node_reads_text_like_inner_text():
+    fetched = parse_node(PAGES["/a/1"].encode(), "http://site/a/1")
+    assert [" ".join(text.split()) for text in fetched.breadcrumb] == [
+        "Home",
+        "A",
+        "A 1",
+    ]
+    lines = [line.strip() for line in fetched.categories if line.strip()]
+    assert lines == ["All Categories", "A", "A 1"]
+    assert fetched.links == [{"href": "http://site/a/js", "text": "JS"}]
+
+
+def test_parse_node_without_breadcrumbs_returns_none():
+    assert parse_node(PAGES["/a/js"].encode(), "http://site/a/js") is None
+
+
+def test_parse_node_reads_pages_with_an_xml_declaration():
+    page = '<?xml version="1.0" encoding="utf-8"?>' + node_page(
+        ["Home", "Café"], [], []
+    )
+    fetched = parse_node(page.encode(), "http://site/cafe")
+    assert [text.strip() for text in fetched.breadcrumb] == ["Home", "Café"]
+
+
+class Driver:
+    def execute_script(self, script):
+        return "fixture-agent"
+
+    def get_cookies(self):
+        return [{"name": "session", "value": "1", "path": "/"}]
+
+
+class FakePage:
+    nodes_walked = 0
+
+    def __init__(self):
+        self.driver = Driver()
+        self.opened = []
+        self.results = []
+
+    def go_to(self, url):
+        self.opened.append(url)
+
+    def wait_until_page_is_completely_loaded(self):
+        pass
+
+    def get_breadcrumbs(self):
+        return ["Home", "A", "A 1", "JS"]
+
+    def get_category_list(self):
+        return ["A 1", "JS"]
+
+    def get_sub_node_links(self):
+        return []
+
+    def _process_walk_node_result(self, result, screenshot=True):
+        self.results.append(result)
+        return "pass"
+
+
+def test_crawls_over_http_with_browser_fallback(site, tmp_path, monkeypatch):
+    path = str(tmp_path / "checkpoint.sqlite3")
+    checkpoint = partial(CrawlCheckpoint, path=path, max_attempts=1)
+    monkeypatch.setattr(tree_crawler, "CrawlCheckpoint", checkpoint)
+    monkeypatch.setattr(
+        tree_crawler.network_policy, "collect", lambda driver: None
+    )
+    page = FakePage()
+    crawler = HttpTreeCrawler(page, workers=2)
+    crawler.checkpoint = tree_crawler.CrawlCheckpoint("fixture")
+    crawler.checkpoint.seed([])
+    crawler.enqueue(CrawlNode(f"{site}/a", "Dept", "A", "A"))
+    crawler.walk()
+
+    assert sorted(FixtureSite.requested) == ["/a", "/a/1", "/a/empty", "/a/js"]
+    # the JavaScript rendered page is opened in the browser
+    assert page.opened == [f"{site}/a/js"]
+    assert crawler.fallbacks == 1
+    # both paths hand check() the same normalised lines
+    by_node = {result[2][-1]: result for result in page.results}
+    assert by_node["A 1"][2:] == [["Home", "A", "A 1"], ["A", "A 1"]]
+    assert by_node["JS"][2:] == [["Home", "A", "A 1", "JS"], ["A 1", "JS"]]
+    # the empty page failed as a node instead of stopping the crawl
+    quarantined = crawler.checkpoint._db.execute(
+        "SELECT url, error FROM nodes WHERE state = 'quarantined'"
+    ).fetchall()
+    assert [url for url, _ in quarantined] == [f"{site}/a/empty"]
+    assert "Could not parse" in quarantined[0][1]
+    crawler.checkpoint.close()
+
+
+def test_unexpected_parse_error_fails_the_node():
+    future = Future()
+    future.set_exception(ValueError("unexpected"))
+    crawler = HttpTreeCrawler(FakePage())
+    with pytest.raises(PageException, match="Could not parse"):
+        crawler.read_fetched(
+            CrawlNode("http://site/a", "Dept", "A", "A"), future
+        )
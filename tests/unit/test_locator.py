@@ -0,0 +1,49 @@
+"""Unit tests for locator parsing"""
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from automation.error import NotValidLocatorException
+from automation.locator import Locator, parse_locator
+
+
+@pytest.mark.parametrize(
+    "raw, by, value",
+    [
+        ("//div[@id='a']", By.XPATH, "//div[@id='a']"),
+        ("css=div.a > span", By.CSS_SELECTOR, "div.a > span"),
+        ("id:login", By.ID, "login"),
+        ("  name = user ", By.NAME, "user"),
+        ("x=//a", By.XPATH, "//a"),
+        ("link_text=Sign in", By.LINK_TEXT, "Sign in"),
+        ("unknown=value", By.XPATH, "unknown=value"),
+        ("//a[@href='x']//self::a", By.XPATH, "//a[@href='x']//self::a"),
+    ],
+)
+def test_strategies(raw, by, value):
+    locator = Locator(raw)
+    assert locator.as_tuple() == (by, value)
+    assert tuple(locator) == (by, value)
+    assert str(locator) == raw
+
+
+def test_axis_is_not_a_strategy():
+    assert Locator("ancestor::div").by == By.XPATH
+
+
+def test_empty_value_is_rejected():
+    with pytest.raises(NotValidLocatorException):
+        Locator("css=  ")
+
+
+def test_equality_and_hash():
+    assert Locator("id=a") == Locator("id: a")
+    assert len({Locator("id=a"), Locator("id: a")}) == 1
+    assert Locator("id=a") != Locator("name=a")
+
+
+def test_parse_locator_is_cached():
+    parse_locator.cache_clear()
+    first = parse_locator("css=.cached")
+    assert parse_locator("css=.cached") is first
+    assert parse_locator.cache_info().hits == 1
@@ -0,0 +1,64 @@
+"""Unit tests for reading blocked requests from the performance log"""
+
+import json
+
+from automation.network_policy import NetworkPolicy
+
+
+def event(method, **params):
+    return {
+        "message": json.dumps({"message": {"method": method, "params": params}})
+    }
+
+
+class FakeDriver:
+    name = "chrome"
+    session_id = "session-1"
+
+    def __init__(self):
+        self.logs = []
+
+    def execute_cdp_cmd(self, command, params):
+        return {}
+
+    def get_log(self, kind):
+        logs, self.logs = self.logs, []
+        return logs
+
+
+def test_collect_attributes_requests_to_pages():
+    driver = FakeDriver()
+    policy = NetworkPolicy(block=["*ads*"], stubs={})
+    policy.apply(driver)
+    page = "https://shop/a"
+    driver.logs = [
+        event(
+            "Network.requestWillBeSent",
+            requestId="1",
+            documentURL=page,
+            request={"url": "https://ads/x.js"},
+        ),
+        event(
+            "Network.loadingFailed", requestId="1", blockedReason="inspector"
+        ),
+        event(
+            "Network.requestWillBeSent",
+            requestId="2",
+            documentURL=page,
+            request={"url": "https://shop/app.js"},
+        ),
+        event("Network.loadingFinished", requestId="2", encodedDataLength=1200),
+    ]
+    policy.collect(driver)
+    report = policy.report()
+    assert report["blocked"] == 1
+    assert report["bytes_loaded"] == 1200
+    assert report["pages"][page]["urls"] == {"https://ads/x.js": 1}
+    assert not driver.logs
+
+
+def test_collect_skips_sessions_without_the_policy():
+    driver = FakeDriver()
+    driver.logs = [event("Network.loadingFailed", requestId="1")]
+    NetworkPolicy().collect(driver)
+    assert driver.logs
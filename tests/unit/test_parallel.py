@@ -0,0 +1,42 @@
+"""Unit tests for the parallel work queue"""
+
+from automation.durations import Shard
+from automation.parallel import WorkQueue
+
+
+def make_queue():
+    return WorkQueue([Shard(0, ["a", "b"]), Shard(1, ["c", "d", "e"])])
+
+
+def test_takes_own_shard_then_steals_from_the_back():
+    work = make_queue()
+    assert [work.take(0), work.take(0)] == ["a", "b"]
+    assert work.take(0) == "e"
+    assert work.stolen == 1
+    assert [work.take(1), work.take(1), work.take(1)] == ["c", "d", None]
+
+
+def test_unfinished_returns_taken_but_not_completed_ids():
+    work = make_queue()
+    current, prefetched = work.take(1), work.take(1)
+    work.take(0)
+    work.complete(0, "a")
+    assert work.unfinished(1) == [current, prefetched]
+    assert work.unfinished(1) == []
+    assert work.unfinished(0) == []
+
+
+def test_completed_ids_are_kept_per_worker():
+    work = make_queue()
+    work.take(0)
+    work.complete(0, "a")
+    work.complete(1, "c")
+    assert work.completed == {0: ["a"], 1: ["c"]}
+
+
+def test_remaining_drains_ids_no_worker_took():
+    work = make_queue()
+    work.take(0)
+    assert work.remaining() == ["b", "c", "d", "e"]
+    assert work.remaining() == []
+    assert work.take(1) is None
@@ -0,0 +1,72 @@
+"""Unit tests for the pooled hub connection against a stub hub"""
+
+import json
+import threading
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from selenium.webdriver.remote.command import Command
+
+from automation.remote_connection import PooledRemoteConnection
+
+
+class StubHub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.requests.append(("POST", self.path))
+        self.reply({"sessionId": "s1", "capabilities": {}})
+
+    def do_GET(self):
+        self.requests.append(("GET", self.path))
+        self.reply("Stub title")
+
+    def reply(self, value):
+        body = json.dumps({"value": value}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def hub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubHub.requests = []
+    yield f"http://127.0.0.1:{server.server_address[1]}/wd/hub"
+    server.shutdown()
+    server.server_close()
+
+
+def test_sessions_share_one_pool_manager(hub):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        first = PooledRemoteConnection(hub)
+        second = PooledRemoteConnection(hub)
+    assert first._conn is second._conn
+    assert first.execute(Command.NEW_SESSION, {"capabilities": {}})[
+        "value"
+    ] == {
+        "sessionId": "s1",
+        "capabilities": {},
+    }
+    for connection in (first, second):
+        response = connection.execute(Command.GET_TITLE, {"sessionId": "s1"})
+        assert response["value"] == "Stub title"
+    assert StubHub.requests == [
+        ("POST", "/wd/hub/session"),
+        ("GET", "/wd/hub/session/s1/title"),
+        ("GET", "/wd/hub/session/s1/title"),
+    ]
+    # keep-alive: the three requests went over the pooled connection
+    latencies = list(first.stats.connections.values())
+    assert sum(latency.requests for latency in latencies) == 3
+    assert len(latencies) == 1
@@ -0,0 +1,78 @@
+"""Unit tests for the buffered result sink"""
+
+import json
+import multiprocessing
+import sqlite3
+
+from automation.result_sink import ResultSink
+
+
+def read_lines(path):
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def test_writes_jsonl_and_summary(tmp_path):
+    sink = ResultSink(
+        str(tmp_path / "results.jsonl"),
+        str(tmp_path / "summary.log"),
+        batch_size=2,
+        flush_interval=0.05,
+    )
+    sink.write("first", node=1)
+    sink.write(node=2)
+    sink.write("third", node=3, result="fail")
+    sink.close()
+    records = [json.loads(line) for line in read_lines(sink.path)]
+    assert [record["node"] for record in records] == [1, 2, 3]
+    assert records[2]["result"] == "fail"
+    assert {"time", "pid"} <= set(records[0])
+    summary = read_lines(sink.summary_path)
+    assert [line.split("|", 1)[1] for line in summary] == ["first", "third"]
+    assert sink.written == 3
+
+
+def test_writes_sqlite(tmp_path):
+    sink = ResultSink(
+        str(tmp_path / "results.sqlite3"), None, flush_interval=0.05
+    )
+    for node in range(5):
+        sink.write(f"node {node}", node=node)
+    sink.close()
+    rows = (
+        sqlite3.connect(sink.path)
+        .execute("SELECT message, record FROM results")
+        .fetchall()
+    )
+    assert [message for message, _ in rows] == [f"node {n}" for n in range(5)]
+    assert json.loads(rows[4][1])["node"] == 4
+
+
+def test_close_without_writes_is_a_no_op(tmp_path):
+    sink = ResultSink(str(tmp_path / "results.jsonl"), None)
+    sink.close()
+    assert not (tmp_path / "results.jsonl").exists()
+
+
+def _write_records(path, worker, count):
+    sink = ResultSink(path, None, batch_size=7, flush_interval=0.01)
+    for node in range(count):
+        sink.write(worker=worker, node=node, padding="x" * 500)
+    sink.close()
+
+
+def test_processes_share_a_file_without_interleaving(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    processes = [
+        multiprocessing.Process(target=_write_records, args=(path, worker, 200))
+        for worker in range(3)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    records = [json.loads(line) for line in read_lines(path)]
+    assert len(records) == 600
+    for worker in range(3):
+        nodes = [r["node"] for r in records if r["worker"] == worker]
+        assert nodes == list(range(200))
@@ -0,0 +1,47 @@
+"""Unit tests for the screenshot pipeline"""
+
+import base64
+
+from automation.screenshot_pipeline import ScreenshotPipeline
+
+PAGE = base64.b64encode(b"same page").decode()
+
+
+class Driver:
+    def get_screenshot_as_base64(self):
+        return PAGE
+
+
+def capture(pipeline, tmp_path, name, **kwargs):
+    pipeline.capture(Driver(), str(tmp_path / f"{name}.png"), **kwargs)
+
+
+def test_dedupes_only_captures_with_the_same_key(tmp_path):
+    pipeline = ScreenshotPipeline(policy="always")
+    capture(pipeline, tmp_path, "first", key="node 1")
+    capture(pipeline, tmp_path, "again", key="node 1")
+    capture(pipeline, tmp_path, "other", key="node 2")
+    capture(pipeline, tmp_path, "unkeyed")
+    pipeline.close()
+    assert pipeline.written == 3
+    assert pipeline.duplicates == 1
+    written = {path.name for path in tmp_path.iterdir()}
+    assert written == {"first.png", "other.png", "unkeyed.png"}
+
+
+def test_never_dedupes_failures(tmp_path):
+    pipeline = ScreenshotPipeline(policy="failure")
+    capture(pipeline, tmp_path, "pass", key="node 1")
+    capture(pipeline, tmp_path, "fail", key="node 1", failed=True)
+    capture(pipeline, tmp_path, "fail_again", key="node 1", failed=True)
+    pipeline.close()
+    assert pipeline.written == 3
+    assert pipeline.duplicates == 0
+
+
+def test_policies():
+    assert ScreenshotPipeline(policy="failure").wanted(True)
+    assert not ScreenshotPipeline(policy="failure").wanted(False)
+    assert ScreenshotPipeline(policy="failure").wanted(None)
+    assert ScreenshotPipeline(policy="always").wanted(False)
+    assert not ScreenshotPipeline(policy="sampled", sample_rate=0).wanted(False)
@@ -1,8 +1,8 @@
-import pandas as pd
-
 from utils.file import FileUtils
 
 
 class CSV(FileUtils):
     def read(self, path, sheetname=None):
+        import pandas as pd
+
         return pd.read_csv(filepath_or_buffer=path)
@@ -1,7 +1,6 @@
-from sqlalchemy import create_engine
-import pandas as pd
-
-
 def get_data_for_query(sql, connection_string):
+    import pandas as pd
+    from sqlalchemy import create_engine
+
     engine = create_engine(connection_string)
     return pd.read_sql(sql, con=engine)
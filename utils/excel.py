@@ -1,7 +1,8 @@
-import pandas as pd
 from utils.file import FileUtils
 
 
 class Excel(FileUtils):
     def read(self, path, sheetname=None):
+        import pandas as pd
+
         return pd.read_excel(filepath=path, sheet_name=sheetname)
@@ -0,0 +1,115 @@
+"""Page load benchmark of the default and the lean Chrome profile.
+
+Loads the same URLs with the ``chrome`` and ``chrome-lean`` browser
+strategies, a fresh browser per run so every load starts with a cold cache,
+and compares the times and bytes the browser measured for each page.
+
+    python -m utils.profile_benchmark --runs 3 https://www.takealot.com/
+
+Without URLs it loads ``BASE_URL``.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import timeit
+from typing import Dict, List
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from automation.browser_strategy import Chrome, LeanChrome
+from config.config import BASE_URL
+
+PROFILES = {"chrome": Chrome, "chrome-lean": LeanChrome}
+REPORT_PATH = "./logs/profile_benchmark.json"
+LOAD_TIMEOUT = 60
+
+# Navigation timing of the current document, in ms from navigation start,
+# and the bytes transferred for it and its resources.
+TIMING_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var bytes = performance.getEntriesByType('resource').reduce(
+    function (total, entry) { return total + entry.transferSize; },
+    nav.transferSize);
+return {
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+    load_ms: nav.loadEventEnd,
+    bytes: bytes
+};
+"""
+
+
+def measure(profile: str, url: str) -> dict:
+    driver = PROFILES[profile]().start()
+    if driver is None:
+        raise SystemExit(f"Could not start the {profile} browser")
+    try:
+        starttime = timeit.default_timer()
+        driver.get(url)
+        # the full load, whatever PAGE_LOAD_STRATEGY and PAGE_READINESS are
+        WebDriverWait(driver, LOAD_TIMEOUT).until(
+            lambda wd: wd.execute_script(
+                "return document.readyState === 'complete' "
+                "&& performance.getEntriesByType('navigation')[0]"
+                ".loadEventEnd > 0"
+            )
+        )
+        timing = driver.execute_script(TIMING_SCRIPT)
+        timing["wall_ms"] = (timeit.default_timer() - starttime) * 1000
+        return timing
+    finally:
+        driver.quit()
+
+
+def summarize(samples: List[dict]) -> Dict[str, float]:
+    return {
+        name: statistics.median(sample[name] for sample in samples)
+        for name in ("dom_content_loaded_ms", "load_ms", "wall_ms", "bytes")
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="*", default=[BASE_URL])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    report = {}
+    for url in args.urls:
+        report[url] = {
+            profile: summarize(
+                [measure(profile, url) for _ in range(args.runs)]
+            )
+            for profile in PROFILES
+        }
+
+    print(
+        f"{'profile':<12} {'DOMContentLoaded':>17} {'load':>9} "
+        f"{'wall':>9} {'KB':>9}  url"
+    )
+    for url, profiles in report.items():
+        for profile, median in profiles.items():
+            print(
+                f"{profile:<12} {median['dom_content_loaded_ms']:>15.0f}ms "
+                f"{median['load_ms']:>7.0f}ms {median['wall_ms']:>7.0f}ms "
+                f"{median['bytes'] / 1024:>9.0f}  {url}"
+            )
+        default, lean = profiles["chrome"], profiles["chrome-lean"]
+        if lean["load_ms"]:
+            speedup = default["load_ms"] / lean["load_ms"]
+            saved = 1 - lean["bytes"] / max(default["bytes"], 1)
+            print(
+                f"{'':<12} lean loads {speedup:.2f}x faster, "
+                f"{saved:.0%} fewer bytes"
+            )
+
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump({"runs": args.runs, "pages": report}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,12 @@
 
 from dataclasses import dataclass
 import logging as logger
-from typing import Optional
-from lxml import html
-from lxml.html import HtmlElement
+from typing import TYPE_CHECKING, Optional
 from utils.common import generate_random_string
 
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+
 
 @dataclass
 class Script:
@@ -15,7 +16,7 @@ class Script:
     element_count: int
     xpath: str
     variable_name: Optional[str] = ""
-    element: Optional[HtmlElement] = None
+    element: Optional["HtmlElement"] = None
     action: Optional[str] = ""
     sequence_no: Optional[int] = 0
 
@@ -34,6 +35,8 @@ class Scripter:
         self.html_string = htmlstring
 
     def generate_script(self):
+        from lxml import html
+
         tree = html.fromstring(self.html_string)
         for element in tree.iter():
             try:
@@ -0,0 +1,109 @@
+"""Startup time benchmark for the framework.
+
+Measures cold ``pytest --collect-only`` wall time and the import cost of
+every module loaded while importing ``conftest`` and the test modules.
+
+    python -m utils.startup_benchmark --runs 5 --budget 2.5
+
+Exits with status 1 when the median collect time exceeds ``--budget``
+seconds, so it can guard against startup regressions in CI.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import timeit
+from typing import Dict, List
+
+ENTRY_MODULES = ["conftest", "tests.test_login", "tests.test_walk"]
+REPORT_PATH = "./logs/startup_benchmark.json"
+
+
+def collect_times(runs: int) -> List[float]:
+    times = []
+    for _ in range(runs):
+        starttime = timeit.default_timer()
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                "--collect-only",
+                "-q",
+                "-p",
+                "no:cacheprovider",
+            ],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+        )
+        times.append(timeit.default_timer() - starttime)
+    return times
+
+
+def import_costs(modules: List[str]) -> Dict[str, dict]:
+    """Returns the self and cumulative import time of every module, in ms."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {', '.join(modules)}",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    costs = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        costs[name.strip()] = {
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        }
+    return costs
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="fail when the median collect time is higher",
+    )
+    args = parser.parse_args(argv)
+
+    times = collect_times(args.runs)
+    costs = import_costs(ENTRY_MODULES)
+    median = statistics.median(times)
+    print(
+        f"pytest --collect-only: median {median:.2f}s, "
+        f"min {min(times):.2f}s over {len(times)} runs"
+    )
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    slowest = sorted(costs.items(), key=lambda item: -item[1]["cumulative_ms"])
+    for name, cost in slowest[: args.top]:
+        print(f"{cost['cumulative_ms']:>14.1f} {cost['self_ms']:>9.1f}  {name}")
+
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump({"collect_seconds": times, "imports": costs}, f, indent=2)
+
+    if args.budget is not None and median > args.budget:
+        print(f"\nStartup budget exceeded: {median:.2f}s > {args.budget:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())